@@ -1,9 +1,11 @@
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
-from ...models.base import AgentRequest, AgentResponse
+from ...models.base import AgentRequest, AgentResponse, StreamPacing
+from ...config import settings
 from ...core.plugin_manager import plugin_manager
 from ...core.react_agent import ReactAgent, get_react_agent
 from ...core.tool_registry import get_tool_registry
+from ...core.tool_orchestrator import get_tool_orchestrator
 from ...services.llm_service import get_llm_service
 from ...core.conversation_memory import get_conversation_memory
 from ...db import get_db_connection
@@ -134,7 +136,8 @@ async def execute_command(request: AgentRequest):
                 "steps": [step.to_dict() for step in react_response.steps],
                 "plan": react_response.plan.to_dict(),
                 "evaluation": react_response.evaluation.to_dict(),
-                "execution_time": react_response.execution_time
+                "execution_time": react_response.execution_time,
+                "stage_timings": react_response.stage_timings
             }
         )
         
@@ -200,6 +203,30 @@ async def get_tools():
     }
 
 
+@router.get("/debug/tool-cache")
+async def get_tool_cache_stats():
+    """获取工具结果缓存统计（命中率、字节数、淘汰次数，用于调整缓存容量）"""
+    orchestrator = get_tool_orchestrator(tool_registry, plugin_manager)
+    return {
+        "cache": orchestrator.get_cache_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@router.get("/debug/news-feeds")
+async def get_news_feed_stats():
+    """获取各 RSS 源的抓取状态（轮询间隔、退避/熔断、延迟、错误数、条目数）、解析池和文章库统计"""
+    news_plugin = plugin_manager.get_plugin("news")
+    if not news_plugin or not hasattr(news_plugin, "news_service"):
+        raise HTTPException(status_code=404, detail="News plugin not available")
+    return {
+        "feeds": news_plugin.news_service.get_feed_status(),
+        "parser": news_plugin.news_service.get_parse_stats(),
+        "store": news_plugin.news_service.get_store_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 @router.post("/stream")
 async def stream_execution(request: AgentRequest):
     """
@@ -223,6 +250,12 @@ async def stream_execution(request: AgentRequest):
         
         logger.info(f"Streaming request: {user_input[:100]}...")
         
+        # 打字机效果只在 SSE 发送端生效（不影响 Agent 执行速度）
+        pacing = StreamPacing.from_context(
+            request.context,
+            default_enabled=settings.STREAM_PACING_ENABLED
+        )
+        
         async def event_generator():
             """生成 SSE 事件流"""
             try:
@@ -263,7 +296,8 @@ async def stream_execution(request: AgentRequest):
                             'evaluation': {
                                 'completeness_score': result.evaluation.completeness_score,
                                 'quality_score': result.evaluation.quality_score,
-                                'missing_info': result.evaluation.missing_info
+                                'missing_info': result.evaluation.missing_info,
+                                'status': result.evaluation.status
                             },
                             'execution_time': result.execution_time
                         })
@@ -290,6 +324,11 @@ async def stream_execution(request: AgentRequest):
                     
                     # 发送事件
                     yield f"data: {json.dumps(event)}\n\n"
+                    
+                    # 节奏控制（默认关闭）
+                    delay = pacing.delay_for(event['type'])
+                    if delay > 0:
+                        await asyncio.sleep(delay)
                 
                 # 等待执行任务完成
                 await execution_task
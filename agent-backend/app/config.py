@@ -1,4 +1,5 @@
-from typing import List
+import os
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -89,6 +90,26 @@ class Settings(BaseSettings):
     ENABLE_INTENT_ANALYSIS: bool = False  # .env 中设置 ENABLE_INTENT_ANALYSIS=true
     ENABLE_CONTENT_ANALYSIS: bool = False  # .env 中设置 ENABLE_CONTENT_ANALYSIS=true
     MAX_ARTICLES_PER_QUERY: int = 50
+    
+    # ========== 流式输出配置 ==========
+    # SSE 打字机效果默认关闭（生产环境不增加延迟），可通过 context["pacing"] 按请求开启
+    STREAM_PACING_ENABLED: bool = False
+    
+    # ========== ReAct 配置 ==========
+    # 迭代模式："two_step"（推理、行动各一次 LLM 调用）| "single_call"（一次调用同时生成）
+    REACT_ITERATION_MODE: str = "two_step"
+    # 快速路径：simple 计划的唯一步骤已确定工具和参数时，跳过 LLM 推理直接执行
+    REACT_PLAN_FAST_PATH: bool = True
+    # 单次 ReAct 迭代最多可并发执行的工具调用数（1 表示每次迭代只执行一个工具）
+    REACT_MAX_ACTIONS_PER_ITERATION: int = 3
+    # 工具链（execute_chain）和多行动迭代的最大并发数
+    TOOL_CHAIN_MAX_CONCURRENCY: int = 4
+    
+    # ========== 反思评估配置 ==========
+    # 评估模式："sync"（返回前评估）| "async"（先返回响应，后台评估并回写数据库）
+    REFLECTION_EVALUATION_MODE: str = "sync"
+    # LLM 评估抽样比例（0-1），未抽中的请求只做规则评估，用于控制 LLM 成本
+    REFLECTION_SAMPLE_RATE: float = 1.0
 
     # ========== 新闻源配置（业务配置）==========
     NEWS_SOURCES: dict = {
@@ -105,6 +126,35 @@ class Settings(BaseSettings):
             "enabled": True,
         },
     }
+    # 后台刷新：应用启动后在快照过期（15 分钟）前定期刷新 RSS（Serverless 环境可关闭）
+    # 每次只抓取到期的源（各源轮询间隔按发布频率自适应，最短 5 分钟）
+    NEWS_BACKGROUND_REFRESH: bool = True
+    NEWS_REFRESH_INTERVAL_SECONDS: int = 300
+    # RSS 解析池："thread"（默认）| "process"（多核部署）| "inline"（调试）
+    NEWS_PARSE_EXECUTOR: str = "thread"
+    NEWS_PARSE_MAX_WORKERS: int = 2
+    # 文章库：按发布时间保留窗口内的文章（跨刷新累积，按 URL/GUID 去重）
+    NEWS_RETENTION_HOURS: int = 72
+    NEWS_STORE_MAX_ARTICLES: int = 5000
+    NEWS_MAX_ENTRIES_PER_FEED: int = 50  # 每次解析单个源的最多条目数（流式读取够数即停止）
+    NEWS_FEED_MAX_BYTES: int = 5 * 1024 * 1024  # 单个源响应体的字节上限
+    # 跨源近似重复：标题+摘要 MinHash 估算的 Jaccard 相似度达到阈值即合并（大于 1 时关闭）
+    NEWS_DEDUP_THRESHOLD: float = 0.5
+    # 热门话题：标签热度的半衰期，以及变化百分比的比较窗口（当前窗口 vs 上一窗口）
+    NEWS_TRENDING_HALF_LIFE_HOURS: float = 24
+    NEWS_TRENDING_WINDOW_HOURS: int = 24
+    # 磁盘快照：文章库和各源抓取状态写入 SQLite，重启/冷启动后先用快照响应再后台刷新
+    NEWS_SNAPSHOT_PATH: str = ""  # 为空时 Vercel 上使用 /tmp，本地不持久化
+
+    @property
+    def NEWS_SNAPSHOT_FILE(self) -> Optional[str]:
+        """新闻快照文件路径（None 表示不持久化）"""
+        if self.NEWS_SNAPSHOT_PATH:
+            return self.NEWS_SNAPSHOT_PATH
+        # Serverless 环境只有 /tmp 可写，同一实例的后续冷启动可以复用
+        if os.getenv("VERCEL"):
+            return "/tmp/ai_news_snapshot.sqlite3"
+        return None
 
     class Config:
         """Pydantic 配置"""
@@ -13,7 +13,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from loguru import logger
 
-from ..models.react import ReactResponse, ConversationTurn
+from ..models.react import ReactResponse, ConversationTurn, QualityEvaluation
 from ..services.llm_service import BaseLLMService, get_llm_service
 
 
@@ -104,7 +104,7 @@ class ConversationMemory:
             }
             
             # 保存到数据库
-            await self._insert_conversation(conversation_data)
+            response.conversation_id = await self._insert_conversation(conversation_data)
             
             # 更新会话最后活动时间
             await self._update_session_activity(session_id, user_id)
@@ -315,12 +315,55 @@ class ConversationMemory:
             logger.error(f"Failed to delete old data: {e}", exc_info=True)
             return {"sessions": 0, "conversations": 0}
     
-    async def _insert_conversation(self, data: Dict[str, Any]) -> None:
+    async def update_evaluation(
+        self,
+        conversation_id: int,
+        evaluation: QualityEvaluation
+    ) -> bool:
+        """
+        回写对话记录的质量评估（用于后台异步评估）
+        
+        Args:
+            conversation_id: 对话记录 ID
+            evaluation: 质量评估
+        
+        Returns:
+            bool: 是否更新成功
+        """
+        try:
+            if not self.db:
+                return False
+            
+            import json
+            
+            async with self.db.acquire() as conn:
+                result = await conn.execute(
+                    """
+                    UPDATE agent_conversations
+                    SET evaluation = $1
+                    WHERE id = $2
+                    """,
+                    json.dumps(evaluation.to_dict()),
+                    conversation_id
+                )
+            
+            updated = bool(result) and result.split()[-1] != "0"
+            logger.info(f"Updated evaluation: conversation={conversation_id}, updated={updated}")
+            return updated
+        
+        except Exception as e:
+            logger.error(f"Failed to update evaluation: {e}", exc_info=True)
+            return False
+    
+    async def _insert_conversation(self, data: Dict[str, Any]) -> Optional[int]:
         """
         插入对话记录到数据库
         
         Args:
             data: 对话数据
+        
+        Returns:
+            Optional[int]: 新记录的 ID
         """
         if not self.db:
             raise Exception("Database connection not available")
@@ -330,12 +373,13 @@ class ConversationMemory:
             INSERT INTO agent_conversations 
             (session_id, user_query, agent_response, steps, plan, evaluation, created_at)
             VALUES ($1, $2, $3, $4, $5, $6, $7)
+            RETURNING id
         """
         
         import json
         
         async with self.db.acquire() as conn:
-            await conn.execute(
+            return await conn.fetchval(
                 sql_query,
                 data["session_id"],
                 data["query"],
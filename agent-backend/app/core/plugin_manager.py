@@ -44,6 +44,22 @@ class PluginManager:
         """获取启用的插件"""
         return [plugin for plugin in self.plugins.values() if plugin.enabled]
 
+    async def startup(self):
+        """启动所有插件（应用启动时调用）"""
+        for plugin in self.plugins.values():
+            try:
+                await plugin.startup()
+            except Exception as e:
+                logger.error(f"Failed to start plugin {plugin.id}: {e}")
+
+    async def shutdown(self):
+        """关闭所有插件（应用关闭时调用）"""
+        for plugin in self.plugins.values():
+            try:
+                await plugin.shutdown()
+            except Exception as e:
+                logger.error(f"Failed to shut down plugin {plugin.id}: {e}")
+
 
 # 全局插件管理器实例
 plugin_manager = PluginManager()
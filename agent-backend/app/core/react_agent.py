@@ -11,7 +11,8 @@ ReAct Agent - ReAct (Reasoning + Acting) Agent 实现
 
 import time
 import uuid
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
+import asyncio
+from typing import Dict, Any, Optional, List, Tuple, Awaitable, TypeVar, TYPE_CHECKING
 from loguru import logger
 from datetime import datetime
 
@@ -29,11 +30,14 @@ from ..core.conversation_memory import ConversationMemory, get_conversation_memo
 from ..core.task_planner import TaskPlanner, get_task_planner
 from ..core.tool_orchestrator import ToolOrchestrator, get_tool_orchestrator
 from ..core.reflection_engine import ReflectionEngine, get_reflection_engine
+from ..config import settings
 
 # 避免循环导入
 if TYPE_CHECKING:
     from ..core.plugin_manager import PluginManager
 
+T = TypeVar("T")
+
 
 class ReactAgent:
     """
@@ -54,6 +58,16 @@ class ReactAgent:
     # 最大迭代次数限制
     MAX_ITERATIONS = 5
     
+    # 迭代模式
+    # - two_step: 先 _reason 再 _act（两次 LLM 调用）
+    # - single_call: 一次 LLM 调用同时生成 thought 和 action（ReActIterationPrompt）
+    ITERATION_MODES = ("two_step", "single_call")
+    
+    # 评估模式
+    # - sync: 返回响应前完成评估
+    # - async: 先返回响应（附带规则评估），对话保存和 LLM 评估都在后台完成
+    EVALUATION_MODES = ("sync", "async")
+    
     # 内存会话存储（降级方案）
     _memory_sessions: Dict[str, List[Dict[str, Any]]] = {}
     
@@ -65,7 +79,9 @@ class ReactAgent:
         conversation_memory: Optional[ConversationMemory] = None,
         task_planner: Optional[TaskPlanner] = None,
         tool_orchestrator: Optional[ToolOrchestrator] = None,
-        reflection_engine: Optional[ReflectionEngine] = None
+        reflection_engine: Optional[ReflectionEngine] = None,
+        iteration_mode: Optional[str] = None,
+        evaluation_mode: Optional[str] = None
     ):
         """
         初始化 ReAct Agent
@@ -78,6 +94,8 @@ class ReactAgent:
             task_planner: 任务规划器
             tool_orchestrator: 工具编排器
             reflection_engine: 反思引擎
+            iteration_mode: 迭代模式（默认使用 settings.REACT_ITERATION_MODE）
+            evaluation_mode: 评估模式（默认使用 settings.REFLECTION_EVALUATION_MODE）
         """
         self.tool_registry = tool_registry or get_tool_registry()
         self.llm_service = llm_service or get_llm_service()
@@ -86,8 +104,19 @@ class ReactAgent:
         self.task_planner = task_planner or get_task_planner(self.tool_registry, self.llm_service)
         self.tool_orchestrator = tool_orchestrator or get_tool_orchestrator(self.tool_registry, plugin_manager)
         self.reflection_engine = reflection_engine or get_reflection_engine(self.llm_service)
+        self.iteration_mode = self._resolve_iteration_mode(iteration_mode or settings.REACT_ITERATION_MODE)
+        self.max_actions_per_iteration = max(1, settings.REACT_MAX_ACTIONS_PER_ITERATION)
+        self.evaluation_mode = self._resolve_evaluation_mode(evaluation_mode or settings.REFLECTION_EVALUATION_MODE)
         
-        logger.info("ReAct Agent initialized")
+        # 后台保存/评估任务（保持强引用，防止任务被垃圾回收）
+        self._background_tasks: set = set()
+        # 各会话尚未完成的后台保存（同一会话的下一次请求读取历史前等待）
+        self._pending_saves: Dict[str, asyncio.Task] = {}
+        
+        logger.info(
+            f"ReAct Agent initialized (iteration mode: {self.iteration_mode}, "
+            f"evaluation mode: {self.evaluation_mode})"
+        )
     
     async def execute(
         self,
@@ -132,12 +161,47 @@ class ReactAgent:
         
         logger.info(f"ReAct Agent executing query: '{query}' (session: {session_id})")
         
+        # 各阶段耗时（秒）
+        stage_timings: Dict[str, float] = {}
+        pre_plan_tasks: List[asyncio.Task] = []
+        
         try:
-            # 加载会话历史
-            conversation_history = await self.conversation_memory.get_history(session_id)
+            # 上一轮的对话还在后台保存时先等它完成，保证读取到自己的写入
+            pending_save = self._pending_saves.get(session_id)
+            if pending_save is not None:
+                await asyncio.wait([pending_save])
+            
+            # 规划前阶段并发执行：历史加载、摘要加载、复杂度分类互不依赖
+            history_task = asyncio.create_task(self._timed_stage(
+                "history", stage_timings, self.conversation_memory.get_history(session_id)
+            ))
+            summary_task = asyncio.create_task(self._timed_stage(
+                "summary", stage_timings, self.conversation_memory.get_context_summary(session_id)
+            ))
+            complexity_task = asyncio.create_task(self._timed_stage(
+                "complexity", stage_timings, self.task_planner.classify_complexity(query)
+            ))
+            pre_plan_tasks = [history_task, summary_task, complexity_task]
+            
+            complexity = await complexity_task
+            
+            # 简单计划不使用对话历史：不等待历史加载，直接取消
+            if complexity == "simple":
+                history_task.cancel()
+                conversation_history = None
+            else:
+                conversation_history = await history_task
+            
+            # 创建执行计划（使用 TaskPlanner）
+            plan = await self._timed_stage("plan", stage_timings, self.task_planner.create_plan(
+                query=query,
+                conversation_history=conversation_history,
+                context=context,
+                complexity=complexity
+            ))
             
-            # 获取会话摘要（如果需要）
-            context_summary = await self.conversation_memory.get_context_summary(session_id)
+            # 摘要只在执行阶段使用
+            context_summary = await summary_task
             
             if context_summary:
                 logger.info(f"Using context summary: {context_summary[:100]}...")
@@ -147,13 +211,6 @@ class ReactAgent:
                 logger.info(f"Loaded {len(conversation_history)} previous interactions")
                 context["conversation_history"] = [turn.to_dict() for turn in conversation_history]
             
-            # 创建执行计划（使用 TaskPlanner）
-            plan = await self.task_planner.create_plan(
-                query=query,
-                conversation_history=conversation_history,
-                context=context
-            )
-            
             # 发送 plan 事件（如果有流式回调）
             if streaming_callback:
                 await streaming_callback('plan', {
@@ -164,19 +221,51 @@ class ReactAgent:
                     }
                 })
             
-            # 执行 ReAct 循环
-            steps = await self._react_loop(query, plan, context, streaming_callback)
+            # 执行计划：完全确定的简单计划直接执行，否则进入 ReAct 循环
+            stage_start = time.time()
+            steps = None
+            if self._can_fast_path(plan, context):
+                steps = await self._execute_plan_directly(plan, context)
+                if not steps or not all(step.is_successful() for step in steps):
+                    # 快速路径的事件尚未发送，回退后客户端只看到 ReAct 循环的步骤
+                    logger.info("Fast path step failed, falling back to ReAct loop")
+                    steps = None
+                elif streaming_callback:
+                    await self._stream_direct_steps(steps, streaming_callback)
+            
+            if steps is None:
+                steps = await self._react_loop(query, plan, context, streaming_callback)
+                fast_path = False
+            else:
+                fast_path = True
+            stage_timings["execution"] = time.time() - stage_start
             
             # 合成最终响应（支持流式）
-            final_response = await self._synthesize_response(query, steps, plan, streaming_callback)
+            stage_start = time.time()
+            if fast_path and (not self.llm_service or not self.llm_service.is_available()):
+                # 快速路径在没有 LLM 时直接返回工具输出
+                final_response = self._format_direct_response(steps)
+                if streaming_callback:
+                    await streaming_callback("response_chunk", {"chunk": final_response})
+            else:
+                final_response = await self._synthesize_response(query, steps, plan, streaming_callback)
+            stage_timings["synthesis"] = time.time() - stage_start
             
             # 评估输出质量（使用 ReflectionEngine）
-            evaluation = await self.reflection_engine.evaluate_output(
-                query=query,
-                output=final_response,
-                plan=plan,
-                steps=steps
-            )
+            # 未被抽样的请求只做规则评估；async 模式下 LLM 评估移到后台
+            evaluation_mode = self._resolve_evaluation_mode(context.get("evaluation_mode", self.evaluation_mode))
+            run_llm_evaluation = self.reflection_engine.should_evaluate()
+            if not run_llm_evaluation:
+                evaluation = self.reflection_engine.quick_evaluation(final_response, steps)
+            elif evaluation_mode == "async":
+                evaluation = self.reflection_engine.quick_evaluation(final_response, steps, status="pending")
+            else:
+                evaluation = await self._timed_stage("evaluation", stage_timings, self.reflection_engine.evaluate_output(
+                    query=query,
+                    output=final_response,
+                    plan=plan,
+                    steps=steps
+                ))
             
             # 计算执行时间
             execution_time = time.time() - start_time
@@ -190,33 +279,25 @@ class ReactAgent:
                 evaluation=evaluation,
                 session_id=session_id,
                 execution_time=execution_time,
-                timestamp=datetime.now()
+                timestamp=datetime.now(),
+                stage_timings=stage_timings
             )
             
-            # 保存到会话历史
-            try:
-                saved = await self.conversation_memory.save_interaction(
-                    session_id=session_id,
-                    query=query,
-                    response=response,
-                    user_id=context.get("user_id")
-                )
-                
-                if not saved:
-                    # 降级：使用内存存储
-                    await self._save_conversation_fallback(session_id, query, response)
-            except Exception as e:
-                logger.warning(f"Failed to save conversation: {e}")
-                # 降级：使用内存存储
-                try:
-                    await self._save_conversation_fallback(session_id, query, response)
-                except Exception as fallback_error:
-                    logger.error(f"Fallback save also failed: {fallback_error}")
+            # 保存到会话历史：async 模式在后台保存（不阻塞响应），sync 模式返回前保存
+            if evaluation_mode == "async":
+                save_task = self._schedule_background_save(session_id, query, response, context.get("user_id"))
+                if evaluation.status == "pending":
+                    self._schedule_background_evaluation(query, plan, steps, response, save_task)
+            else:
+                await self._save_conversation(session_id, query, response, context.get("user_id"))
             
             logger.info(
                 f"ReAct Agent completed: {len(steps)} steps, "
                 f"{execution_time:.2f}s, quality: {evaluation.completeness_score}/10"
             )
+            logger.debug(
+                "Stage timings: " + ", ".join(f"{name}={seconds:.3f}s" for name, seconds in stage_timings.items())
+            )
             
             return response
         
@@ -224,6 +305,11 @@ class ReactAgent:
             execution_time = time.time() - start_time
             logger.error(f"ReAct Agent execution failed: {e}", exc_info=True)
             
+            # 取消尚未完成的规划前任务
+            for task in pre_plan_tasks:
+                if not task.done():
+                    task.cancel()
+            
             # 安全地创建简单计划（处理 query 可能未定义的情况）
             try:
                 simple_plan = self._create_simple_plan(query)
@@ -254,9 +340,289 @@ class ReactAgent:
                 session_id=session_id or "error",
                 execution_time=execution_time,
                 error=str(e),
-                timestamp=datetime.now()
+                timestamp=datetime.now(),
+                stage_timings=stage_timings
             )
     
+    async def _timed_stage(
+        self,
+        name: str,
+        stage_timings: Dict[str, float],
+        awaitable: Awaitable[T]
+    ) -> T:
+        """
+        等待某个执行阶段并记录耗时
+        
+        Args:
+            name: 阶段名称
+            stage_timings: 耗时记录字典
+            awaitable: 阶段协程
+        
+        Returns:
+            阶段结果
+        """
+        stage_start = time.time()
+        try:
+            return await awaitable
+        finally:
+            stage_timings[name] = time.time() - stage_start
+    
+    async def _save_conversation(
+        self,
+        session_id: str,
+        query: str,
+        response: ReactResponse,
+        user_id: Optional[str] = None
+    ) -> None:
+        """
+        保存对话到会话历史（数据库不可用时降级到内存存储）
+        
+        Args:
+            session_id: 会话 ID
+            query: 用户查询
+            response: Agent 响应（保存成功后带有 conversation_id）
+            user_id: 用户 ID
+        """
+        try:
+            saved = await self.conversation_memory.save_interaction(
+                session_id=session_id,
+                query=query,
+                response=response,
+                user_id=user_id
+            )
+            
+            if not saved:
+                # 降级：使用内存存储
+                await self._save_conversation_fallback(session_id, query, response)
+        except Exception as e:
+            logger.warning(f"Failed to save conversation: {e}")
+            # 降级：使用内存存储
+            try:
+                await self._save_conversation_fallback(session_id, query, response)
+            except Exception as fallback_error:
+                logger.error(f"Fallback save also failed: {fallback_error}")
+    
+    def _schedule_background(self, coro: Awaitable[Any]) -> asyncio.Task:
+        """
+        创建后台任务并保持强引用直到完成
+        
+        Args:
+            coro: 后台协程
+        
+        Returns:
+            asyncio.Task: 后台任务
+        """
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    def _schedule_background_save(
+        self,
+        session_id: str,
+        query: str,
+        response: ReactResponse,
+        user_id: Optional[str] = None
+    ) -> asyncio.Task:
+        """
+        在后台保存对话，并登记为该会话尚未完成的保存
+        
+        Args:
+            session_id: 会话 ID
+            query: 用户查询
+            response: 已返回的响应
+            user_id: 用户 ID
+        
+        Returns:
+            asyncio.Task: 后台保存任务
+        """
+        task = self._schedule_background(self._save_conversation(session_id, query, response, user_id))
+        self._pending_saves[session_id] = task
+        
+        def _clear_pending(done: asyncio.Task):
+            if self._pending_saves.get(session_id) is done:
+                del self._pending_saves[session_id]
+        
+        task.add_done_callback(_clear_pending)
+        return task
+    
+    def _schedule_background_evaluation(
+        self,
+        query: str,
+        plan: ExecutionPlan,
+        steps: List[ReActStep],
+        response: ReactResponse,
+        save_task: Optional[asyncio.Task] = None
+    ) -> asyncio.Task:
+        """
+        在后台运行 LLM 质量评估，完成后回写到已保存的对话记录
+        
+        Args:
+            query: 用户查询
+            plan: 执行计划
+            steps: 执行步骤
+            response: 已返回的响应（evaluation 为临时结果）
+            save_task: 对话的后台保存任务（回写前等待其完成）
+        
+        Returns:
+            asyncio.Task: 后台评估任务
+        """
+        return self._schedule_background(self._run_background_evaluation(query, plan, steps, response, save_task))
+    
+    async def _run_background_evaluation(
+        self,
+        query: str,
+        plan: ExecutionPlan,
+        steps: List[ReActStep],
+        response: ReactResponse,
+        save_task: Optional[asyncio.Task] = None
+    ) -> None:
+        """
+        执行后台评估并回写
+        
+        Args:
+            query: 用户查询
+            plan: 执行计划
+            steps: 执行步骤
+            response: 已返回的响应
+            save_task: 对话的后台保存任务
+        """
+        stage_start = time.time()
+        try:
+            evaluation = await self.reflection_engine.evaluate_output(
+                query=query,
+                output=response.response,
+                plan=plan,
+                steps=steps
+            )
+            response.evaluation = evaluation
+            
+            # 评估与保存并发进行，回写前等待保存完成（拿到 conversation_id）
+            if save_task is not None:
+                await asyncio.wait([save_task])
+            
+            if response.conversation_id is not None:
+                await self.conversation_memory.update_evaluation(response.conversation_id, evaluation)
+            
+            logger.info(
+                f"Background evaluation complete ({time.time() - stage_start:.2f}s): "
+                f"session={response.session_id}, quality: {evaluation.completeness_score}/10"
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Background evaluation failed: {e}", exc_info=True)
+    
+    def _can_fast_path(self, plan: ExecutionPlan, context: Dict[str, Any]) -> bool:
+        """
+        判断是否可以跳过 LLM 推理直接执行计划
+        
+        条件：开启了快速路径，计划为 simple，且唯一步骤的工具和参数完全确定
+        
+        Args:
+            plan: 执行计划
+            context: 上下文（可通过 context["plan_fast_path"] 按请求开关）
+        
+        Returns:
+            bool: 是否走快速路径
+        """
+        if not context.get("plan_fast_path", settings.REACT_PLAN_FAST_PATH):
+            return False
+        
+        if not plan.is_simple() or len(plan.steps) != 1:
+            return False
+        
+        return self.tool_orchestrator.is_fully_specified(plan.steps[0])
+    
+    async def _execute_plan_directly(
+        self,
+        plan: ExecutionPlan,
+        context: Dict[str, Any]
+    ) -> List[ReActStep]:
+        """
+        通过 ToolOrchestrator.execute_chain 直接执行计划步骤（快速路径）
+        
+        不调用 LLM 推理和行动选择，生成与 ReAct 循环相同结构的步骤，供合成和评估使用。
+        流式事件由调用方在所有步骤成功后通过 _stream_direct_steps 发送。
+        
+        Args:
+            plan: 执行计划
+            context: 上下文
+        
+        Returns:
+            List[ReActStep]: 执行步骤列表
+        """
+        logger.info(f"Fast path: executing {len(plan.steps)} planned step(s) directly")
+        
+        results = await self.tool_orchestrator.execute_chain(plan.steps, context)
+        if len(results) != len(plan.steps):
+            return []  # 有步骤未执行（链已中止），交给 ReAct 循环
+        
+        steps: List[ReActStep] = []
+        for plan_step, result in zip(plan.steps, results):
+            thought = f"The plan step is fully specified, calling {plan_step.tool_name} directly: {plan_step.description}"
+            tool_call = ToolCall(
+                tool_name=plan_step.tool_name,
+                parameters=plan_step.parameters,
+                reasoning=plan_step.description,
+                confidence=0.9,
+                source="plan"
+            )
+            
+            steps.append(ReActStep(
+                step_number=plan_step.step_number,
+                thought=thought,
+                action=tool_call,
+                observation=result,
+                status="completed" if result.is_success() else "failed",
+                timestamp=datetime.now()
+            ))
+        
+        return steps
+    
+    async def _stream_direct_steps(self, steps: List[ReActStep], streaming_callback: Any):
+        """
+        发送快速路径步骤的 action/observation 事件
+        
+        Args:
+            steps: 快速路径执行的步骤（全部成功）
+            streaming_callback: 流式回调函数
+        """
+        for step in steps:
+            try:
+                await streaming_callback("action", {
+                    "step_number": step.step_number,
+                    "tool_name": step.action.tool_name,
+                    "parameters": step.action.parameters,
+                    "thought": step.thought
+                })
+                await streaming_callback("observation", {
+                    "step_number": step.step_number,
+                    "success": step.observation.is_success(),
+                    "data": step.observation.data,
+                    "error": None
+                })
+            except Exception as e:
+                logger.warning(f"Streaming callback failed for fast path step: {e}")
+    
+    def _format_direct_response(self, steps: List[ReActStep]) -> str:
+        """
+        不经 LLM 合成，直接拼接成功步骤的工具输出
+        
+        Args:
+            steps: 执行步骤列表
+        
+        Returns:
+            str: 响应文本
+        """
+        outputs = [
+            str(observation.data)
+            for step in steps
+            for observation in step.get_observations()
+            if observation.is_success() and observation.data is not None
+        ]
+        return "\n\n".join(outputs)
+    
     async def _react_loop(
         self,
         query: str,
@@ -313,11 +679,6 @@ class ReactAgent:
                 if not should_continue:
                     logger.info("ReflectionEngine determined task is complete")
                     break
-                
-                # 添加迭代间延迟，使流式输出更明显
-                if iteration < self.MAX_ITERATIONS:
-                    import asyncio
-                    await asyncio.sleep(0.2)  # 200ms 延迟
             
             except Exception as e:
                 logger.error(f"ReAct iteration {iteration} failed: {e}", exc_info=True)
@@ -379,47 +740,72 @@ class ReactAgent:
         logger.info(f"Starting ReAct iteration {iteration}")
         
         try:
-            # Step 1: Reason - 生成思考（包含流式处理）
-            thought = await self._reason(
-                query=query,
-                plan=plan,
-                history=history,
-                context=context,
-                iteration=iteration,
-                streaming_callback=streaming_callback
+            iteration_mode = self._resolve_iteration_mode(
+                context.get("iteration_mode", self.iteration_mode)
             )
             
-            logger.info(f"Thought: {thought[:100]}...")
-            
-            # Step 2: Act - 选择行动（包含流式处理）
-            tool_call = await self._act(
-                query=query,
-                thought=thought,
-                plan=plan,
-                history=history,
-                context=context,
-                iteration=iteration,
-                streaming_callback=streaming_callback
-            )
+            if iteration_mode == "single_call":
+                # Step 1+2: Reason & Act - 一次 LLM 调用同时生成思考和行动
+                thought, tool_calls = await self._reason_and_act(
+                    query=query,
+                    plan=plan,
+                    history=history,
+                    context=context,
+                    iteration=iteration,
+                    streaming_callback=streaming_callback
+                )
+                
+                logger.info(f"Thought: {thought[:100]}...")
+            else:
+                # Step 1: Reason - 生成思考（包含流式处理）
+                thought = await self._reason(
+                    query=query,
+                    plan=plan,
+                    history=history,
+                    context=context,
+                    iteration=iteration,
+                    streaming_callback=streaming_callback
+                )
+                
+                logger.info(f"Thought: {thought[:100]}...")
+                
+                # Step 2: Act - 选择行动（包含流式处理，可能包含多个独立工具调用）
+                tool_calls = await self._act(
+                    query=query,
+                    thought=thought,
+                    plan=plan,
+                    history=history,
+                    context=context,
+                    iteration=iteration,
+                    streaming_callback=streaming_callback
+                )
             
-            logger.info(f"Action: {tool_call.tool_name}({tool_call.parameters})")
+            for tool_call in tool_calls:
+                logger.info(f"Action: {tool_call.tool_name}({tool_call.parameters})")
             
-            # Step 3: Observe - 执行工具（包含流式处理）
-            observation = await self._observe(
-                tool_call=tool_call,
+            # Step 3: Observe - 执行工具（包含流式处理，多个调用并发执行）
+            observations = await self._observe(
+                tool_calls=tool_calls,
                 iteration=iteration,
                 streaming_callback=streaming_callback
             )
             
-            logger.info(f"Observation: {'Success' if observation.is_success() else 'Failed'}")
+            succeeded = sum(1 for observation in observations if observation.is_success())
+            logger.info(f"Observation: {succeeded}/{len(observations)} succeeded")
             
             # Step 4: 构建结果
+            is_multi_action = len(tool_calls) > 1
             step = ReActStep(
                 step_number=iteration,
                 thought=thought,
-                action=tool_call,
-                observation=observation,
-                status="completed" if observation.is_success() else "failed",
+                action=tool_calls[0],
+                observation=observations[0],
+                actions=tool_calls if is_multi_action else [],
+                observations=observations if is_multi_action else [],
+                status=(
+                    "completed" if succeeded == len(observations)
+                    else "partial" if succeeded else "failed"
+                ),
                 timestamp=datetime.now()
             )
             
@@ -561,10 +947,13 @@ class ReactAgent:
         context: Dict[str, Any],
         iteration: int,
         streaming_callback: Optional[Any] = None
-    ) -> ToolCall:
+    ) -> List[ToolCall]:
         """
         选择行动（ReAct 的 Act 步骤）
         
+        LLM 可以返回多个互相独立的工具调用（最多 max_actions_per_iteration 个），
+        它们会在 _observe 中并发执行。
+        
         Args:
             query: 用户查询
             thought: 推理内容（来自 _reason()）
@@ -575,7 +964,7 @@ class ReactAgent:
             streaming_callback: 流式回调函数（可选）
         
         Returns:
-            ToolCall: 选择的工具调用
+            List[ToolCall]: 选择的工具调用列表（至少一项）
         """
         from ..prompts.react_prompts import ReActActionPrompt, format_tools_for_prompt
         from ..services.llm_service import LLMServiceError
@@ -608,7 +997,8 @@ class ReactAgent:
                 plan=plan.to_dict(),
                 history=[step.to_dict() for step in history],
                 available_tools=tools_description,
-                iteration=iteration
+                iteration=iteration,
+                max_actions=self.max_actions_per_iteration
             )
             
             # 调用 LLM（行动选择通常不需要流式，因为响应较短）
@@ -628,29 +1018,15 @@ class ReactAgent:
                 raise ValueError("Failed to parse LLM response into valid action")
             
             # 创建 ToolCall 对象
-            tool_call = ToolCall(
-                tool_name=action_data.get('tool_name'),
-                parameters=action_data.get('parameters', {}),
-                reasoning=action_data.get('reasoning', thought),
-                confidence=0.8,
-                source="llm"
-            )
+            tool_calls = self._build_tool_calls(action_data, thought)
             
-            logger.info(f"Selected action: {tool_call.tool_name}({tool_call.parameters})")
+            for tool_call in tool_calls:
+                logger.info(f"Selected action: {tool_call.tool_name}({tool_call.parameters})")
             
-            # 发送流式事件
-            if streaming_callback:
-                try:
-                    await streaming_callback("action", {
-                        "step_number": iteration,
-                        "tool_name": tool_call.tool_name,
-                        "parameters": tool_call.parameters,
-                        "thought": thought  # 包含完整思考以提供上下文
-                    })
-                except Exception as e:
-                    logger.warning(f"Streaming callback failed for action: {e}")
+            # 发送流式事件（包含完整思考以提供上下文）
+            await self._emit_actions(tool_calls, thought, iteration, streaming_callback)
             
-            return tool_call
+            return tool_calls
         
         except (LLMServiceError, ValueError) as e:
             logger.error(f"Action selection failed: {e}")
@@ -664,18 +1040,9 @@ class ReactAgent:
             )
             
             # 仍然发送流式事件（表示错误）
-            if streaming_callback:
-                try:
-                    await streaming_callback("action", {
-                        "step_number": iteration,
-                        "tool_name": error_tool_call.tool_name,
-                        "parameters": error_tool_call.parameters,
-                        "thought": thought
-                    })
-                except Exception as callback_error:
-                    logger.warning(f"Streaming callback failed for error action: {callback_error}")
-            
-            return error_tool_call
+            await self._emit_actions([error_tool_call], thought, iteration, streaming_callback)
+            
+            return [error_tool_call]
         except Exception as e:
             logger.error(f"Unexpected error during action selection: {e}", exc_info=True)
             # 返回错误 ToolCall
@@ -686,45 +1053,247 @@ class ReactAgent:
                 confidence=0.0,
                 source="system"
             )
-            return error_tool_call
+            return [error_tool_call]
+    
+    async def _reason_and_act(
+        self,
+        query: str,
+        plan: ExecutionPlan,
+        history: List[ReActStep],
+        context: Dict[str, Any],
+        iteration: int,
+        streaming_callback: Optional[Any] = None
+    ) -> Tuple[str, List[ToolCall]]:
+        """
+        单次 LLM 调用同时生成思考和行动（single_call 迭代模式）
+        
+        使用 ReActIterationPrompt，流式输出时边接收边推送 JSON 中的 thought 字段，
+        完整响应到达后再解析出行动。相比 _reason + _act 少一次 LLM 往返。
+        
+        Args:
+            query: 用户查询
+            plan: 执行计划
+            history: 历史步骤
+            context: 上下文
+            iteration: 当前迭代次数
+            streaming_callback: 流式回调函数（可选）
+        
+        Returns:
+            Tuple[str, List[ToolCall]]: (思考内容, 选择的工具调用列表)
+        """
+        from ..prompts.react_prompts import ReActIterationPrompt, JsonFieldStreamer, format_tools_for_prompt
+        from ..services.llm_service import LLMServiceError
+        
+        logger.info(f"Generating reasoning and action for iteration {iteration} (single call)")
+        
+        thought = ""
+        
+        try:
+            # 检查 LLM 是否可用
+            if not self.llm_service or not self.llm_service.is_available():
+                raise LLMServiceError("LLM service not available. Please check your API configuration.")
+            
+            # 获取可用工具描述
+            tools = self.tool_registry.get_all_tools()
+            tools_description = format_tools_for_prompt([
+                {
+                    'name': tool.name,
+                    'description': tool.description,
+                    'parameters': [
+                        {'name': p.name, 'type': p.type}
+                        for p in tool.parameters
+                    ]
+                }
+                for tool in tools
+            ])
+            
+            # 构建提示
+            prompt = ReActIterationPrompt.create_prompt(
+                query=query,
+                plan=plan.to_dict(),
+                history=[step.to_dict() for step in history],
+                available_tools=tools_description,
+                iteration=iteration,
+                max_actions=self.max_actions_per_iteration
+            )
+            
+            # 如果有流式回调，流式生成并实时推送 thought 字段
+            if streaming_callback:
+                response = ""
+                streamed_thought = ""
+                thought_streamer = JsonFieldStreamer("thought")
+                async for chunk in self.llm_service.generate_text_stream(
+                    prompt,
+                    temperature=0.7,
+                    max_tokens=2000
+                ):
+                    response += chunk
+                    if thought_streamer.done:
+                        continue
+                    thought_chunk = thought_streamer.feed(chunk)
+                    if thought_chunk:
+                        streamed_thought += thought_chunk
+                        try:
+                            await streaming_callback("thought_chunk", {
+                                "step_number": iteration,
+                                "chunk": thought_chunk
+                            })
+                        except Exception as e:
+                            logger.warning(f"Streaming callback failed for thought_chunk: {e}")
+                thought = streamed_thought
+            else:
+                # 非流式调用
+                response = await self.llm_service.generate_text(
+                    prompt,
+                    temperature=0.7,
+                    max_tokens=2000
+                )
+            
+            # 解析响应（以完整 JSON 为准）
+            action_data = ReActIterationPrompt.parse_response(response)
+            thought = (action_data.get('thought') or thought or "Analyzing the situation...").strip()
+            
+            # 检查是否是解析错误
+            if action_data.get('tool_name') == '_parsing_error':
+                logger.error(f"LLM response: {response[:500]}...")
+                raise ValueError("Failed to parse LLM response into valid action")
+            
+            tool_calls = self._build_tool_calls(action_data, thought)
+            
+            for tool_call in tool_calls:
+                logger.info(f"Selected action: {tool_call.tool_name}({tool_call.parameters})")
+        
+        except (LLMServiceError, ValueError) as e:
+            logger.error(f"Single-call reasoning/action failed: {e}")
+            thought = thought or f"Error generating thought: {str(e)}"
+            tool_calls = [ToolCall(
+                tool_name="_error",
+                parameters={"error": str(e)},
+                reasoning="Action selection failed",
+                confidence=0.0,
+                source="system"
+            )]
+        except Exception as e:
+            logger.error(f"Unexpected error during single-call reasoning/action: {e}", exc_info=True)
+            thought = thought or f"Unexpected error during reasoning: {str(e)}"
+            tool_calls = [ToolCall(
+                tool_name="_error",
+                parameters={"error": str(e)},
+                reasoning="Unexpected error during action selection",
+                confidence=0.0,
+                source="system"
+            )]
+        
+        # 发送流式事件
+        await self._emit_actions(tool_calls, thought, iteration, streaming_callback)
+        
+        return thought, tool_calls
+    
+    def _build_tool_calls(self, action_data: Dict[str, Any], thought: str) -> List[ToolCall]:
+        """
+        将解析后的行动数据转换为 ToolCall 列表
+        
+        Args:
+            action_data: parse_response 返回的数据（单行动或 "actions" 列表）
+            thought: 思考内容（作为默认 reasoning）
+        
+        Returns:
+            List[ToolCall]: 工具调用列表（最多 max_actions_per_iteration 个）
+        """
+        from ..prompts.react_prompts import extract_actions
+        
+        return [
+            ToolCall(
+                tool_name=data.get('tool_name'),
+                parameters=data.get('parameters', {}),
+                reasoning=data.get('reasoning', thought),
+                confidence=0.8,
+                source="llm"
+            )
+            for data in extract_actions(action_data, self.max_actions_per_iteration)
+        ]
+    
+    async def _emit_actions(
+        self,
+        tool_calls: List[ToolCall],
+        thought: str,
+        iteration: int,
+        streaming_callback: Optional[Any] = None
+    ) -> None:
+        """
+        发送 action 流式事件（多行动时每个调用一个事件，带 call_index）
+        
+        Args:
+            tool_calls: 工具调用列表
+            thought: 思考内容
+            iteration: 当前迭代次数
+            streaming_callback: 流式回调函数（可选）
+        """
+        if not streaming_callback:
+            return
+        
+        for index, tool_call in enumerate(tool_calls):
+            event = {
+                "step_number": iteration,
+                "tool_name": tool_call.tool_name,
+                "parameters": tool_call.parameters,
+                "thought": thought
+            }
+            if len(tool_calls) > 1:
+                event["call_index"] = index
+            try:
+                await streaming_callback("action", event)
+            except Exception as e:
+                logger.warning(f"Streaming callback failed for action: {e}")
     
     async def _observe(
         self,
-        tool_call: ToolCall,
+        tool_calls: List[ToolCall],
         iteration: int,
         streaming_callback: Optional[Any] = None
-    ) -> ToolResult:
+    ) -> List[ToolResult]:
         """
         执行工具并收集观察结果（ReAct 的 Observe 步骤）
         
+        多个工具调用通过 ToolOrchestrator.execute_tools 并发执行（受并发上限约束）。
+        
         Args:
-            tool_call: 要执行的工具调用
+            tool_calls: 要执行的工具调用列表
             iteration: 当前迭代次数
             streaming_callback: 流式回调函数（可选）
         
         Returns:
-            ToolResult: 工具执行结果
+            List[ToolResult]: 与 tool_calls 一一对应的执行结果
         """
-        logger.info(f"Executing tool: {tool_call.tool_name}")
+        logger.info(f"Executing tools: {', '.join(tool_call.tool_name for tool_call in tool_calls)}")
         
         # 使用 ToolOrchestrator 执行工具（带缓存）
-        observation = await self.tool_orchestrator.execute_tool(tool_call, use_cache=True)
-        
-        logger.info(f"Tool execution {'succeeded' if observation.is_success() else 'failed'}")
+        if len(tool_calls) == 1:
+            observations = [await self.tool_orchestrator.execute_tool(tool_calls[0], use_cache=True)]
+        else:
+            observations = await self.tool_orchestrator.execute_tools(tool_calls, use_cache=True)
         
         # 发送流式事件
-        if streaming_callback:
+        for index, observation in enumerate(observations):
+            logger.info(f"Tool execution {'succeeded' if observation.is_success() else 'failed'}: {observation.tool_name}")
+            
+            if not streaming_callback:
+                continue
+            
+            event = {
+                "step_number": iteration,
+                "success": observation.is_success(),
+                "data": observation.data if observation.is_success() else None,
+                "error": observation.error if not observation.is_success() else None
+            }
+            if len(observations) > 1:
+                event["call_index"] = index
             try:
-                await streaming_callback("observation", {
-                    "step_number": iteration,
-                    "success": observation.is_success(),
-                    "data": observation.data if observation.is_success() else None,
-                    "error": observation.error if not observation.is_success() else None
-                })
+                await streaming_callback("observation", event)
             except Exception as e:
                 logger.warning(f"Streaming callback failed for observation: {e}")
         
-        return observation
+        return observations
 
     
     async def _synthesize_response(
@@ -834,6 +1403,36 @@ class ReactAgent:
             estimated_iterations=1
         )
     
+    def _resolve_iteration_mode(self, mode: Optional[str]) -> str:
+        """
+        校验迭代模式，无效值回退到 two_step
+        
+        Args:
+            mode: 迭代模式
+        
+        Returns:
+            str: 有效的迭代模式
+        """
+        if mode in self.ITERATION_MODES:
+            return mode
+        logger.warning(f"Unknown iteration mode '{mode}', using two_step")
+        return "two_step"
+    
+    def _resolve_evaluation_mode(self, mode: Optional[str]) -> str:
+        """
+        校验评估模式，无效值回退到 sync
+        
+        Args:
+            mode: 评估模式
+        
+        Returns:
+            str: 有效的评估模式
+        """
+        if mode in self.EVALUATION_MODES:
+            return mode
+        logger.warning(f"Unknown evaluation mode '{mode}', using sync")
+        return "sync"
+    
     def _generate_session_id(self) -> str:
         """
         生成唯一的会话 ID
@@ -8,6 +8,7 @@ Reflection Engine - 自我反思和质量评估引擎
 - 缺失信息识别
 """
 
+import random
 from typing import List, Dict, Any, Optional
 from loguru import logger
 
@@ -17,6 +18,7 @@ from ..models.react import (
     QualityEvaluation
 )
 from ..services.llm_service import BaseLLMService, get_llm_service, LLMServiceError
+from ..config import settings
 
 
 class ReflectionEngine:
@@ -35,15 +37,57 @@ class ReflectionEngine:
     - 支持自适应终止条件
     """
     
-    def __init__(self, llm_service: Optional[BaseLLMService] = None):
+    def __init__(
+        self,
+        llm_service: Optional[BaseLLMService] = None,
+        sample_rate: Optional[float] = None
+    ):
         """
         初始化反思引擎
         
         Args:
             llm_service: LLM 服务（可选）
+            sample_rate: LLM 评估抽样比例 0-1（默认使用 settings.REFLECTION_SAMPLE_RATE）
         """
         self.llm_service = llm_service or get_llm_service()
-        logger.info("ReflectionEngine initialized")
+        if sample_rate is None:
+            sample_rate = settings.REFLECTION_SAMPLE_RATE
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        logger.info(f"ReflectionEngine initialized (sample rate: {self.sample_rate:.0%})")
+    
+    def should_evaluate(self) -> bool:
+        """
+        按抽样比例决定本次请求是否进行 LLM 评估
+        
+        Returns:
+            bool: True 表示进行 LLM 评估，False 表示只使用规则评估
+        """
+        if self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+    
+    def quick_evaluation(
+        self,
+        output: str,
+        steps: List[ReActStep],
+        status: str = "skipped"
+    ) -> QualityEvaluation:
+        """
+        基于规则的即时评估（不调用 LLM）
+        
+        用于未被抽样的请求，以及后台评估完成前的临时结果。
+        
+        Args:
+            output: Agent 输出
+            steps: 执行步骤
+            status: 评估状态（"skipped" 或 "pending"）
+        
+        Returns:
+            QualityEvaluation: 评估结果
+        """
+        evaluation = self._fallback_evaluation(output, steps)
+        evaluation.status = status
+        return evaluation
     
     async def evaluate_output(
         self,
@@ -196,8 +240,11 @@ class ReflectionEngine:
         # 识别缺失信息
         missing_info = []
         if success_rate < 1.0:
-            failed_steps = [s for s in steps if not s.is_successful()]
-            missing_info = [f"Step {s.step_number} failed: {s.observation.error}" for s in failed_steps]
+            missing_info = [
+                f"Step {s.step_number} failed: {action.tool_name}: {observation.error}"
+                for s in steps
+                for action, observation in s.get_failed_calls()
+            ]
         
         needs_retry = completeness_score < 7
         
@@ -259,6 +306,20 @@ class ReflectionEngine:
             logger.info("Stopping: last step failed")
             return False
         
+        max_allowed = self._max_allowed_iterations(plan, absolute_max_iterations)
+        
+        # 条件 1b：最后一步部分失败，在迭代预算内把失败的调用交给下一轮推理
+        if last_step.status == "partial":
+            if current_iterations < max_allowed:
+                failed_tools = [action.tool_name for action, _ in last_step.get_failed_calls()]
+                logger.info(f"Continuing: last step partially failed ({', '.join(failed_tools)})")
+                return True
+            logger.info(
+                f"Stopping: last step partially failed and reached max allowed iterations "
+                f"({current_iterations}/{max_allowed})"
+            )
+            return False
+        
         # 条件 2：基于评估决定（如果有完整评估）
         if evaluation:
             if evaluation.completeness_score >= 8:
@@ -273,7 +334,12 @@ class ReflectionEngine:
         
         # 条件 3：检查计划步骤完成度
         # 统计已执行的不同工具类型
-        executed_tools = set(step.action.tool_name for step in steps if step.is_successful())
+        executed_tools = set(
+            action.tool_name
+            for step in steps
+            for action, observation in zip(step.get_actions(), step.get_observations())
+            if observation.is_success()
+        )
         planned_tools = set(step.tool_name for step in plan.steps)
         
         # 如果所有计划的工具都已执行，检查是否应该继续
@@ -293,16 +359,6 @@ class ReflectionEngine:
                 return False
         
         # 条件 4：对于复杂任务，允许更多迭代
-        if plan.complexity == "complex":
-            # 复杂任务允许超过估计迭代次数
-            max_allowed = min(plan.estimated_iterations + 2, absolute_max_iterations)
-        elif plan.complexity == "medium":
-            # 中等任务允许少量额外迭代
-            max_allowed = min(plan.estimated_iterations + 1, absolute_max_iterations)
-        else:
-            # 简单任务严格按照估计
-            max_allowed = min(plan.estimated_iterations, absolute_max_iterations)
-        
         if current_iterations >= max_allowed:
             logger.info(
                 f"Stopping: reached max allowed iterations for {plan.complexity} task "
@@ -317,6 +373,26 @@ class ReflectionEngine:
         )
         return True
     
+    def _max_allowed_iterations(self, plan: ExecutionPlan, absolute_max_iterations: int) -> int:
+        """
+        按任务复杂度计算允许的最大迭代次数
+        
+        Args:
+            plan: 执行计划
+            absolute_max_iterations: 绝对最大迭代次数
+        
+        Returns:
+            int: 允许的最大迭代次数
+        """
+        if plan.complexity == "complex":
+            # 复杂任务允许超过估计迭代次数
+            return min(plan.estimated_iterations + 2, absolute_max_iterations)
+        if plan.complexity == "medium":
+            # 中等任务允许少量额外迭代
+            return min(plan.estimated_iterations + 1, absolute_max_iterations)
+        # 简单任务严格按照估计
+        return min(plan.estimated_iterations, absolute_max_iterations)
+    
     def _clamp_score(self, score: Any) -> int:
         """
         将评分限制在 0-10 范围内
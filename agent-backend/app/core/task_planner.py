@@ -53,7 +53,8 @@ class TaskPlanner:
         self,
         query: str,
         conversation_history: Optional[List[ConversationTurn]] = None,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        complexity: Optional[str] = None
     ) -> ExecutionPlan:
         """
         创建执行计划
@@ -62,6 +63,7 @@ class TaskPlanner:
             query: 用户查询
             conversation_history: 对话历史
             context: 上下文信息
+            complexity: 已知的复杂度（可选，由 classify_complexity 预先计算）
         
         Returns:
             ExecutionPlan: 执行计划
@@ -81,7 +83,8 @@ class TaskPlanner:
             context = {}
         
         # 1. 分析复杂度
-        complexity = await self._classify_complexity(query, conversation_history)
+        if complexity not in ("simple", "medium", "complex"):
+            complexity = await self._classify_complexity(query, conversation_history)
         
         logger.info(f"Query complexity: {complexity}")
         
@@ -97,6 +100,26 @@ class TaskPlanner:
         
         return plan
     
+    async def classify_complexity(
+        self,
+        query: str,
+        conversation_history: Optional[List[ConversationTurn]] = None
+    ) -> str:
+        """
+        分类查询复杂度（公开接口）
+        
+        分类不依赖对话历史内容，调用方可以在加载历史的同时并发执行，
+        再把结果通过 create_plan(complexity=...) 传入。
+        
+        Args:
+            query: 用户查询
+            conversation_history: 对话历史（可选）
+        
+        Returns:
+            str: "simple", "medium", or "complex"
+        """
+        return await self._classify_complexity(query, conversation_history or [])
+    
     async def _classify_complexity(
         self,
         query: str,
@@ -596,6 +619,10 @@ Respond with ONLY a JSON object:
         if tool_name == "echo":
             return {"message": query}
         
+        # 已注册工具：只提取工具定义中存在的参数，保证计划步骤可以直接执行
+        tool = self.tool_registry.get_tool(tool_name)
+        param_names = {p.name for p in tool.parameters} if tool else None
+        
         # 对于其他工具，尝试提取常见参数
         params = {}
         
@@ -603,16 +630,25 @@ Respond with ONLY a JSON object:
         import re
         numbers = re.findall(r'\d+', query)
         if numbers:
-            params['limit'] = int(numbers[0])
+            if param_names is None:
+                params['limit'] = int(numbers[0])
+            else:
+                count_param = next((name for name in ('count', 'limit') if name in param_names), None)
+                if count_param:
+                    params[count_param] = int(numbers[0])
         
         # 提取查询关键词
         if "搜索" in query or "查找" in query or "search" in query.lower():
             # 提取搜索关键词（简单实现）
             words = query.split()
-            if len(words) > 1:
+            if len(words) > 1 and (param_names is None or 'query' in param_names):
                 params['query'] = ' '.join(words[1:])
         
-        return params if params else {"query": query}
+        # 没有提取到参数时把整个查询作为 query 传入；
+        # 已注册但没有 query 参数的工具不传（插件会忽略它，但它会让计划步骤无法直接执行）
+        if not params and (param_names is None or 'query' in param_names):
+            return {"query": query}
+        return params
     
     async def adjust_plan(
         self,
@@ -0,0 +1,231 @@
+"""
+Tool Result Cache - 工具结果缓存
+
+实现了：
+- O(1) LRU 淘汰（OrderedDict）
+- 按条目 TTL 过期（每个工具可以声明自己的 TTL）
+- 字节大小统计与上限
+- 命中/未命中/淘汰/过期计数（总计和按分组）
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from loguru import logger
+
+
+@dataclass
+class _CacheEntry:
+    """缓存条目"""
+    value: Any
+    expires_at: float
+    size: int
+    namespace: str
+
+
+class ToolResultCache:
+    """
+    LRU + TTL 缓存
+
+    功能：
+    - get/set 均为 O(1)
+    - 条目数和总字节数双重上限，超出时淘汰最久未使用的条目
+    - 统计信息用于根据实际命中率调整容量
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100,
+        max_bytes: Optional[int] = None,
+        default_ttl: float = 300
+    ):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 最大总字节数（None 表示不限制）
+            default_ttl: 默认 TTL（秒）
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+
+        # 统计计数
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._namespace_stats: Dict[str, Dict[str, int]] = {}
+
+    def get(self, key: str, namespace: str = "default") -> Optional[Any]:
+        """
+        获取缓存值（命中时移动到最近使用位置）
+
+        Args:
+            key: 缓存键
+            namespace: 统计分组（如工具名）
+
+        Returns:
+            Optional[Any]: 缓存值，不存在或已过期时返回 None
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self._counters(entry.namespace)["expirations"] += 1
+            entry = None
+
+        stats = self._counters(namespace)
+
+        if entry is None:
+            self.misses += 1
+            stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        stats["hits"] += 1
+        return entry.value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        namespace: str = "default",
+        size: Optional[int] = None
+    ) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: TTL（秒），None 使用默认值，<= 0 表示不缓存
+            namespace: 统计分组（如工具名）
+            size: 值的字节大小（None 时自动估算）
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        if size is None:
+            size = self.estimate_size(value)
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            logger.debug(f"Cache value too large ({size} bytes), skipping")
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = _CacheEntry(
+            value=value,
+            expires_at=time.monotonic() + ttl,
+            size=size,
+            namespace=namespace
+        )
+        self._total_bytes += size
+
+        # 超出上限时淘汰最久未使用的条目
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._total_bytes > self.max_bytes
+        ):
+            oldest_key = next(iter(self._entries))
+            evicted = self._remove(oldest_key)
+            self.evictions += 1
+            self._counters(evicted.namespace)["evictions"] += 1
+
+    def purge_expired(self) -> int:
+        """
+        清理所有已过期的条目
+
+        Returns:
+            int: 清理的条目数
+        """
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            self._counters(self._remove(key).namespace)["expirations"] += 1
+        self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        """清空缓存（保留统计计数）"""
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            Dict: 容量、字节数、命中率和按分组的统计
+        """
+        by_namespace: Dict[str, Dict[str, Any]] = {}
+        for name, counters in self._namespace_stats.items():
+            by_namespace[name] = {"entries": 0, "bytes": 0, **counters}
+        for entry in self._entries.values():
+            group = by_namespace.setdefault(
+                entry.namespace, {"entries": 0, "bytes": 0, **self._counters(entry.namespace)}
+            )
+            group["entries"] += 1
+            group["bytes"] += entry.size
+
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.default_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "by_tool": by_namespace
+        }
+
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        """
+        估算值的字节大小（JSON 序列化后的长度）
+
+        Args:
+            value: 缓存值
+
+        Returns:
+            int: 字节数
+        """
+        if hasattr(value, "to_dict"):
+            value = value.to_dict()
+        try:
+            return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+        except (TypeError, ValueError):
+            return len(str(value).encode("utf-8"))
+
+    def _counters(self, namespace: str) -> Dict[str, int]:
+        """获取分组的统计计数"""
+        return self._namespace_stats.setdefault(
+            namespace, {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        )
+
+    def _remove(self, key: str) -> _CacheEntry:
+        """删除条目并更新字节统计"""
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+        return entry
@@ -3,22 +3,26 @@ Tool Orchestrator - 工具编排器
 
 职责：
 1. 执行单个工具调用
-2. 执行工具链（多个工具按顺序）
+2. 执行工具链（按依赖关系并发执行）
 3. 解析参数引用（${step1.result}）
 4. 缓存工具结果
-5. 处理工具执行错误
+5. 合并并发的相同调用（singleflight）
+6. 处理工具执行错误
 """
 
+import re
 import time
+import asyncio
 import hashlib
 import json
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Set, TYPE_CHECKING
 from loguru import logger
 
 from ..models.tool import ToolCall, ToolResult
 from ..models.react import PlanStep
 from ..core.tool_registry import ToolRegistry, get_tool_registry
+from ..core.tool_cache import ToolResultCache
+from ..config import settings
 
 # 避免循环导入
 if TYPE_CHECKING:
@@ -31,20 +35,26 @@ class ToolOrchestrator:
     
     功能：
     - 执行单个工具
-    - 执行工具链
+    - 执行工具链（DAG 调度，独立步骤并发执行）
     - 参数解析（支持 ${stepN.result} 引用）
-    - 结果缓存（5 分钟 TTL）
+    - 结果缓存（LRU + 按工具 TTL，默认 5 分钟）
+    - 并发相同调用合并（同一缓存键只执行一次）
     - 错误处理
     """
     
     # 缓存配置
-    CACHE_TTL_SECONDS = 300  # 5 分钟
+    CACHE_TTL_SECONDS = 300  # 5 分钟（工具未声明 cache_ttl_seconds 时使用）
     MAX_CACHE_SIZE = 100  # 最多缓存 100 个结果
+    MAX_CACHE_BYTES = 10 * 1024 * 1024  # 缓存结果总大小上限 10 MB
+    
+    # 步骤引用模式：${stepN.result}
+    STEP_REFERENCE_PATTERN = re.compile(r'\$\{step(\d+)\.result\}')
     
     def __init__(
         self,
         tool_registry: Optional[ToolRegistry] = None,
-        plugin_manager: Optional['PluginManager'] = None
+        plugin_manager: Optional['PluginManager'] = None,
+        max_concurrency: Optional[int] = None
     ):
         """
         初始化工具编排器
@@ -52,12 +62,22 @@ class ToolOrchestrator:
         Args:
             tool_registry: 工具注册表
             plugin_manager: 插件管理器
+            max_concurrency: 工具链最大并发步骤数（默认使用 settings.TOOL_CHAIN_MAX_CONCURRENCY）
         """
         self.tool_registry = tool_registry or get_tool_registry()
         self.plugin_manager = plugin_manager
+        self.max_concurrency = max(1, max_concurrency or settings.TOOL_CHAIN_MAX_CONCURRENCY)
+        
+        # 结果缓存: {cache_key: ToolResult}
+        self._cache = ToolResultCache(
+            max_entries=self.MAX_CACHE_SIZE,
+            max_bytes=self.MAX_CACHE_BYTES,
+            default_ttl=self.CACHE_TTL_SECONDS
+        )
         
-        # 结果缓存: {cache_key: {"result": ToolResult, "timestamp": datetime}}
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        # 执行中的调用: {cache_key: _InFlightCall}
+        self._inflight: Dict[str, _InFlightCall] = {}
+        self._coalesced_calls = 0
         
         logger.info("ToolOrchestrator initialized")
     
@@ -86,56 +106,8 @@ class ToolOrchestrator:
                     logger.info(f"Using cached result for {tool_call.tool_name}")
                     return cached_result
             
-            # 获取工具定义
-            tool_def = self.tool_registry.get_tool(tool_call.tool_name)
-            
-            if not tool_def:
-                logger.warning(f"Tool not found: {tool_call.tool_name}")
-                return ToolResult(
-                    success=False,
-                    error=f"Tool not found: {tool_call.tool_name}",
-                    execution_time=0.0,
-                    tool_name=tool_call.tool_name
-                )
-            
-            logger.info(f"Executing tool: {tool_call.tool_name} with parameters: {tool_call.parameters}")
-            
-            # 检查 plugin_manager
-            if not self.plugin_manager:
-                logger.error("Plugin manager not available")
-                return ToolResult(
-                    success=False,
-                    error="Plugin manager not available",
-                    execution_time=0.0,
-                    tool_name=tool_call.tool_name
-                )
-            
-            # 获取对应的插件
-            plugin = self.plugin_manager.get_plugin(tool_def.plugin_id)
-            
-            if not plugin or not plugin.enabled:
-                logger.warning(f"Plugin not available: {tool_def.plugin_id}")
-                return ToolResult(
-                    success=False,
-                    error=f"Plugin not available: {tool_def.plugin_id}",
-                    execution_time=0.0,
-                    tool_name=tool_call.tool_name
-                )
-            
-            # 执行工具
-            result = await plugin.execute_tool(tool_call)
-            
-            # 记录执行时间
-            execution_time = time.time() - start_time
-            result.execution_time = execution_time
-            
-            # 缓存成功的结果
-            if result.success and use_cache:
-                self._cache_result(tool_call, result)
-            
-            logger.info(f"Tool executed: {tool_call.tool_name} (time: {execution_time:.2f}s, success: {result.success})")
-            
-            return result
+            # 相同的调用正在执行时等待其结果，而不是重复执行
+            return await self._execute_coalesced(tool_call, use_cache)
         
         except Exception as e:
             execution_time = time.time() - start_time
@@ -148,6 +120,141 @@ class ToolOrchestrator:
                 tool_name=tool_call.tool_name
             )
     
+    async def _execute_coalesced(self, tool_call: ToolCall, use_cache: bool) -> ToolResult:
+        """
+        合并并发的相同工具调用（singleflight）
+        
+        第一个调用创建执行任务，之后相同缓存键的调用共享该任务的结果（包括异常）。
+        某个等待者被取消只影响它自己；所有等待者都取消后才取消执行任务。
+        
+        Args:
+            tool_call: 工具调用对象
+            use_cache: 是否缓存结果
+        
+        Returns:
+            ToolResult: 工具执行结果
+        """
+        cache_key = self._get_cache_key(tool_call)
+        flight = self._inflight.get(cache_key)
+        
+        # 正在取消的执行不能再加入，否则新调用会收到不属于它的 CancelledError
+        if flight is not None and (flight.task.done() or flight.task.cancelling()):
+            flight = None
+        
+        if flight is None:
+            flight = _InFlightCall(asyncio.create_task(self._execute_uncached(tool_call, use_cache)))
+            self._inflight[cache_key] = flight
+            
+            def _clear_inflight(_task: asyncio.Task) -> None:
+                if self._inflight.get(cache_key) is flight:
+                    del self._inflight[cache_key]
+            
+            flight.task.add_done_callback(_clear_inflight)
+        else:
+            self._coalesced_calls += 1
+            logger.info(f"Joining in-flight execution of {tool_call.tool_name}")
+        
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                logger.info(f"All callers of {tool_call.tool_name} cancelled, cancelling execution")
+                if self._inflight.get(cache_key) is flight:
+                    del self._inflight[cache_key]
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+    
+    async def _execute_uncached(self, tool_call: ToolCall, use_cache: bool) -> ToolResult:
+        """
+        实际执行工具（不检查缓存）
+        
+        Args:
+            tool_call: 工具调用对象
+            use_cache: 是否缓存结果
+        
+        Returns:
+            ToolResult: 工具执行结果
+        """
+        start_time = time.time()
+        
+        # 获取工具定义
+        tool_def = self.tool_registry.get_tool(tool_call.tool_name)
+        
+        if not tool_def:
+            logger.warning(f"Tool not found: {tool_call.tool_name}")
+            return ToolResult(
+                success=False,
+                error=f"Tool not found: {tool_call.tool_name}",
+                execution_time=0.0,
+                tool_name=tool_call.tool_name
+            )
+        
+        logger.info(f"Executing tool: {tool_call.tool_name} with parameters: {tool_call.parameters}")
+        
+        # 检查 plugin_manager
+        if not self.plugin_manager:
+            logger.error("Plugin manager not available")
+            return ToolResult(
+                success=False,
+                error="Plugin manager not available",
+                execution_time=0.0,
+                tool_name=tool_call.tool_name
+            )
+        
+        # 获取对应的插件
+        plugin = self.plugin_manager.get_plugin(tool_def.plugin_id)
+        
+        if not plugin or not plugin.enabled:
+            logger.warning(f"Plugin not available: {tool_def.plugin_id}")
+            return ToolResult(
+                success=False,
+                error=f"Plugin not available: {tool_def.plugin_id}",
+                execution_time=0.0,
+                tool_name=tool_call.tool_name
+            )
+        
+        # 执行工具
+        result = await plugin.execute_tool(tool_call)
+        
+        # 记录执行时间
+        execution_time = time.time() - start_time
+        result.execution_time = execution_time
+        
+        # 缓存成功的结果
+        if result.success and use_cache:
+            self._cache_result(tool_call, result)
+        
+        logger.info(f"Tool executed: {tool_call.tool_name} (time: {execution_time:.2f}s, success: {result.success})")
+        
+        return result
+    
+    async def execute_tools(
+        self,
+        tool_calls: List[ToolCall],
+        use_cache: bool = True
+    ) -> List[ToolResult]:
+        """
+        并发执行多个互相独立的工具调用
+        
+        Args:
+            tool_calls: 工具调用列表
+            use_cache: 是否使用缓存
+        
+        Returns:
+            List[ToolResult]: 与 tool_calls 一一对应的执行结果
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run(tool_call: ToolCall) -> ToolResult:
+            async with semaphore:
+                return await self.execute_tool(tool_call, use_cache=use_cache)
+        
+        logger.info(f"Executing {len(tool_calls)} tool calls concurrently")
+        return list(await asyncio.gather(*(run(tool_call) for tool_call in tool_calls)))
+    
     async def execute_chain(
         self,
         plan_steps: List[PlanStep],
@@ -156,24 +263,110 @@ class ToolOrchestrator:
         """
         执行工具链
         
-        按顺序执行多个工具，支持步骤间的参数引用
+        按依赖关系（DAG）调度步骤：依赖来自参数中的 ${stepN.result} 引用
+        和 PlanStep.depends_on。没有依赖关系的步骤并发执行（受 max_concurrency 限制），
+        总耗时接近最长依赖路径而不是所有步骤之和。
+        
+        必需步骤失败后不再启动新的步骤（包括已创建但仍在等待并发名额的步骤），
+        已在执行中的步骤会等待完成。
         
         Args:
             plan_steps: 计划步骤列表
             context: 上下文信息
         
         Returns:
-            List[ToolResult]: 执行结果列表
+            List[ToolResult]: 所有已执行步骤的结果（按计划顺序，跳过未执行的步骤）
         """
         logger.info(f"Executing tool chain with {len(plan_steps)} steps")
         
         if context is None:
             context = {}
         
-        results = []
-        step_results = {}  # 存储每个步骤的结果，用于参数引用
+        dependencies = self._build_dependencies(plan_steps)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        halted = asyncio.Event()  # 必需步骤失败后置位，等待名额的步骤拿到名额后直接跳过
+        
+        results: Dict[int, ToolResult] = {}  # 步骤索引 -> 结果
+        step_results: Dict[str, ToolResult] = {}  # 存储每个步骤的结果，用于参数引用
+        remaining = list(range(len(plan_steps)))
+        running: Dict[asyncio.Task, int] = {}
+        
+        try:
+            while remaining or running:
+                # 启动所有依赖已完成的步骤
+                if not halted.is_set():
+                    ready = [i for i in remaining if dependencies[i].issubset(results)]
+                    for index in ready:
+                        remaining.remove(index)
+                        task = asyncio.create_task(
+                            self._execute_plan_step(plan_steps[index], step_results, semaphore, halted)
+                        )
+                        running[task] = index
+                
+                if not running:
+                    break
+                
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    index = running.pop(task)
+                    step = plan_steps[index]
+                    result = task.result()
+                    if result is None:
+                        continue  # 链已中止，步骤未执行
+                    
+                    results[index] = result
+                    step_results[f"step{step.step_number}"] = result
+                    
+                    if result.success:
+                        continue
+                    
+                    if step.required:
+                        # 如果是必需步骤且失败，不再启动新的步骤
+                        logger.warning(f"Required step {step.step_number} failed, halting chain")
+                        halted.set()
+                    else:
+                        # 如果是可选步骤且失败，继续执行
+                        logger.info(f"Optional step {step.step_number} failed, continuing")
+        finally:
+            for task in running:
+                task.cancel()
+        
+        # 按计划顺序返回所有已执行步骤的结果
+        ordered_results = [results[index] for index in range(len(plan_steps)) if index in results]
+        
+        skipped = [plan_steps[index].step_number for index in range(len(plan_steps)) if index not in results]
+        if skipped:
+            logger.info(f"Tool chain completed: {len(results)} steps executed, skipped steps {skipped}")
+        else:
+            logger.info(f"Tool chain completed: {len(results)} steps executed")
+        
+        return ordered_results
+    
+    async def _execute_plan_step(
+        self,
+        step: PlanStep,
+        step_results: Dict[str, ToolResult],
+        semaphore: asyncio.Semaphore,
+        halted: asyncio.Event
+    ) -> Optional[ToolResult]:
+        """
+        执行工具链中的单个步骤
+        
+        Args:
+            step: 计划步骤
+            step_results: 已完成步骤的结果（用于参数引用）
+            semaphore: 并发限制
+            halted: 工具链中止标志
         
-        for step in plan_steps:
+        Returns:
+            Optional[ToolResult]: 执行结果（异常转换为失败结果），等待名额期间链已中止时返回 None
+        """
+        async with semaphore:
+            if halted.is_set():
+                logger.info(f"Skipping step {step.step_number}: chain halted")
+                return None
+            
             logger.info(f"Executing step {step.step_number}: {step.tool_name}")
             
             try:
@@ -194,41 +387,95 @@ class ToolOrchestrator:
                 
                 # 执行工具
                 result = await self.execute_tool(tool_call)
-                
-                # 存储结果
-                results.append(result)
-                step_results[f"step{step.step_number}"] = result
-                
-                # 如果是必需步骤且失败，停止执行
-                if step.required and not result.success:
-                    logger.warning(f"Required step {step.step_number} failed, halting chain")
-                    break
-                
-                # 如果是可选步骤且失败，继续执行
-                if not step.required and not result.success:
-                    logger.info(f"Optional step {step.step_number} failed, continuing")
-                    continue
             
             except Exception as e:
                 logger.error(f"Step {step.step_number} execution failed: {e}", exc_info=True)
                 
                 # 创建失败结果
-                error_result = ToolResult(
+                result = ToolResult(
                     success=False,
                     error=str(e),
                     execution_time=0.0,
                     tool_name=step.tool_name
                 )
-                results.append(error_result)
-                
-                # 如果是必需步骤，停止执行
-                if step.required:
-                    logger.warning(f"Required step {step.step_number} failed with exception, halting chain")
-                    break
+            
+            # 释放名额前置位，排队中的步骤拿到名额时已能看到中止标志
+            if step.required and not result.success:
+                halted.set()
+            return result
+    
+    def _build_dependencies(self, plan_steps: List[PlanStep]) -> List[Set[int]]:
+        """
+        推断步骤间的依赖关系
+        
+        依赖来源：
+        1. PlanStep.depends_on
+        2. 参数中的 ${stepN.result} 引用
+        
+        只考虑指向计划中更早步骤的依赖（与顺序执行时的可见性一致），
+        因此依赖图一定无环。
+        
+        Args:
+            plan_steps: 计划步骤列表
         
-        logger.info(f"Tool chain completed: {len(results)} steps executed")
+        Returns:
+            List[Set[int]]: 每个步骤依赖的步骤索引集合
+        """
+        index_by_number: Dict[int, int] = {}
+        dependencies: List[Set[int]] = []
+        
+        for index, step in enumerate(plan_steps):
+            referenced = set()
+            if step.has_dependency():
+                referenced.add(step.depends_on)
+            for value in step.parameters.values():
+                if isinstance(value, str):
+                    referenced.update(int(n) for n in self.STEP_REFERENCE_PATTERN.findall(value))
+            
+            dependencies.append({
+                index_by_number[number] for number in referenced if number in index_by_number
+            })
+            index_by_number.setdefault(step.step_number, index)
         
-        return results
+        return dependencies
+    
+    def is_fully_specified(self, step: PlanStep) -> bool:
+        """
+        判断计划步骤是否可以不经 LLM 直接执行
+        
+        条件：
+        1. 工具已注册
+        2. 参数不包含 ${stepN.result} 引用
+        3. 参数名都在工具定义中，且必需参数齐全
+        4. 带枚举约束的参数取值合法
+        
+        Args:
+            step: 计划步骤
+        
+        Returns:
+            bool: 是否完全确定
+        """
+        try:
+            tool_def = self.tool_registry.get_tool(step.tool_name)
+            if not tool_def:
+                return False
+            
+            known_params = {p.name: p for p in tool_def.parameters}
+            
+            for name, value in step.parameters.items():
+                param = known_params.get(name)
+                if param is None:
+                    return False
+                if isinstance(value, str) and "${" in value:
+                    return False
+                if param.enum and value not in param.enum:
+                    return False
+            
+            return all(p.name in step.parameters for p in tool_def.get_required_parameters())
+        
+        except Exception as e:
+            logger.debug(f"Cannot verify plan step {step.step_number}: {e}")
+            return False
     
     def resolve_parameters(
         self,
@@ -247,15 +494,12 @@ class ToolOrchestrator:
         Returns:
             Dict: 解析后的参数
         """
-        import re
-        
         resolved = {}
         
         for key, value in parameters.items():
             if isinstance(value, str):
                 # 查找 ${stepN.result} 模式
-                pattern = r'\$\{step(\d+)\.result\}'
-                matches = re.findall(pattern, value)
+                matches = self.STEP_REFERENCE_PATTERN.findall(value)
                 
                 if matches:
                     # 替换引用
@@ -311,44 +555,26 @@ class ToolOrchestrator:
             Optional[ToolResult]: 缓存的结果，如果不存在或过期则返回 None
         """
         cache_key = self._get_cache_key(tool_call)
-        
-        if cache_key not in self._cache:
-            return None
-        
-        cached = self._cache[cache_key]
-        
-        # 检查是否过期
-        age = (datetime.now() - cached["timestamp"]).total_seconds()
-        if age > self.CACHE_TTL_SECONDS:
-            # 过期，删除缓存
-            del self._cache[cache_key]
-            return None
-        
-        return cached["result"]
+        return self._cache.get(cache_key, namespace=tool_call.tool_name)
     
     def _cache_result(self, tool_call: ToolCall, result: ToolResult) -> None:
         """
         缓存工具执行结果
         
+        TTL 优先使用工具定义中的 cache_ttl_seconds，未声明时使用 CACHE_TTL_SECONDS。
+        
         Args:
             tool_call: 工具调用
             result: 执行结果
         """
         cache_key = self._get_cache_key(tool_call)
         
-        # 如果缓存已满，删除最旧的条目
-        if len(self._cache) >= self.MAX_CACHE_SIZE:
-            oldest_key = min(
-                self._cache.keys(),
-                key=lambda k: self._cache[k]["timestamp"]
-            )
-            del self._cache[oldest_key]
+        tool_def = self.tool_registry.get_tool(tool_call.tool_name)
+        ttl = getattr(tool_def, "cache_ttl_seconds", None)
+        if not isinstance(ttl, (int, float)):
+            ttl = None
         
-        # 添加到缓存
-        self._cache[cache_key] = {
-            "result": result,
-            "timestamp": datetime.now()
-        }
+        self._cache.set(cache_key, result, ttl=ttl, namespace=tool_call.tool_name)
         
         logger.debug(f"Cached result for {tool_call.tool_name} (cache size: {len(self._cache)})")
     
@@ -365,12 +591,22 @@ class ToolOrchestrator:
             Dict: 缓存统计
         """
         return {
-            "size": len(self._cache),
-            "max_size": self.MAX_CACHE_SIZE,
-            "ttl_seconds": self.CACHE_TTL_SECONDS
+            **self._cache.get_stats(),
+            "inflight": len(self._inflight),
+            "coalesced_calls": self._coalesced_calls
         }
 
 
+class _InFlightCall:
+    """执行中的工具调用（共享任务和等待者计数）"""
+    
+    __slots__ = ("task", "waiters")
+    
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
 # 全局实例
 _tool_orchestrator: Optional[ToolOrchestrator] = None
 
@@ -4,6 +4,7 @@ from .config import settings
 from .api.routes import agent
 from .api.middleware import setup_error_handlers
 from .db import get_db_pool, close_db_pool
+from .core.plugin_manager import plugin_manager
 import uvicorn
 from loguru import logger
 
@@ -35,16 +36,18 @@ app.include_router(agent.router, prefix="/api/agent", tags=["agent"])
 # 应用启动事件
 @app.on_event("startup")
 async def startup_event():
-    """应用启动时初始化数据库连接池"""
+    """应用启动时初始化数据库连接池和插件资源"""
     logger.info("Application starting up...")
     await get_db_pool()
+    await plugin_manager.startup()
 
 
 # 应用关闭事件
 @app.on_event("shutdown")
 async def shutdown_event():
-    """应用关闭时清理数据库连接池"""
+    """应用关闭时清理数据库连接池和插件资源"""
     logger.info("Application shutting down...")
+    await plugin_manager.shutdown()
     await close_db_pool()
 
 
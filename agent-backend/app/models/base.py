@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 
@@ -24,6 +24,47 @@ class AgentRequest(BaseModel):
     command: str = ""  # 废弃，使用 input 代替
 
 
+class StreamPacing(BaseModel):
+    """
+    SSE 流式输出节奏控制（打字机效果）
+    
+    节奏只在 SSE 发送端生效，不会拖慢 LLM 服务或 Agent 循环。
+    通过 AgentRequest.context["pacing"] 按请求配置：
+    - true / false：开启或关闭（使用默认延迟）
+    - {"thought_chunk_delay_ms": 50, ...}：开启并覆盖延迟（超出上限的配置视为无效）
+    
+    延迟来自客户端，设置上限避免单个请求长时间占用 SSE 连接。
+    """
+    enabled: bool = False
+    thought_chunk_delay_ms: int = Field(default=50, ge=0, le=200)  # 思考块之间的延迟
+    response_chunk_delay_ms: int = Field(default=30, ge=0, le=200)  # 最终响应块之间的延迟
+    iteration_delay_ms: int = Field(default=200, ge=0, le=1000)  # 每次迭代（observation）之后的延迟
+    
+    @classmethod
+    def from_context(cls, context: Dict[str, Any], default_enabled: bool = False) -> "StreamPacing":
+        """从请求上下文解析节奏配置，无效配置回退为默认值"""
+        raw = (context or {}).get("pacing")
+        if isinstance(raw, bool):
+            return cls(enabled=raw)
+        if isinstance(raw, dict):
+            try:
+                return cls(**{"enabled": True, **raw})
+            except ValueError:
+                pass
+        return cls(enabled=default_enabled)
+    
+    def delay_for(self, event_type: str) -> float:
+        """返回发送该类型事件后需要等待的秒数"""
+        if not self.enabled:
+            return 0.0
+        delays_ms = {
+            "thought_chunk": self.thought_chunk_delay_ms,
+            "response_chunk": self.response_chunk_delay_ms,
+            "observation": self.iteration_delay_ms,
+        }
+        return max(0, delays_ms.get(event_type, 0)) / 1000.0
+
+
 class AgentResponse(BaseModel):
     """Agent 响应模型 - 支持传统和 ReactAgent 响应"""
     success: bool
@@ -79,3 +120,19 @@ class BasePlugin(ABC):
             ToolResult: 工具执行结果
         """
         pass
+
+    async def startup(self) -> None:
+        """
+        应用启动时调用（可选）
+        
+        子类可以重写此方法以创建长期持有的资源（如 HTTP 会话）。
+        """
+        pass
+
+    async def shutdown(self) -> None:
+        """
+        应用关闭时调用（可选）
+        
+        子类可以重写此方法以释放 startup 中创建的资源。
+        """
+        pass
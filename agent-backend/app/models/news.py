@@ -10,6 +10,7 @@ class NewsItem(BaseModel):
     publish_time: str
     category: Optional[str] = None
     tags: List[str] = []
+    sources: List[str] = []  # 同一事件被多个源报道时，所有来源（含自身）
 
 
 class NewsCategory(BaseModel):
@@ -10,7 +10,7 @@ ReAct Agent Data Models - ReAct Agent 数据模型
 - ConversationTurn: 对话轮次
 """
 
-from typing import Dict, Any, List, Optional, Literal
+from typing import Dict, Any, List, Optional, Literal, Tuple
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
 
@@ -29,9 +29,17 @@ class ReActStep(BaseModel):
     thought: str = Field(..., description="Agent 的思考过程和推理")
     action: ToolCall = Field(..., description="选择执行的工具调用")
     observation: ToolResult = Field(..., description="工具执行的观察结果")
-    status: Literal["pending", "running", "completed", "failed"] = Field(
+    actions: List[ToolCall] = Field(
+        default_factory=list,
+        description="多行动迭代中并发执行的全部工具调用（第一项与 action 相同，单行动时为空）"
+    )
+    observations: List[ToolResult] = Field(
+        default_factory=list,
+        description="与 actions 一一对应的观察结果"
+    )
+    status: Literal["pending", "running", "completed", "partial", "failed"] = Field(
         default="pending",
-        description="步骤状态"
+        description="步骤状态（partial 表示多行动步骤中部分调用失败）"
     )
     timestamp: datetime = Field(default_factory=datetime.now, description="步骤时间戳")
     
@@ -51,7 +59,7 @@ class ReActStep(BaseModel):
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
-        return {
+        result = {
             "step_number": self.step_number,
             "thought": self.thought,
             "action": self.action.to_dict(),
@@ -59,14 +67,34 @@ class ReActStep(BaseModel):
             "status": self.status,
             "timestamp": self.timestamp.isoformat()
         }
+        if self.actions:
+            result["actions"] = [a.to_dict() for a in self.actions]
+            result["observations"] = [o.to_dict() for o in self.observations]
+        return result
+    
+    def get_actions(self) -> List[ToolCall]:
+        """获取本步骤的全部工具调用"""
+        return self.actions or [self.action]
+    
+    def get_observations(self) -> List[ToolResult]:
+        """获取本步骤的全部观察结果"""
+        return self.observations or [self.observation]
+    
+    def get_failed_calls(self) -> List[Tuple[ToolCall, ToolResult]]:
+        """获取本步骤中失败的 (工具调用, 观察结果) 对"""
+        return [
+            (action, observation)
+            for action, observation in zip(self.get_actions(), self.get_observations())
+            if not observation.is_success()
+        ]
     
     def is_completed(self) -> bool:
         """判断步骤是否完成"""
-        return self.status in ["completed", "failed"]
+        return self.status in ["completed", "partial", "failed"]
     
     def is_successful(self) -> bool:
-        """判断步骤是否成功"""
-        return self.status == "completed" and self.observation.is_success()
+        """判断步骤是否成功（多行动步骤要求全部调用成功）"""
+        return self.status == "completed" and all(o.is_success() for o in self.get_observations())
 
 
 class PlanStep(BaseModel):
@@ -192,6 +220,10 @@ class QualityEvaluation(BaseModel):
     needs_retry: bool = Field(..., description="是否需要重试")
     suggestions: List[str] = Field(default_factory=list, description="改进建议")
     evaluated_at: datetime = Field(default_factory=datetime.now, description="评估时间")
+    status: Literal["final", "pending", "skipped"] = Field(
+        default="final",
+        description="评估状态: final（已评估）, pending（后台评估中）, skipped（未抽样，仅规则评估）"
+    )
     
     @validator('completeness_score', 'quality_score')
     def validate_score_range(cls, v):
@@ -208,7 +240,8 @@ class QualityEvaluation(BaseModel):
             "missing_info": self.missing_info,
             "needs_retry": self.needs_retry,
             "suggestions": self.suggestions,
-            "evaluated_at": self.evaluated_at.isoformat()
+            "evaluated_at": self.evaluated_at.isoformat(),
+            "status": self.status
         }
     
     def is_high_quality(self) -> bool:
@@ -240,6 +273,8 @@ class ReactResponse(BaseModel):
     execution_time: float = Field(..., ge=0, description="总执行时间（秒）")
     error: Optional[str] = Field(default=None, description="错误信息")
     timestamp: datetime = Field(default_factory=datetime.now, description="响应时间戳")
+    stage_timings: Dict[str, float] = Field(default_factory=dict, description="各阶段耗时（秒）")
+    conversation_id: Optional[int] = Field(default=None, description="数据库记录 ID（保存后填充）")
     
     # 向后兼容字段
     type: str = Field(default="react", description="响应类型")
@@ -272,6 +307,7 @@ class ReactResponse(BaseModel):
             "execution_time": self.execution_time,
             "error": self.error,
             "timestamp": self.timestamp.isoformat(),
+            "stage_timings": self.stage_timings,
             "type": self.type,
             "plugin": self.plugin,
             "command": self.command
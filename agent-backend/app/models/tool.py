@@ -64,6 +64,10 @@ class ToolDefinition(BaseModel):
     plugin_id: str = Field(..., description="所属插件 ID")
     command: str = Field(..., description="对应的命令，如 /latest")
     category: str = Field(default="general", description="工具分类")
+    cache_ttl_seconds: Optional[int] = Field(
+        default=None,
+        description="结果缓存时间（秒），None 使用编排器默认值，0 表示不缓存"
+    )
     
     @validator('name')
     def validate_name(cls, v):
@@ -124,7 +128,8 @@ class ToolDefinition(BaseModel):
             "examples": self.examples,
             "plugin_id": self.plugin_id,
             "command": self.command,
-            "category": self.category
+            "category": self.category,
+            "cache_ttl_seconds": self.cache_ttl_seconds
         }
 
 
@@ -17,6 +17,14 @@ class NewsPlugin(BasePlugin):
         # 获取 LLM 服务用于深度分析
         self.llm_service = get_llm_service()
     
+    async def startup(self) -> None:
+        """应用启动时打开 HTTP 会话"""
+        await self.news_service.start()
+
+    async def shutdown(self) -> None:
+        """应用关闭时关闭 HTTP 会话"""
+        await self.news_service.close()
+    
     def get_tool_definitions(self) -> List[ToolDefinition]:
         """返回工具定义列表（NEW）"""
         return [
@@ -54,7 +62,8 @@ class NewsPlugin(BasePlugin):
                 ],
                 plugin_id=self.id,
                 command="/latest",
-                category="news"
+                category="news",
+                cache_ttl_seconds=300
             ),
             ToolDefinition(
                 name="get_trending_topics",
@@ -80,7 +89,8 @@ class NewsPlugin(BasePlugin):
                 ],
                 plugin_id=self.id,
                 command="/trending",
-                category="news"
+                category="news",
+                cache_ttl_seconds=600
             ),
             ToolDefinition(
                 name="deep_analysis",
@@ -105,7 +115,8 @@ class NewsPlugin(BasePlugin):
                 ],
                 plugin_id=self.id,
                 command="/deepdive",
-                category="analysis"
+                category="analysis",
+                cache_ttl_seconds=1800
             )
         ]
 
@@ -290,8 +301,8 @@ class NewsPlugin(BasePlugin):
         response_text += f"[ANALYSIS] Processing recent developments in {topic}...\n\n"
 
         try:
-            # 1. 搜索相关新闻
-            related_news = await self.news_service.search_news(topic, limit=10)
+            # 1. 按 TF-IDF 相似度查找相关新闻
+            related_news = await self.news_service.find_related_news(topic, limit=10)
             
             if not related_news:
                 response_text += "[WARNING] No recent news found for this topic.\n"
@@ -332,7 +343,7 @@ class NewsPlugin(BasePlugin):
         summary = f"Recent news about {topic}:\n\n"
         for i, item in enumerate(news_items[:5], 1):  # 只取前5条
             summary += f"{i}. {item.title}\n"
-            summary += f"   Source: {item.source} | {item.publish_time}\n"
+            summary += f"   Source: {', '.join(item.sources or [item.source])} | {item.publish_time}\n"
             summary += f"   Summary: {item.summary[:200]}...\n\n"
         
         return summary
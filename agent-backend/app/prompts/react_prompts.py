@@ -186,8 +186,9 @@ Focus on analysis and reasoning - you will select the specific action in the nex
             for step in history:
                 history_text += f"Step {step['step_number']}:\n"
                 history_text += f"  Thought: {step['thought']}\n"
-                history_text += f"  Action: {step['action']['tool_name']}({step['action']['parameters']})\n"
-                history_text += f"  Observation: {step['observation'].get('data', step['observation'].get('error', 'N/A'))}\n"
+                for action, observation in get_step_calls(step):
+                    history_text += f"  Action: {action['tool_name']}({action['parameters']})\n"
+                    history_text += f"  Observation: {format_observation(observation)}\n"
                 history_text += f"  Status: {step['status']}\n"
         
         # 构建计划上下文
@@ -264,7 +265,8 @@ Be specific and actionable in your tool selection."""
         plan: Dict[str, Any],
         history: List[Dict[str, Any]],
         available_tools: str,
-        iteration: int
+        iteration: int,
+        max_actions: int = 1
     ) -> str:
         """
         创建行动选择提示
@@ -276,6 +278,7 @@ Be specific and actionable in your tool selection."""
             history: 已执行的步骤历史
             available_tools: 可用工具描述
             iteration: 当前迭代次数
+            max_actions: 单次迭代最多可并发执行的工具调用数（>1 时允许返回 "actions" 列表）
         
         Returns:
             str: 完整的提示文本
@@ -285,7 +288,14 @@ Be specific and actionable in your tool selection."""
         if history:
             history_text = "\n\nPrevious Actions:\n"
             for step in history:
-                history_text += f"Step {step['step_number']}: {step['action']['tool_name']} - {step['status']}\n"
+                tool_names = ", ".join(action['tool_name'] for action, _ in get_step_calls(step))
+                history_text += f"Step {step['step_number']}: {tool_names} - {step['status']}\n"
+                for action, observation in get_step_calls(step):
+                    if not observation.get('success'):
+                        history_text += (
+                            f"  Failed: {action['tool_name']}({action['parameters']}) - "
+                            f"{observation.get('error') or 'Unknown error'}\n"
+                        )
         
         prompt = f"""You are executing a task using the ReAct framework.
 
@@ -321,7 +331,7 @@ Example response:
   }},
   "reasoning": "This will retrieve the most recent news articles about OpenAI"
 }}
-
+{format_multi_action_instructions(max_actions)}
 CRITICAL RULES:
 - Return ONLY the JSON object
 - Do NOT wrap in markdown code blocks (no ```)
@@ -425,7 +435,8 @@ Always be explicit about your reasoning and choose actions that make progress to
         plan: Dict[str, Any],
         history: List[Dict[str, Any]],
         available_tools: str,
-        iteration: int
+        iteration: int,
+        max_actions: int = 1
     ) -> str:
         """
         创建 ReAct 迭代提示
@@ -436,6 +447,7 @@ Always be explicit about your reasoning and choose actions that make progress to
             history: 已执行的步骤历史
             available_tools: 可用工具描述
             iteration: 当前迭代次数
+            max_actions: 单次迭代最多可并发执行的工具调用数（>1 时允许返回 "actions" 列表）
         
         Returns:
             str: 完整的提示文本
@@ -447,8 +459,9 @@ Always be explicit about your reasoning and choose actions that make progress to
             for step in history:
                 history_text += f"Step {step['step_number']}:\n"
                 history_text += f"  Thought: {step['thought']}\n"
-                history_text += f"  Action: {step['action']['tool_name']}({step['action']['parameters']})\n"
-                history_text += f"  Observation: {step['observation'].get('data', step['observation'].get('error', 'N/A'))}\n"
+                for action, observation in get_step_calls(step):
+                    history_text += f"  Action: {action['tool_name']}({action['parameters']})\n"
+                    history_text += f"  Observation: {format_observation(observation)}\n"
                 history_text += f"  Status: {step['status']}\n"
         
         # 构建计划上下文
@@ -493,7 +506,7 @@ Example response:
   }},
   "reasoning": "This will retrieve the most recent news articles about OpenAI"
 }}
-
+{format_multi_action_instructions(max_actions, include_thought=True)}
 CRITICAL RULES:
 - Return ONLY the JSON object
 - Do NOT wrap in markdown code blocks (no ```)
@@ -749,14 +762,17 @@ Always be clear, concise, and helpful in your responses."""
         # 构建执行历史
         execution_history = ""
         for step in execution_steps:
-            execution_history += f"\nStep {step['step_number']}: {step['action']['tool_name']}\n"
+            calls = get_step_calls(step)
+            tool_names = ", ".join(action['tool_name'] for action, _ in calls)
+            execution_history += f"\nStep {step['step_number']}: {tool_names}\n"
             execution_history += f"  Thought: {step['thought']}\n"
             
-            observation = step['observation']
-            if observation.get('success'):
-                execution_history += f"  Result: {observation.get('data', 'N/A')}\n"
-            else:
-                execution_history += f"  Error: {observation.get('error', 'Unknown error')}\n"
+            for action, observation in calls:
+                prefix = f"[{action['tool_name']}] " if len(calls) > 1 else ""
+                if observation.get('success'):
+                    execution_history += f"  {prefix}Result: {observation.get('data', 'N/A')}\n"
+                else:
+                    execution_history += f"  {prefix}Error: {observation.get('error', 'Unknown error')}\n"
         
         prompt = f"""Synthesize a final response based on the agent's execution history.
 
@@ -823,8 +839,178 @@ Generate the final response (plain text, not JSON):"""
         return response.strip()
 
 
+class JsonFieldStreamer:
+    """
+    流式 JSON 字段提取器
+    
+    从逐块到达的 JSON 文本中增量提取某个字符串字段的值，
+    用于在 LLM 仍在生成完整 JSON 时实时推送 thought 内容。
+    
+    只负责"尽早展示"，最终结果仍以完整 JSON 的解析结果为准。
+    """
+    
+    _ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '"': '"', '\\': '\\', '/': '/'}
+    
+    def __init__(self, field: str):
+        """
+        Args:
+            field: 要提取的字段名（值必须是字符串）
+        """
+        import re
+        
+        self._pattern = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._pos = 0
+        self._state = "search"  # search -> value -> done
+    
+    @property
+    def done(self) -> bool:
+        """字段值是否已经完整读取"""
+        return self._state == "done"
+    
+    def feed(self, chunk: str) -> str:
+        """
+        输入一个文本块，返回本次新解码出的字段内容
+        
+        Args:
+            chunk: LLM 输出的文本块
+        
+        Returns:
+            str: 新增的字段内容（可能为空字符串）
+        """
+        self._buffer += chunk
+        
+        if self._state == "search":
+            match = self._pattern.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+            self._state = "value"
+        
+        if self._state != "value":
+            return ""
+        
+        buf = self._buffer
+        i = self._pos
+        out = []
+        while i < len(buf):
+            char = buf[i]
+            if char == '\\':
+                # 转义序列不完整时等待下一个块
+                if i + 1 >= len(buf):
+                    break
+                escape = buf[i + 1]
+                if escape == 'u':
+                    if i + 6 > len(buf):
+                        break
+                    try:
+                        out.append(chr(int(buf[i + 2:i + 6], 16)))
+                    except ValueError:
+                        pass
+                    i += 6
+                    continue
+                out.append(self._ESCAPES.get(escape, escape))
+                i += 2
+                continue
+            if char == '"':
+                self._state = "done"
+                i += 1
+                break
+            out.append(char)
+            i += 1
+        
+        self._pos = i
+        return "".join(out)
+
+
 # 便利函数
 
+def format_multi_action_instructions(max_actions: int, include_thought: bool = False) -> str:
+    """
+    生成多行动说明（允许一次迭代返回多个互相独立的工具调用）
+    
+    Args:
+        max_actions: 单次迭代最多工具调用数，<= 1 时返回空字符串
+        include_thought: 示例中是否包含 thought 字段
+    
+    Returns:
+        str: 提示片段
+    """
+    if max_actions <= 1:
+        return ""
+    
+    thought_line = '\n  "thought": "Your detailed reasoning about the next step",' if include_thought else ""
+    
+    return f"""
+If the task needs several pieces of information that do NOT depend on each other,
+you may request up to {max_actions} tool calls at once. They will run in parallel.
+Use an "actions" list instead of a single tool_name:
+{{{thought_line}
+  "actions": [
+    {{"tool_name": "get_latest_news", "parameters": {{"count": 5}}, "reasoning": "Recent headlines"}},
+    {{"tool_name": "get_trending_topics", "parameters": {{}}, "reasoning": "Current hot topics"}}
+  ]
+}}
+Only batch calls whose parameters do not need another call's result.
+"""
+
+
+def extract_actions(action_data: Dict[str, Any], max_actions: int = 1) -> List[Dict[str, Any]]:
+    """
+    从解析后的 LLM 响应中提取工具调用列表
+    
+    支持单个行动（tool_name/parameters）和多行动（actions 列表）两种格式。
+    
+    Args:
+        action_data: parse_response 返回的数据
+        max_actions: 最多保留的工具调用数
+    
+    Returns:
+        List[Dict]: 工具调用数据列表（至少一项）
+    """
+    actions = action_data.get('actions')
+    if isinstance(actions, list):
+        valid = [a for a in actions if isinstance(a, dict) and a.get('tool_name')]
+        if valid:
+            return valid[:max(1, max_actions)]
+    
+    return [action_data]
+
+
+def get_step_calls(step: Dict[str, Any]) -> List[tuple]:
+    """
+    获取步骤字典中的 (action, observation) 对
+    
+    多行动步骤使用 actions/observations 列表，单行动步骤使用 action/observation。
+    
+    Args:
+        step: ReActStep.to_dict() 的结果
+    
+    Returns:
+        List[tuple]: (action, observation) 列表
+    """
+    actions = step.get('actions')
+    observations = step.get('observations')
+    if actions and observations:
+        return list(zip(actions, observations))
+    return [(step['action'], step['observation'])]
+
+
+def format_observation(observation: Dict[str, Any]) -> str:
+    """
+    格式化观察结果（失败的调用显示错误信息，而不是空的 data）
+    
+    Args:
+        observation: ToolResult.to_dict() 的结果
+    
+    Returns:
+        str: 观察结果文本
+    """
+    if observation.get('success', True) and not observation.get('error'):
+        return str(observation.get('data', 'N/A'))
+    return f"FAILED: {observation.get('error') or 'Unknown error'}"
+
+
 def format_tools_for_prompt(tools: List[Dict[str, Any]]) -> str:
     """
     格式化工具列表为提示文本
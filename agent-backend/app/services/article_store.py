@@ -0,0 +1,360 @@
+"""
+Article Store - 滚动文章库
+
+以规范化 URL/GUID 为主键保存文章：
+- 每次刷新只合并新增或内容变化的文章
+- 跨源转载的同一篇文章只保留一份
+- 按发布时间保留窗口内的文章（不再受单个源每次只返回 N 条的限制）
+- 按发布时间维护有序索引，过期文章用二分查找批量淘汰
+- 内部使用紧凑的 Article 记录，只在 API/工具边界转换为 NewsItem
+"""
+
+import hashlib
+import sys
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from ..models.news import NewsItem
+from ..utils import canonicalize_url
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_timestamp(publish_time: str) -> int:
+    """把 YYYY-MM-DD HH:MM:SS 转换为 epoch 秒（无法解析时使用当前时间）"""
+    try:
+        return int(datetime.strptime(publish_time, TIME_FORMAT).timestamp())
+    except ValueError:
+        return int(datetime.now().timestamp())
+
+
+def format_timestamp(timestamp: int) -> str:
+    """把 epoch 秒格式化为 YYYY-MM-DD HH:MM:SS"""
+    return datetime.fromtimestamp(timestamp).strftime(TIME_FORMAT)
+
+
+class Article:
+    """
+    文章库内部使用的紧凑文章记录
+
+    - __slots__ 避免每个实例的 __dict__
+    - 来源/分类/标签字符串驻留（大量文章共享同一个对象）
+    - 发布时间保存为 epoch 整数，排序和窗口比较不再比较字符串
+    - 预先计算小写字段，过滤时不再重复 lower()
+    """
+
+    __slots__ = (
+        "key", "title", "summary", "url", "source", "category", "tags", "published",
+        "fingerprint", "source_lower", "category_lower", "tags_lower", "sources"
+    )
+
+    def __init__(
+        self,
+        key: str,
+        title: str,
+        summary: str,
+        url: str,
+        source: str,
+        published: int,
+        category: Optional[str] = None,
+        tags: Tuple[str, ...] = (),
+        fingerprint: str = ""
+    ):
+        self.key = key
+        self.title = title
+        self.summary = summary
+        self.url = url
+        self.source = sys.intern(source)
+        self.category = sys.intern(category) if category else None
+        self.tags = tuple(sys.intern(tag) for tag in tags)
+        self.published = published
+        self.fingerprint = fingerprint
+        self.source_lower = sys.intern(source.lower())
+        self.category_lower = sys.intern(category.lower()) if category else ""
+        self.tags_lower = tuple(sys.intern(tag.lower()) for tag in tags)
+        self.sources: Tuple[str, ...] = ()  # 近似重复簇的所有来源（由 NearDuplicateIndex 填充）
+
+    @classmethod
+    def from_news_item(cls, item: NewsItem, key: Optional[str] = None) -> "Article":
+        """
+        从 NewsItem 创建文章记录
+
+        Args:
+            item: 新闻
+            key: 文章主键（默认按 URL 计算）
+
+        Returns:
+            Article: 文章记录
+        """
+        return cls(
+            key=key or ArticleStore.article_key(item),
+            title=item.title,
+            summary=item.summary,
+            url=item.url,
+            source=item.source,
+            published=parse_timestamp(item.publish_time),
+            category=item.category,
+            tags=tuple(item.tags),
+            fingerprint=ArticleStore.fingerprint(item)
+        )
+
+    @property
+    def publish_time(self) -> str:
+        """格式化的发布时间"""
+        return format_timestamp(self.published)
+
+    def to_news_item(self) -> NewsItem:
+        """转换为 API 使用的 NewsItem"""
+        return NewsItem(
+            title=self.title,
+            summary=self.summary,
+            url=self.url,
+            source=self.source,
+            publish_time=self.publish_time,
+            category=self.category,
+            tags=list(self.tags),
+            sources=list(self.sources)
+        )
+
+
+def to_news_items(articles: Iterable[Article]) -> List[NewsItem]:
+    """
+    批量转换为 NewsItem（API/工具边界使用）
+
+    Args:
+        articles: 文章记录
+
+    Returns:
+        新闻列表
+    """
+    return [article.to_news_item() for article in articles]
+
+
+@dataclass
+class StoreChanges:
+    """一次合并/淘汰产生的变更（用于增量更新派生索引）"""
+    upserted: Dict[str, Article] = field(default_factory=dict)  # 新增或更新的文章
+    removed: Dict[str, Article] = field(default_factory=dict)   # 被移除的旧版本
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    evicted: int = 0
+    skipped: int = 0  # 已超出保留窗口的文章
+
+    @property
+    def changed(self) -> bool:
+        """是否有任何变更"""
+        return bool(self.upserted or self.removed)
+
+
+class ArticleStore:
+    """
+    去重的滚动文章库
+
+    所有操作都在事件循环中同步执行，不需要加锁。
+    """
+
+    def __init__(self, retention_hours: float = 72, max_articles: int = 5000):
+        """
+        初始化文章库
+
+        Args:
+            retention_hours: 保留窗口（小时），按发布时间计算
+            max_articles: 文章数上限（超出时淘汰最旧的文章）
+        """
+        self.retention = timedelta(hours=retention_hours)
+        self.max_articles = max_articles
+
+        self._articles: Dict[str, Article] = {}
+        # (published, key) 按发布时间升序排列
+        self._order: List[Tuple[int, str]] = []
+
+    @staticmethod
+    def article_key(item: NewsItem) -> str:
+        """
+        计算文章主键（规范化 URL/GUID，缺失时退化为来源 + 标题）
+
+        Args:
+            item: 新闻
+
+        Returns:
+            主键
+        """
+        if item.url:
+            return canonicalize_url(item.url)
+        return f"{item.source}:{item.title}"
+
+    @staticmethod
+    def fingerprint(item: NewsItem) -> str:
+        """
+        内容指纹（不含来源，转载的相同内容视为未变化）
+
+        不含发布时间：没有日期的条目每次解析都会以当前时间作为发布时间。
+        """
+        content = "\x1f".join([
+            item.title, item.summary, item.category or "", "\x1e".join(item.tags)
+        ])
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def merge(self, items: Iterable[NewsItem], now: Optional[datetime] = None) -> StoreChanges:
+        """
+        合并一批文章，并淘汰超出保留窗口的旧文章
+
+        Args:
+            items: 新解析的文章
+            now: 当前时间（默认 datetime.now()）
+
+        Returns:
+            StoreChanges: 本次变更
+        """
+        changes = StoreChanges()
+        cutoff = self._cutoff(now)
+
+        for item in items:
+            article = Article.from_news_item(item)
+            if article.published < cutoff:
+                changes.skipped += 1
+                continue
+
+            key = article.key
+            previous = self._articles.get(key)
+
+            if previous is not None:
+                if previous.fingerprint == article.fingerprint:
+                    changes.unchanged += 1
+                    continue
+                self._remove(key)
+                changes.removed[key] = previous
+                changes.updated += 1
+                # 发布时间不随更新后移（没有日期的条目保留首次看到的时间）
+                article.published = min(article.published, previous.published)
+            else:
+                changes.added += 1
+
+            self._articles[key] = article
+            insort(self._order, (article.published, key))
+            changes.upserted[key] = article
+
+        self._evict(cutoff, changes)
+
+        if changes.changed:
+            logger.info(
+                f"Article store merged: +{changes.added} ~{changes.updated} "
+                f"-{changes.evicted} (total {len(self._articles)})"
+            )
+        return changes
+
+    def restore(self, articles: Iterable[Article], now: Optional[datetime] = None) -> StoreChanges:
+        """
+        从快照恢复文章记录（不重新计算主键和指纹）
+
+        Args:
+            articles: 快照中的文章记录
+            now: 当前时间（默认 datetime.now()）
+
+        Returns:
+            StoreChanges: 本次变更
+        """
+        changes = StoreChanges()
+        cutoff = self._cutoff(now)
+
+        for article in articles:
+            if article.published < cutoff:
+                changes.skipped += 1
+                continue
+
+            key = article.key
+            previous = self._articles.get(key)
+            if previous is not None:
+                self._remove(key)
+                changes.removed[key] = previous
+                changes.updated += 1
+            else:
+                changes.added += 1
+
+            self._articles[key] = article
+            insort(self._order, (article.published, key))
+            changes.upserted[key] = article
+
+        self._evict(cutoff, changes)
+        return changes
+
+    def evict_expired(self, now: Optional[datetime] = None) -> StoreChanges:
+        """
+        淘汰超出保留窗口的文章
+
+        Args:
+            now: 当前时间（默认 datetime.now()）
+
+        Returns:
+            StoreChanges: 本次变更
+        """
+        changes = StoreChanges()
+        self._evict(self._cutoff(now), changes)
+        return changes
+
+    def get(self, key: str) -> Optional[Article]:
+        """按主键获取文章"""
+        return self._articles.get(key)
+
+    def latest(self, limit: Optional[int] = None) -> List[Article]:
+        """
+        按发布时间倒序返回文章
+
+        Args:
+            limit: 返回数量（None 表示全部）
+
+        Returns:
+            文章记录列表
+        """
+        order = self._order if limit is None else self._order[-limit:] if limit > 0 else []
+        return [self._articles[key] for _, key in reversed(order)]
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._articles
+
+    def get_stats(self) -> Dict:
+        """
+        获取文章库统计信息
+
+        Returns:
+            Dict: 文章数、保留窗口和时间范围
+        """
+        return {
+            "articles": len(self._articles),
+            "max_articles": self.max_articles,
+            "retention_hours": self.retention.total_seconds() / 3600,
+            "oldest": format_timestamp(self._order[0][0]) if self._order else None,
+            "newest": format_timestamp(self._order[-1][0]) if self._order else None
+        }
+
+    def _cutoff(self, now: Optional[datetime]) -> int:
+        """保留窗口的起始时间（epoch 秒）"""
+        return int(((now or datetime.now()) - self.retention).timestamp())
+
+    def _evict(self, cutoff: int, changes: StoreChanges):
+        """淘汰早于 cutoff 的文章以及超出数量上限的最旧文章"""
+        expired = bisect_left(self._order, (cutoff,))
+        overflow = len(self._order) - expired - self.max_articles
+        count = expired + max(0, overflow)
+        if count <= 0:
+            return
+
+        for _, key in self._order[:count]:
+            changes.removed[key] = self._articles.pop(key)
+            changes.upserted.pop(key, None)
+        del self._order[:count]
+        changes.evicted += count
+
+    def _remove(self, key: str):
+        """移除单篇文章（更新前调用）"""
+        article = self._articles.pop(key)
+        index = bisect_left(self._order, (article.published, key))
+        del self._order[index]
@@ -0,0 +1,208 @@
+"""
+Dedup Index - 跨源近似重复文章聚类
+
+同一事件经常被多个源同时报道（官方博客、TechCrunch、VentureBeat ...）。
+这里对标题计算 MinHash 签名，用 LSH 分桶找候选，估算 Jaccard 相似度
+超过阈值的文章归为一簇；每簇只保留一篇代表文章（最早发布），并记录所有来源。
+"""
+
+import zlib
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from ..utils import tokenize
+from .article_store import Article
+
+# 2^31 - 1：a, b, h 都小于它，a * h + b 不会超出 uint64
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH 近似重复检测
+
+    所有操作都在事件循环中同步执行，不需要加锁。
+    """
+
+    def __init__(self, threshold: float = 0.5, num_perm: int = 64, bands: int = 32, seed: int = 1):
+        """
+        初始化索引
+
+        Args:
+            threshold: 判定为重复的最低 Jaccard 相似度估计值
+            num_perm: MinHash 签名长度
+            bands: LSH 分段数（num_perm 必须能被整除）
+            seed: 哈希函数随机种子（固定，保证签名稳定）
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = {}
+        self._articles: Dict[str, Article] = {}
+
+        # 聚类：文章 -> 代表文章；代表文章 -> 成员
+        self._cluster_of: Dict[str, str] = {}
+        self._members: Dict[str, List[str]] = {}
+
+    @staticmethod
+    def _shingles(article: Article) -> Set[str]:
+        """
+        标题词 + 标题的相邻词对
+
+        不使用摘要：各源的摘要长短和措辞差异很大，摘要词对会稀释同一事件标题的相似度。
+        """
+        tokens = tokenize(article.title)
+        shingles = set(tokens)
+        shingles.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        return shingles
+
+    def signature(self, article: Article) -> np.ndarray:
+        """
+        计算 MinHash 签名
+
+        Args:
+            article: 文章记录
+
+        Returns:
+            np.ndarray: 长度为 num_perm 的签名
+        """
+        shingles = self._shingles(article) or {article.title}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) % _MERSENNE_PRIME for shingle in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def add(self, key: str, article: Article) -> Set[str]:
+        """
+        添加文章并归入最相似的簇（没有相似簇时自成一簇）
+
+        Args:
+            key: 文章主键
+            article: 文章记录
+
+        Returns:
+            代表身份可能发生变化的文章主键
+        """
+        affected = {key}
+        if key in self._articles:
+            affected |= self.remove(key)
+
+        signature = self.signature(article)
+        best_key, best_score = None, self.threshold
+        for candidate in self._candidates(signature):
+            score = float(np.mean(self._signatures[candidate] == signature))
+            if score >= best_score:
+                best_key, best_score = candidate, score
+
+        self._signatures[key] = signature
+        self._articles[key] = article
+        for band in range(self.bands):
+            self._buckets.setdefault(self._band_key(signature, band), set()).add(key)
+
+        if best_key is None:
+            self._cluster_of[key] = key
+            self._members[key] = [key]
+            return affected
+
+        representative = self._cluster_of[best_key]
+        members = self._members[representative]
+        members.append(key)
+        affected.add(representative)
+        self._elect(representative, members)
+        return affected
+
+    def remove(self, key: str) -> Set[str]:
+        """
+        移除文章（不存在时忽略）
+
+        Args:
+            key: 文章主键
+
+        Returns:
+            代表身份可能发生变化的文章主键
+        """
+        if key not in self._articles:
+            return set()
+
+        signature = self._signatures.pop(key)
+        del self._articles[key]
+        for band in range(self.bands):
+            band_key = self._band_key(signature, band)
+            bucket = self._buckets[band_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band_key]
+
+        representative = self._cluster_of.pop(key)
+        members = self._members.pop(representative)
+        members.remove(key)
+        affected = {key}
+        if members:
+            affected.update(members)
+            self._elect(members[0], members)
+        return affected
+
+    def is_representative(self, key: str) -> bool:
+        """文章是否为所在簇的代表"""
+        return self._cluster_of.get(key) == key
+
+    def sources(self, key: str) -> Tuple[str, ...]:
+        """
+        获取代表文章所在簇的所有来源（代表文章的来源在前）
+
+        Args:
+            key: 代表文章主键
+
+        Returns:
+            来源列表（没有重复报道时为空）
+        """
+        members = self._members.get(key)
+        if not members or len(members) < 2:
+            return ()
+        return tuple(dict.fromkeys(self._articles[member].source for member in members))
+
+    def get_stats(self) -> Dict:
+        """
+        获取统计信息
+
+        Returns:
+            Dict: 文章数、簇数和被合并的重复文章数
+        """
+        return {
+            "articles": len(self._articles),
+            "clusters": len(self._members),
+            "duplicates": len(self._articles) - len(self._members),
+            "threshold": self.threshold
+        }
+
+    def _candidates(self, signature: np.ndarray) -> Set[str]:
+        """与签名至少有一段完全相同的文章"""
+        candidates: Set[str] = set()
+        for band in range(self.bands):
+            candidates |= self._buckets.get(self._band_key(signature, band), set())
+        return candidates
+
+    def _band_key(self, signature: np.ndarray, band: int) -> Tuple[int, bytes]:
+        """签名第 band 段的分桶键"""
+        return band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _elect(self, current: str, members: List[str]):
+        """选出最早发布的文章作为代表，并重新登记簇"""
+        members.sort(key=lambda member: (self._articles[member].published, member))
+        representative = members[0]
+        self._members.pop(current, None)
+        self._members[representative] = members
+        for member in members:
+            self._cluster_of[member] = representative
@@ -0,0 +1,295 @@
+"""
+Feed Parser - RSS 解析与规范化
+
+把 feedparser.parse 以及 clean_html / truncate_text / extract_ai_keywords
+这些 CPU 密集的同步步骤放到线程池或进程池中执行，避免阻塞事件循环。
+"""
+
+import asyncio
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+import feedparser
+from loguru import logger
+
+from ..models.news import NewsItem
+from ..utils import clean_html, truncate_text, extract_ai_keywords_batch, parse_rss_entry
+
+
+# RSS <item> / Atom <entry> 的结束标签（允许命名空间前缀）
+ENTRY_END_PATTERN = re.compile(rb"</(?:[\w.-]+:)?(?:item|entry)\s*>")
+
+
+async def read_feed_body(
+    chunks: AsyncIterator[bytes],
+    max_entries: int,
+    max_bytes: int
+) -> Tuple[bytes, bool]:
+    """
+    流式读取 RSS 响应体，读够 max_entries 条或达到 max_bytes 时提前停止
+
+    边读边用 XMLPullParser 增量解析，只统计 item/entry 结束事件（并立即释放元素），
+    不构建完整文档树。提前停止时截断到最后一条完整 entry 之后，feedparser 可以宽松解析。
+    内容不是合法 XML 时不再计数，只受字节上限约束。
+
+    Args:
+        chunks: 响应体数据块
+        max_entries: 最多需要的条目数
+        max_bytes: 最多读取的字节数（恰好等于上限的响应体不算截断）
+
+    Returns:
+        (响应体, 是否提前停止)
+    """
+    parser: Optional[XMLPullParser] = XMLPullParser(events=("end",))
+    buffer = bytearray()
+    entries = 0
+    truncated = False
+
+    async for chunk in chunks:
+        remaining = max_bytes - len(buffer)
+        if len(chunk) > remaining:
+            buffer += chunk[:remaining]
+            truncated = True
+            break
+        buffer += chunk
+
+        if parser is None:
+            continue
+        try:
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                if element.tag.rsplit("}", 1)[-1] in ("item", "entry"):
+                    entries += 1
+                    element.clear()
+        except ParseError:
+            parser = None  # 不是合法 XML，交给 feedparser 宽松解析
+            continue
+
+        if entries >= max_entries:
+            truncated = True
+            break
+
+    body = bytes(buffer)
+    if truncated:
+        last = None
+        for last in ENTRY_END_PATTERN.finditer(body):
+            pass
+        if last is not None:
+            body = body[:last.end()]
+    return body, truncated
+
+
+def parse_feed_content(
+    content: bytes,
+    source: str,
+    max_entries: int = 20,
+    content_type: Optional[str] = None
+) -> List[NewsItem]:
+    """
+    解析 RSS 内容并规范化为 NewsItem 列表
+
+    模块级函数，可以在进程池中执行。
+
+    Args:
+        content: RSS XML 原始内容
+        source: 来源名称
+        max_entries: 最多解析的条目数
+        content_type: HTTP Content-Type 响应头（字符集只在响应头中声明时用于解码）
+
+    Returns:
+        新闻列表
+    """
+    response_headers = {"content-type": content_type} if content_type else None
+    feed = feedparser.parse(content, response_headers=response_headers)
+
+    # 1. 解析并清洗每条 entry
+    records = []
+    for entry in feed.entries[:max_entries]:
+        try:
+            # 解析 RSS entry
+            parsed = parse_rss_entry(entry)
+
+            # 清理和截断摘要
+            parsed['summary'] = truncate_text(clean_html(parsed['summary']), max_length=300)
+            records.append(parsed)
+
+        except Exception as e:
+            logger.warning(f"Failed to parse entry from {source}: {e}")
+            continue
+
+    # 2. 没有标签的条目批量提取关键词
+    untagged = [parsed for parsed in records if not parsed['tags']]
+    keywords = extract_ai_keywords_batch(
+        parsed['title'] + ' ' + parsed['summary'] for parsed in untagged
+    )
+    for parsed, tags in zip(untagged, keywords):
+        parsed['tags'] = tags
+
+    # 3. 构建 NewsItem
+    news_items = []
+    for parsed in records:
+        try:
+            news_items.append(NewsItem(
+                title=parsed['title'],
+                summary=parsed['summary'],
+                url=parsed['url'],
+                source=source,
+                publish_time=parsed['publish_time'],
+                category=parsed['category'],
+                tags=parsed['tags']
+            ))
+        except Exception as e:
+            logger.warning(f"Failed to parse entry from {source}: {e}")
+
+    return news_items
+
+
+def _timed_parse(
+    content: bytes,
+    source: str,
+    max_entries: int,
+    content_type: Optional[str]
+) -> Tuple[List[NewsItem], float]:
+    """在工作线程/进程中解析并返回耗时"""
+    start = time.perf_counter()
+    items = parse_feed_content(content, source, max_entries, content_type)
+    return items, time.perf_counter() - start
+
+
+class FeedParsePool:
+    """
+    有界的 RSS 解析池
+
+    - mode: "thread"（默认）| "process" | "inline"（在事件循环中直接执行，用于调试）
+    - 同时提交的任务数不超过 max_pending，超出时等待
+    - 记录提交数、失败数、解析耗时和排队耗时
+    """
+
+    MODES = ("thread", "process", "inline")
+
+    def __init__(self, mode: str = "thread", max_workers: int = 2, max_pending: Optional[int] = None):
+        """
+        初始化解析池
+
+        Args:
+            mode: 执行模式
+            max_workers: 工作线程/进程数
+            max_pending: 最多同时提交的任务数（默认 max_workers * 2）
+        """
+        if mode not in self.MODES:
+            logger.warning(f"Unknown feed parse mode '{mode}', using thread")
+            mode = "thread"
+
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max_pending or self.max_workers * 2
+
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # 统计
+        self._completed = 0
+        self._failed = 0
+        self._in_flight = 0
+        self._total_parse_seconds = 0.0
+        self._max_parse_seconds = 0.0
+        self._total_wait_seconds = 0.0
+
+    async def parse(
+        self,
+        content: bytes,
+        source: str,
+        max_entries: int = 20,
+        content_type: Optional[str] = None
+    ) -> List[NewsItem]:
+        """
+        在池中解析 RSS 内容
+
+        Args:
+            content: RSS XML 原始内容
+            source: 来源名称
+            max_entries: 最多解析的条目数
+            content_type: HTTP Content-Type 响应头
+
+        Returns:
+            新闻列表
+        """
+        if self.mode == "inline":
+            items, seconds = _timed_parse(content, source, max_entries, content_type)
+            self._record(seconds, 0.0)
+            return items
+
+        queued_at = time.perf_counter()
+        async with self._get_semaphore():
+            wait_seconds = time.perf_counter() - queued_at
+            self._in_flight += 1
+            try:
+                loop = asyncio.get_running_loop()
+                items, seconds = await loop.run_in_executor(
+                    self._get_executor(), _timed_parse, content, source, max_entries, content_type
+                )
+            except Exception:
+                self._failed += 1
+                raise
+            finally:
+                self._in_flight -= 1
+
+        self._record(seconds, wait_seconds)
+        return items
+
+    def shutdown(self):
+        """关闭工作线程/进程"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取解析池统计信息
+
+        Returns:
+            Dict: 模式、容量、任务数和耗时统计
+        """
+        completed = self._completed
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._in_flight,
+            "completed": completed,
+            "failed": self._failed,
+            "avg_parse_ms": round(self._total_parse_seconds / completed * 1000, 2) if completed else 0.0,
+            "max_parse_ms": round(self._max_parse_seconds * 1000, 2),
+            "avg_wait_ms": round(self._total_wait_seconds / completed * 1000, 2) if completed else 0.0
+        }
+
+    def _record(self, parse_seconds: float, wait_seconds: float):
+        """记录一次完成的解析"""
+        self._completed += 1
+        self._total_parse_seconds += parse_seconds
+        self._max_parse_seconds = max(self._max_parse_seconds, parse_seconds)
+        self._total_wait_seconds += wait_seconds
+
+    def _get_executor(self) -> Executor:
+        """按需创建执行器"""
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="feed-parse"
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """获取当前事件循环的并发限制"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+            self._semaphore_loop = loop
+        return self._semaphore
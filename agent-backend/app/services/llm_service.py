@@ -3,7 +3,9 @@ LLM Service - 统一的 LLM 调用接口
 支持多个 LLM 提供商（Gemini, OpenAI）
 """
 import json
-from typing import Dict, Any, Optional, List
+import threading
+import concurrent.futures
+from typing import Dict, Any, Optional, List, Callable, Iterable, AsyncIterator
 from abc import ABC, abstractmethod
 from loguru import logger
 
@@ -85,6 +87,10 @@ class GeminiLLMService(BaseLLMService):
     单一职责：封装 Gemini API 的调用
     """
     
+    # 流式输出配置
+    STREAM_QUEUE_MAXSIZE = 32  # 工作线程与事件循环之间的缓冲块数（背压上限）
+    STREAM_CHUNK_TIMEOUT = 15.0  # 两个文本块之间的最大等待时间（秒）
+    
     def __init__(self, api_key: str, model: str = "gemini-1.5-flash"):
         self.api_key = api_key
         self.model_name = model
@@ -280,27 +286,36 @@ class GeminiLLMService(BaseLLMService):
         max_tokens: int = 3000,  # Increased default for complex tasks - prevents truncation
         response_format: str = "text",
         max_retries: int = 3,
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        chunk_timeout: Optional[float] = None
     ):
         """
-        流式调用 Gemini API（带重试机制）
+        流式调用 Gemini API（带重试机制和超时）
+        
+        SDK 的流式迭代器是同步阻塞的，这里通过 _stream_in_thread 在工作线程中
+        驱动迭代器，事件循环只等待队列，不会被 Gemini 的网络 I/O 卡住。
         
         Args:
             prompt: 提示词
             temperature: 温度参数 (0-1)
             max_tokens: 最大 token 数
             response_format: 响应格式 ("text" | "json")
-            max_retries: 最大重试次数
-            timeout: 超时时间（秒）
+            max_retries: 最大重试次数（只在尚未输出任何文本块时重试）
+            timeout: 整个流的总超时时间（秒）
+            chunk_timeout: 两个文本块之间的最大等待时间（秒，默认 STREAM_CHUNK_TIMEOUT）
         
         Yields:
             str: 文本块
         """
         import asyncio
         
+        if chunk_timeout is None:
+            chunk_timeout = self.STREAM_CHUNK_TIMEOUT
+        
         last_error = None
         
         for attempt in range(max_retries):
+            chunks_emitted = 0
             try:
                 generation_config = {
                     "temperature": temperature,
@@ -313,48 +328,129 @@ class GeminiLLMService(BaseLLMService):
                 else:
                     prompt_with_format = prompt
                 
-                # 使用 stream=True 开启流式输出
-                # 注意：不能使用 asyncio.to_thread，因为需要迭代生成器
-                response_stream = self.model.generate_content(
-                    prompt_with_format,
-                    generation_config=generation_config,
-                    stream=True  # 关键：开启流式输出
+                # 使用 stream=True 开启流式输出，迭代在工作线程中进行
+                stream = self._stream_in_thread(
+                    lambda: self.model.generate_content(
+                        prompt_with_format,
+                        generation_config=generation_config,
+                        stream=True  # 关键：开启流式输出
+                    ),
+                    chunk_timeout=chunk_timeout,
+                    total_timeout=timeout
                 )
                 
-                # 流式处理响应
-                for chunk in response_stream:
-                    if chunk.text:
-                        yield chunk.text
-                        # 添加延迟，让流式效果更明显
-                        # 思考过程：50ms 延迟（更慢，让用户看清推理过程）
-                        # 最终响应：30ms 延迟（稍快，但仍有打字机效果）
-                        await asyncio.sleep(0.05)  # 50ms
+                # 不在这里做节奏控制（打字机效果由 SSE 层按请求配置处理）
+                async for text in stream:
+                    chunks_emitted += 1
+                    yield text
                 
                 # 成功完成，退出重试循环
                 return
             
-            except asyncio.TimeoutError:
-                last_error = LLMServiceError(f"Gemini API stream timed out after {timeout}s")
-                logger.warning(f"Gemini API stream timed out (attempt {attempt + 1}/{max_retries})")
-                
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    await asyncio.sleep(wait_time)
-            
             except Exception as e:
                 last_error = e
                 logger.warning(f"Gemini API stream failed (attempt {attempt + 1}/{max_retries}): {e}")
                 
+                # 已经向调用方输出过内容，重试会产生重复文本，直接失败
+                if chunks_emitted > 0:
+                    break
+                
                 if attempt < max_retries - 1:
                     wait_time = (attempt + 1) * 2
                     logger.info(f"Retrying in {wait_time} seconds...")
                     await asyncio.sleep(wait_time)
         
         # 所有重试都失败
-        logger.error(f"Gemini API stream failed after {max_retries} attempts")
+        logger.error(f"Gemini API stream failed after {attempt + 1} attempts")
         raise last_error
     
+    async def _stream_in_thread(
+        self,
+        iterator_factory: Callable[[], Iterable[Any]],
+        chunk_timeout: float,
+        total_timeout: float
+    ) -> AsyncIterator[str]:
+        """
+        在工作线程中驱动同步流式迭代器，通过 asyncio.Queue 把文本块交回事件循环
+        
+        - 背压：队列有上限（STREAM_QUEUE_MAXSIZE），消费慢时工作线程阻塞等待
+        - 超时：每个文本块之间不超过 chunk_timeout，整个流不超过 total_timeout
+        - 取消：消费方提前退出时通知工作线程在下一个块后停止
+        
+        Args:
+            iterator_factory: 创建 SDK 流式迭代器的函数（在工作线程中调用）
+            chunk_timeout: 块间超时（秒）
+            total_timeout: 总超时（秒）
+        
+        Yields:
+            str: 文本块
+        
+        Raises:
+            LLMServiceError: 超时
+            Exception: SDK 迭代过程中抛出的原始异常
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.STREAM_QUEUE_MAXSIZE)
+        stop_event = threading.Event()
+        
+        def put(kind: str, payload: Any = None) -> bool:
+            """从工作线程放入队列；队列满时阻塞（背压），消费方退出时返回 False"""
+            try:
+                future = asyncio.run_coroutine_threadsafe(queue.put((kind, payload)), loop)
+            except RuntimeError:
+                # 事件循环已关闭
+                return False
+            while True:
+                try:
+                    future.result(timeout=0.5)
+                    return True
+                except concurrent.futures.TimeoutError:
+                    if stop_event.is_set():
+                        future.cancel()
+                        return False
+                except Exception:
+                    return False
+        
+        def worker() -> None:
+            try:
+                for chunk in iterator_factory():
+                    if stop_event.is_set():
+                        return
+                    text = chunk.text
+                    if text and not put("chunk", text):
+                        return
+                put("done")
+            except Exception as e:
+                put("error", e)
+        
+        thread = threading.Thread(target=worker, name="gemini-stream", daemon=True)
+        thread.start()
+        
+        deadline = loop.time() + total_timeout
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise LLMServiceError(f"Gemini API stream timed out after {total_timeout}s")
+                
+                wait = min(chunk_timeout, remaining)
+                try:
+                    kind, payload = await asyncio.wait_for(queue.get(), timeout=wait)
+                except asyncio.TimeoutError:
+                    if wait < chunk_timeout:
+                        raise LLMServiceError(f"Gemini API stream timed out after {total_timeout}s")
+                    raise LLMServiceError(f"Gemini API stream stalled: no chunk within {chunk_timeout}s")
+                
+                if kind == "done":
+                    return
+                if kind == "error":
+                    raise payload
+                yield payload
+        finally:
+            stop_event.set()
+    
     def _build_tool_selection_prompt(self, user_input: str, tools_description: str, context: Optional[Dict[str, Any]] = None) -> str:
         """构建工具选择的 prompt"""
         prompt = f"""You are an AI assistant that helps users by selecting the most appropriate tool for their request.
@@ -1,23 +1,198 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from loguru import logger
-import feedparser
 import aiohttp
 from collections import Counter
 
-from ..models.news import NewsItem, TrendingTopic
+from ..config import settings
+from ..models.news import NewsItem, NewsCategory, TrendingTopic
 from ..mocks import get_mock_news, get_mock_trending
-from ..utils import (
-    clean_html,
-    truncate_text,
-    extract_ai_keywords,
-    parse_rss_entry,
-    calculate_relevance_score,
-    sort_by_relevance,
-    filter_by_category,
-    filter_by_source
-)
+from .feed_parser import FeedParsePool, read_feed_body
+from .article_store import Article, ArticleStore, StoreChanges, to_news_items
+from .search_index import SearchIndex
+from .similarity_index import SimilarityIndex
+from .trending_engine import TrendingEngine
+from .snapshot_index import SnapshotIndex
+from .dedup_index import NearDuplicateIndex
+from .snapshot_store import NewsSnapshotFile
+
+
+@dataclass
+class FeedState:
+    """
+    单个 RSS 源的抓取和调度状态
+    
+    - 保存 HTTP 校验器（ETag/Last-Modified）和内容哈希，源未变化时直接复用上次解析出的新闻
+    - 按观察到的发布频率调整轮询间隔，失败时指数退避
+    - 连续失败达到阈值后熔断：冷却期内跳过该源，冷却结束后放行一次半开探测，
+      探测成功则恢复，失败则重新进入冷却
+    - 记录延迟、错误数和条目数统计
+    """
+    # 轮询间隔（秒）
+    DEFAULT_POLL_INTERVAL = 900
+    MIN_POLL_INTERVAL = 300
+    MAX_POLL_INTERVAL = 6 * 3600
+    QUIET_BACKOFF_FACTOR = 1.5  # 内容未变化时放慢轮询
+    # 失败退避
+    FAILURE_THRESHOLD = 3  # 连续失败次数达到阈值时熔断
+    MAX_BACKOFF = 3600
+    CIRCUIT_COOLDOWN = 3600  # 熔断后到下一次半开探测的间隔
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    items: List[NewsItem] = field(default_factory=list)
+    # 最近一次抓取状态：fresh（重新解析）| not_modified（HTTP 304）| hash_unchanged（内容未变）| error
+    last_status: Optional[str] = None
+    last_fetch_time: Optional[datetime] = None
+
+    # 调度
+    poll_interval: float = DEFAULT_POLL_INTERVAL
+    next_poll_at: Optional[datetime] = None
+    consecutive_failures: int = 0
+
+    # 统计
+    total_requests: int = 0
+    total_errors: int = 0
+    last_latency: float = 0.0
+    avg_latency: float = 0.0
+
+    def is_due(self, now: datetime) -> bool:
+        """是否到了下一次轮询时间（熔断的源在冷却结束后才到期，作为半开探测）"""
+        return self.next_poll_at is None or now >= self.next_poll_at
+
+    def is_circuit_open(self) -> bool:
+        """连续失败次数是否达到熔断阈值"""
+        return self.consecutive_failures >= self.FAILURE_THRESHOLD
+
+    def circuit_state(self, now: datetime) -> str:
+        """
+        熔断状态
+
+        Args:
+            now: 当前时间
+
+        Returns:
+            closed（正常）| open（冷却中，跳过）| half_open（冷却结束，下一次抓取为探测）
+        """
+        if not self.is_circuit_open():
+            return "closed"
+        return "half_open" if self.is_due(now) else "open"
+
+    def record(self, status: str, latency: float):
+        """
+        记录一次抓取结果并计算下一次轮询时间
+        
+        Args:
+            status: 抓取状态
+            latency: 请求耗时（秒）
+        """
+        now = datetime.now()
+        self.last_status = status
+        self.last_fetch_time = now
+        self.total_requests += 1
+        self.last_latency = latency
+        # 指数滑动平均
+        self.avg_latency = latency if self.total_requests == 1 else 0.8 * self.avg_latency + 0.2 * latency
+
+        if status == "error":
+            self.total_errors += 1
+            self.consecutive_failures += 1
+            if self.is_circuit_open():
+                # 熔断（或半开探测失败）：冷却期内不再请求
+                delay = self.CIRCUIT_COOLDOWN
+            else:
+                delay = min(self.MIN_POLL_INTERVAL * 2 ** (self.consecutive_failures - 1), self.MAX_BACKOFF)
+        else:
+            self.consecutive_failures = 0
+            if status == "fresh":
+                self.poll_interval = self._estimate_poll_interval()
+            else:
+                self.poll_interval = min(self.poll_interval * self.QUIET_BACKOFF_FACTOR, self.MAX_POLL_INTERVAL)
+            delay = self.poll_interval
+
+        self.next_poll_at = now + timedelta(seconds=delay)
+
+    def _estimate_poll_interval(self) -> float:
+        """
+        根据条目发布时间估算轮询间隔（平均发布间隔的一半）
+        
+        Returns:
+            轮询间隔（秒）
+        """
+        times = []
+        for item in self.items:
+            try:
+                times.append(datetime.strptime(item.publish_time, "%Y-%m-%d %H:%M:%S"))
+            except (TypeError, ValueError):
+                continue
+
+        if len(times) < 2:
+            return self.DEFAULT_POLL_INTERVAL
+
+        span = (max(times) - min(times)).total_seconds()
+        average_gap = span / (len(times) - 1)
+        return max(self.MIN_POLL_INTERVAL, min(average_gap / 2, self.MAX_POLL_INTERVAL))
+
+    def to_persisted(self) -> Dict:
+        """需要写入快照的校验器和调度状态（不含解析结果和统计）"""
+        return {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "content_hash": self.content_hash,
+            "last_status": self.last_status,
+            "last_fetch_time": self.last_fetch_time.isoformat() if self.last_fetch_time else None,
+            "poll_interval": self.poll_interval,
+            "next_poll_at": self.next_poll_at.isoformat() if self.next_poll_at else None,
+            "consecutive_failures": self.consecutive_failures
+        }
+
+    @classmethod
+    def from_persisted(cls, data: Dict) -> "FeedState":
+        """
+        从快照恢复抓取状态
+
+        Args:
+            data: to_persisted() 的结果
+
+        Returns:
+            FeedState: 抓取状态
+        """
+        last_fetch_time = data.get("last_fetch_time")
+        next_poll_at = data.get("next_poll_at")
+        return cls(
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            content_hash=data.get("content_hash"),
+            last_status=data.get("last_status"),
+            last_fetch_time=datetime.fromisoformat(last_fetch_time) if last_fetch_time else None,
+            poll_interval=data.get("poll_interval", cls.DEFAULT_POLL_INTERVAL),
+            next_poll_at=datetime.fromisoformat(next_poll_at) if next_poll_at else None,
+            consecutive_failures=data.get("consecutive_failures", 0)
+        )
+
+    def to_dict(self) -> Dict:
+        """转换为字典格式"""
+        return {
+            "status": self.last_status,
+            "last_fetch_time": self.last_fetch_time.isoformat() if self.last_fetch_time else None,
+            "item_count": len(self.items),
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "poll_interval_seconds": round(self.poll_interval),
+            "next_poll_at": self.next_poll_at.isoformat() if self.next_poll_at else None,
+            "consecutive_failures": self.consecutive_failures,
+            "circuit_open": self.is_circuit_open(),
+            "circuit_state": self.circuit_state(datetime.now()),
+            "total_requests": self.total_requests,
+            "total_errors": self.total_errors,
+            "last_latency_ms": round(self.last_latency * 1000),
+            "avg_latency_ms": round(self.avg_latency * 1000)
+        }
 
 
 class NewsCollectorService:
@@ -29,16 +204,102 @@ class NewsCollectorService:
     2. Mock 数据（降级方案）
     """
 
-    def __init__(self, use_real_data: bool = True):
+    # HTTP 客户端配置
+    HTTP_TIMEOUT_SECONDS = 10
+    CONNECTION_LIMIT = 50  # 连接池总连接数
+    CONNECTION_LIMIT_PER_HOST = 4  # 每个主机的连接数（arXiv 等多个源共用同一主机）
+    DNS_CACHE_TTL_SECONDS = 300
+    KEEPALIVE_TIMEOUT_SECONDS = 60
+    FEED_CHUNK_BYTES = 64 * 1024  # 流式读取 RSS 的块大小
+
+    def __init__(self, use_real_data: bool = True, snapshot_path: Optional[str] = None):
         """
         初始化新闻收集服务
         
         Args:
             use_real_data: 是否使用真实数据（False 则使用 mock 数据）
+            snapshot_path: 磁盘快照路径（默认使用 settings.NEWS_SNAPSHOT_FILE，None 表示不持久化）
         """
         self.use_real_data = use_real_data
+        
+        # 磁盘快照（重启后先用快照响应，再在后台刷新）
+        snapshot_path = snapshot_path or (settings.NEWS_SNAPSHOT_FILE if use_real_data else None)
+        self._snapshot_file = NewsSnapshotFile(snapshot_path) if snapshot_path else None
+        self._snapshot_loaded = False
+        
+        # 长期持有的 HTTP 会话（复用 keep-alive 连接、TLS 会话和 DNS 结果）
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # 后台刷新（refresh-ahead）和刷新锁
+        self._scheduler_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._refresh_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # RSS 解析池（feedparser 和文本清洗是 CPU 密集的同步操作）
+        self._parse_pool = FeedParsePool(
+            mode=settings.NEWS_PARSE_EXECUTOR,
+            max_workers=settings.NEWS_PARSE_MAX_WORKERS
+        )
+        
         self._init_rss_feeds()
         self._init_mock_data()
+    
+    async def start(self):
+        """打开 HTTP 会话并启动后台刷新（应用启动时调用）"""
+        await self._get_session()
+        logger.info("News collector HTTP session started")
+        
+        await self._load_snapshot()
+        
+        if self.use_real_data and settings.NEWS_BACKGROUND_REFRESH:
+            self.start_scheduler()
+    
+    async def close(self):
+        """停止后台刷新并关闭 HTTP 会话（应用关闭时调用）"""
+        for task in (self._scheduler_task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._scheduler_task = None
+        self._refresh_task = None
+        
+        session, self._session = self._session, None
+        self._session_loop = None
+        if session and not session.closed:
+            await session.close()
+            logger.info("News collector HTTP session closed")
+        
+        self._parse_pool.shutdown()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        获取共享的 HTTP 会话
+        
+        未调用 start() 时（如 Serverless 环境）按需创建；
+        会话绑定创建它的事件循环，循环变化时重新创建。
+        
+        Returns:
+            aiohttp.ClientSession: HTTP 会话
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.CONNECTION_LIMIT,
+                limit_per_host=self.CONNECTION_LIMIT_PER_HOST,
+                ttl_dns_cache=self.DNS_CACHE_TTL_SECONDS,
+                keepalive_timeout=self.KEEPALIVE_TIMEOUT_SECONDS
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.HTTP_TIMEOUT_SECONDS)
+            )
+            self._session_loop = loop
+        return self._session
 
     def _init_rss_feeds(self):
         """初始化 RSS 订阅源"""
@@ -61,10 +322,37 @@ class NewsCollectorService:
             "arXiv ML": "http://export.arxiv.org/rss/cs.LG",
         }
         
-        # 缓存
-        self._news_cache: List[NewsItem] = []
-        self._cache_time: Optional[datetime] = None
+        self._snapshot_version = 0  # 每次替换快照时递增
         self._cache_duration = timedelta(minutes=15)  # 缓存 15 分钟
+        self._init_store()
+    
+    def _init_store(self):
+        """初始化各源抓取状态、文章库、派生索引和新闻快照"""
+        # 每个源的抓取状态（条件请求校验器、内容哈希、上次解析结果）
+        self._feed_states: Dict[str, FeedState] = {
+            source: FeedState() for source in self.rss_feeds
+        }
+        
+        # 去重的滚动文章库（按规范化 URL/GUID 合并，保留窗口内的文章）
+        self._article_store = ArticleStore(
+            retention_hours=settings.NEWS_RETENTION_HOURS,
+            max_articles=settings.NEWS_STORE_MAX_ARTICLES
+        )
+        
+        # 由文章库增量维护的派生索引（只收录近似重复簇的代表文章）
+        self._dedup_index = NearDuplicateIndex(threshold=settings.NEWS_DEDUP_THRESHOLD)
+        self._indexed_keys: Set[str] = set()
+        self._search_index = SearchIndex()
+        self._similarity_index = SimilarityIndex()
+        self._trending_engine = TrendingEngine(
+            half_life_hours=settings.NEWS_TRENDING_HALF_LIFE_HOURS,
+            window_hours=settings.NEWS_TRENDING_WINDOW_HOURS
+        )
+        
+        # 当前新闻快照（文章库变化后整体替换）
+        self._news_cache: List[Article] = []
+        self._cache_time: Optional[datetime] = None
+        self._snapshot_index = SnapshotIndex([])  # 快照的来源/分类/时间索引
     
     def _init_mock_data(self):
         """初始化 Mock 数据（降级方案）"""
@@ -83,104 +371,351 @@ class NewsCollectorService:
         Returns:
             新闻列表
         """
+        state = self._feed_states.setdefault(source, FeedState())
+        start_time = time.monotonic()
+        
         try:
-            # 1. 使用 aiohttp发送 HTTP 请求获取 RSS XML
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status != 200:
-                        logger.warning(f"Failed to fetch {source}: HTTP {response.status}")
-                        return []
-                    
-                    content = await response.text()
+            # 1. 使用共享的 aiohttp 会话发送条件请求获取 RSS XML
+            headers = {}
+            if state.etag:
+                headers["If-None-Match"] = state.etag
+            if state.last_modified:
+                headers["If-Modified-Since"] = state.last_modified
             
-            # 2. 解析 RSS
-            feed = feedparser.parse(content)
-            
-            # 3. 遍历每条新闻
-            news_items = []
-            for entry in feed.entries[:20]:  # 每个源最多取 20 条
-                try:
-                    # 解析 RSS entry
-                    parsed = parse_rss_entry(entry)
-                    
-                    # 清理和截断摘要
-                    summary = clean_html(parsed['summary'])
-                    summary = truncate_text(summary, max_length=300)
-                    
-                    # 提取标签（如果没有则从文本中提取关键词）
-                    tags = parsed['tags']
-                    if not tags:
-                        tags = extract_ai_keywords(parsed['title'] + ' ' + summary)
-                    
-                    news_item = NewsItem(
-                        title=parsed['title'],
-                        summary=summary,
-                        url=parsed['url'],
-                        source=source,
-                        publish_time=parsed['publish_time'],
-                        category=parsed['category'],
-                        tags=tags
-                    )
-                    news_items.append(news_item)
+            session = await self._get_session()
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    self._mark_feed(state, "not_modified", start_time)
+                    logger.info(f"{source} not modified, reusing {len(state.items)} items")
+                    return state.items
                 
-                except Exception as e:
-                    logger.warning(f"Failed to parse entry from {source}: {e}")
-                    continue
+                if response.status != 200:
+                    logger.warning(f"Failed to fetch {source}: HTTP {response.status}")
+                    self._mark_feed(state, "error", start_time)
+                    return state.items
+                
+                # 流式读取：读够条目预算或达到字节上限即停止
+                content, truncated = await read_feed_body(
+                    response.content.iter_chunked(self.FEED_CHUNK_BYTES),
+                    max_entries=settings.NEWS_MAX_ENTRIES_PER_FEED,
+                    max_bytes=settings.NEWS_FEED_MAX_BYTES
+                )
+                if truncated:
+                    logger.debug(f"{source} read stopped early at {len(content)} bytes")
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                content_type = response.headers.get("Content-Type")
+            
+            # 内容未变化时跳过解析
+            content_hash = hashlib.sha256(content).hexdigest()
+            if content_hash == state.content_hash:
+                state.etag = etag
+                state.last_modified = last_modified
+                self._mark_feed(state, "hash_unchanged", start_time)
+                logger.info(f"{source} content unchanged, reusing {len(state.items)} items")
+                return state.items
+            
+            # 2. 在解析池中解析 RSS 并规范化（不阻塞事件循环）
+            news_items = await self._parse_pool.parse(
+                content, source, max_entries=settings.NEWS_MAX_ENTRIES_PER_FEED, content_type=content_type
+            )
+            
+            # 解析成功后才保存校验器，否则解析失败的内容会被后续的 304 掩盖
+            state.etag = etag
+            state.last_modified = last_modified
+            state.content_hash = content_hash
+            state.items = news_items
+            self._mark_feed(state, "fresh", start_time)
             
             logger.info(f"Fetched {len(news_items)} items from {source}")
             return news_items
         
         except asyncio.TimeoutError:
             logger.warning(f"Timeout fetching {source}")
-            return []
+            self._mark_feed(state, "error", start_time)
+            return state.items
         except Exception as e:
             logger.error(f"Error fetching {source}: {e}")
-            return []
+            self._mark_feed(state, "error", start_time)
+            return state.items
     
-
+    def _mark_feed(self, state: FeedState, status: str, start_time: float):
+        """记录源的抓取状态、耗时和下一次轮询时间"""
+        state.record(status, time.monotonic() - start_time)
+    
+    def get_feed_status(self) -> Dict[str, Dict]:
+        """
+        获取每个 RSS 源的抓取状态
+        
+        Returns:
+            {来源: 状态字典}
+        """
+        return {source: state.to_dict() for source, state in self._feed_states.items()}
     
-    async def _fetch_all_news(self) -> List[NewsItem]:
+    def get_store_stats(self) -> Dict:
         """
-        从所有 RSS 源获取新闻
+        获取文章库的统计信息
         
         Returns:
-            所有新闻列表
+            统计字典
         """
-        # 1. 检查缓存（15 分钟内有效）
-        if self._cache_time and datetime.now() - self._cache_time < self._cache_duration:
-            logger.info(f"Using cached news ({len(self._news_cache)} items)")
-            return self._news_cache
+        return {
+            **self._article_store.get_stats(),
+            "dedup": self._dedup_index.get_stats(),
+            "search_index": self._search_index.get_stats(),
+            "similarity_index": self._similarity_index.get_stats(),
+            "trending": self._trending_engine.get_stats(),
+            "snapshot_path": self._snapshot_file.path if self._snapshot_file else None
+        }
+    
+    def get_parse_stats(self) -> Dict:
+        """
+        获取 RSS 解析池的统计信息
         
-        # 2. 缓存过期，重新获取
-        logger.info("Fetching news from all RSS feeds...")
+        Returns:
+            统计字典
+        """
+        return self._parse_pool.get_stats()
+    
+
+    
+    async def _fetch_all_news(self) -> List[Article]:
+        """
+        获取当前新闻快照（stale-while-revalidate）
         
-        # 3. 并发获取所有 RSS feeds
-        tasks = [
-            self._fetch_rss_feed(source, url)
-            for source, url in self.rss_feeds.items()
-        ]
+        - 快照在有效期内：直接返回
+        - 快照已过期：立即返回旧快照，同时在后台刷新
+        - 还没有快照：先尝试加载磁盘快照，没有时等待首次刷新（并发请求共享同一次刷新）
         
-        # 4. 等待所有请求完成
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Returns:
+            所有文章记录（按发布时间倒序，对外返回前需转换为 NewsItem）
+        """
+        if self._cache_time is None:
+            await self._load_snapshot()
+        if self._cache_time is None:
+            return await self.refresh()
         
-        # 5. 合并所有新闻
-        all_news = []
-        for result in results:
-            if isinstance(result, list):
-                all_news.extend(result)
-            elif isinstance(result, Exception):
-                logger.error(f"Task failed: {result}")
+        if datetime.now() - self._cache_time >= self._cache_duration:
+            logger.info(f"News snapshot is stale, serving {len(self._news_cache)} cached items while refreshing")
+            self._schedule_refresh()
         
-        # 按时间排序
-        all_news.sort(key=lambda x: x.publish_time, reverse=True)
+        return self._news_cache
+    
+    async def refresh(self) -> List[Article]:
+        """
+        从到期的 RSS 源获取新闻，合并到文章库并在有变化时原子替换快照
         
-        # 6. 保存到缓存
-        self._news_cache = all_news
-        self._cache_time = datetime.now()
+        同一时间只有一次刷新；等待锁期间如果其他调用已完成刷新，直接返回新快照。
+        
+        Returns:
+            刷新后的文章记录列表
+        """
+        version = self._snapshot_version
+        
+        async with self._get_refresh_lock():
+            if self._snapshot_version != version and self._cache_time is not None:
+                return self._news_cache
+            
+            # 1. 并发获取到期的 RSS feeds（未到期、退避或熔断中的源复用上次结果）
+            now = datetime.now()
+            due_sources = [
+                source for source in self.rss_feeds
+                if self._feed_states.setdefault(source, FeedState()).is_due(now)
+            ]
+            
+            probes = [source for source in due_sources if self._feed_states[source].is_circuit_open()]
+            if probes:
+                logger.info(f"Probing RSS feeds with open circuits: {', '.join(probes)}")
+            
+            batch: List[NewsItem] = []
+            if due_sources:
+                logger.info(f"Fetching news from {len(due_sources)}/{len(self.rss_feeds)} RSS feeds...")
+                
+                tasks = [
+                    self._fetch_rss_feed(source, self.rss_feeds[source])
+                    for source in due_sources
+                ]
+                
+                # 2. 等待所有请求完成
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Task failed: {result}")
+                    else:
+                        batch.extend(result)
+            
+            # 3. 合并到文章库（只写入新增或变化的文章，同时淘汰超出保留窗口的文章）
+            changes = self._article_store.merge(batch, now=now)
+            self._apply_changes(changes)
+            
+            # 4. 有变化时替换快照（读者持有的旧列表不受影响）
+            if changes.changed or self._cache_time is None:
+                # 在线程中重建相似度矩阵，与快照同时生效（查询路径上不重建）
+                if not await self._publish_similarity_index():
+                    return self._news_cache
+                self._news_cache = [
+                    article for article in self._article_store.latest()
+                    if self._dedup_index.is_representative(article.key)
+                ]
+                self._snapshot_version += 1
+                self._snapshot_index = SnapshotIndex(self._news_cache, self._snapshot_version)
+            self._cache_time = datetime.now()
+            all_news = self._news_cache
+            
+            # 5. 增量写入磁盘快照（只写变化的文章和各源状态）
+            await self._save_snapshot(changes, now)
         
-        logger.info(f"Fetched total {len(all_news)} news items")
+        status_counts = Counter(state.last_status for state in self._feed_states.values())
+        logger.info(
+            f"News snapshot has {len(all_news)} items "
+            f"(+{changes.added} ~{changes.updated} -{changes.evicted}, feed status: {dict(status_counts)})"
+        )
         return all_news
     
+    async def _load_snapshot(self):
+        """
+        加载磁盘快照（每个实例只加载一次）
+        
+        文章写回文章库后重建派生索引；快照时间沿用上次刷新的时间，
+        过期时由 stale-while-revalidate 在后台刷新。
+        """
+        if self._snapshot_file is None or self._snapshot_loaded:
+            return
+        
+        async with self._get_refresh_lock():
+            if self._snapshot_loaded or self._cache_time is not None:
+                self._snapshot_loaded = True
+                return
+            self._snapshot_loaded = True
+            
+            start_time = time.monotonic()
+            data = await asyncio.to_thread(self._snapshot_file.load)
+            if data is None:
+                return
+            
+            changes = self._article_store.restore(data.articles)
+            self._apply_changes(changes)
+            for source, state in data.feed_states.items():
+                if source in self.rss_feeds:
+                    self._feed_states[source] = FeedState.from_persisted(state)
+            
+            if not await self._publish_similarity_index():
+                return
+            self._news_cache = [
+                article for article in self._article_store.latest()
+                if self._dedup_index.is_representative(article.key)
+            ]
+            self._snapshot_version += 1
+            self._snapshot_index = SnapshotIndex(self._news_cache, self._snapshot_version)
+            self._cache_time = data.cache_time or data.saved_at
+        
+        logger.info(
+            f"Loaded news snapshot with {len(self._news_cache)} items "
+            f"({changes.skipped} expired) in {time.monotonic() - start_time:.2f}s"
+        )
+    
+    async def _save_snapshot(self, changes: StoreChanges, now: datetime):
+        """增量保存磁盘快照（失败时只记录警告）"""
+        if self._snapshot_file is None:
+            return
+        
+        feed_states = {source: state.to_persisted() for source, state in self._feed_states.items()}
+        try:
+            await asyncio.to_thread(
+                self._snapshot_file.save,
+                list(changes.upserted.values()),
+                list(changes.removed),
+                feed_states,
+                self._cache_time,
+                int((now - self._article_store.retention).timestamp())
+            )
+        except Exception as e:
+            logger.warning(f"Failed to save news snapshot: {e}")
+    
+    async def _publish_similarity_index(self) -> bool:
+        """
+        在线程中重建并发布相似度矩阵
+        
+        Returns:
+            构建期间缓存没有被清除时返回 True（被清除时不应再替换快照）
+        """
+        version = self._snapshot_version
+        await self._similarity_index.publish()
+        if self._snapshot_version != version:
+            logger.info("News cache cleared while building similarity index, skipping snapshot swap")
+            return False
+        return True
+    
+    def _apply_changes(self, changes: StoreChanges):
+        """
+        把文章库的变更增量应用到派生索引
+        
+        先更新近似重复聚类，派生索引只收录每个簇的代表文章。
+        """
+        affected = set()
+        for key in changes.removed:
+            affected |= self._dedup_index.remove(key)
+        for key, article in changes.upserted.items():
+            affected |= self._dedup_index.add(key, article)
+        
+        for key in affected:
+            article = self._article_store.get(key)
+            if article is not None and self._dedup_index.is_representative(key):
+                article.sources = self._dedup_index.sources(key)
+                if key in changes.upserted or key not in self._indexed_keys:
+                    self._search_index.add(key, article)
+                    self._similarity_index.add(key, article)
+                    self._trending_engine.add(key, article)
+                    self._indexed_keys.add(key)
+            elif key in self._indexed_keys:
+                self._search_index.remove(key)
+                self._similarity_index.remove(key)
+                self._trending_engine.remove(key)
+                self._indexed_keys.discard(key)
+    
+    def start_scheduler(self, interval_seconds: Optional[float] = None):
+        """
+        启动后台刷新任务，在快照过期前定期刷新
+        
+        Args:
+            interval_seconds: 刷新间隔（默认使用 settings.NEWS_REFRESH_INTERVAL_SECONDS）
+        """
+        if self._scheduler_task and not self._scheduler_task.done():
+            return
+        
+        interval = interval_seconds or settings.NEWS_REFRESH_INTERVAL_SECONDS
+        self._scheduler_task = asyncio.create_task(self._refresh_loop(interval))
+        logger.info(f"News refresh scheduler started (interval: {interval}s)")
+    
+    async def _refresh_loop(self, interval: float):
+        """后台刷新循环"""
+        while True:
+            await self._refresh_safely()
+            await asyncio.sleep(interval)
+    
+    async def _refresh_safely(self):
+        """刷新快照，失败时保留旧快照"""
+        try:
+            await self.refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Background news refresh failed: {e}")
+    
+    def _schedule_refresh(self):
+        """在后台触发一次刷新（已有刷新进行中时不重复触发）"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_safely())
+    
+    def _get_refresh_lock(self) -> asyncio.Lock:
+        """获取当前事件循环的刷新锁"""
+        loop = asyncio.get_running_loop()
+        if self._refresh_lock is None or self._refresh_lock_loop is not loop:
+            self._refresh_lock = asyncio.Lock()
+            self._refresh_lock_loop = loop
+        return self._refresh_lock
+    
     async def get_latest_news(
         self, limit: int = 10, category: str = None
     ) -> List[NewsItem]:
@@ -207,54 +742,12 @@ class NewsCollectorService:
             return news[:limit]
         
         try:
-            # 获取真实数据
-            all_news = await self._fetch_all_news()
-            
-            # 分类过滤
-            if category:
-                all_news = filter_by_category(all_news, category)
-            
-            # 数据源均匀分布算法
-            # 1. 按来源分组
-            news_by_source = {}
-            for news in all_news:
-                source = news.source
-                if source not in news_by_source:
-                    news_by_source[source] = []
-                news_by_source[source].append(news)
-            
-            # 2. 轮询选择，确保数据源均匀分布
-            result = []
-            source_list = list(news_by_source.keys())
-            source_index = 0
-            
-            # 每个来源的当前索引
-            source_positions = {source: 0 for source in source_list}
-            
-            while len(result) < limit and source_list:
-                # 当前来源
-                current_source = source_list[source_index]
-                current_pos = source_positions[current_source]
-                
-                # 从当前来源获取一条新闻
-                if current_pos < len(news_by_source[current_source]):
-                    result.append(news_by_source[current_source][current_pos])
-                    source_positions[current_source] += 1
-                else:
-                    # 该来源已经用完，移除
-                    source_list.remove(current_source)
-                    if not source_list:
-                        break
-                    # 调整索引
-                    if source_index >= len(source_list):
-                        source_index = 0
-                    continue
-                
-                # 移动到下一个来源
-                source_index = (source_index + 1) % len(source_list)
+            # 获取真实数据（按来源轮询交错的排序随快照记忆化）
+            await self._fetch_all_news()
+            result = self._snapshot_index.interleaved(category)[:limit]
             
             logger.info(f"Returned {len(result)} news from {len(set(n.source for n in result))} sources")
-            return result
+            return to_news_items(result)
         
         except Exception as e:
             logger.error(f"Failed to fetch real news, falling back to mock data: {e}")
@@ -272,7 +765,7 @@ class NewsCollectorService:
         """
         获取热门话题
         
-        基于最近新闻中的关键词统计
+        基于文章库中标签的时间衰减计数，变化为当前窗口相对上一窗口的环比
         
         Args:
             limit: 返回数量
@@ -285,31 +778,17 @@ class NewsCollectorService:
             return self.mock_trending[:limit]
         
         try:
-            # 获取最近的新闻
-            recent_news = await self._fetch_all_news()
-            recent_news = recent_news[:100]  # 只分析最近 100 条
-            
-            # 统计关键词
-            keyword_counter = Counter()
-            for news in recent_news:
-                for tag in news.tags:
-                    if tag:  # 忽略空标签
-                        keyword_counter[tag] += 1
+            # 确保快照和统计已加载
+            await self._fetch_all_news()
             
-            # 生成热门话题
+            # 生成热门话题（排名随文章库增量维护，按衰减热度排序）
             trending = []
-            for keyword, count in keyword_counter.most_common(limit):
-                # 计算变化（简化版，实际需要历史数据对比）
-                change = f"↑ {min(count * 2, 30)}%"
-                
-                # 生成描述
-                description = self._generate_topic_description(keyword)
-                
+            for keyword, mentions, change in self._trending_engine.top(limit):
                 trending.append(TrendingTopic(
                     keyword=keyword,
-                    mentions=count,
+                    mentions=mentions,
                     change=change,
-                    description=description
+                    description=self._generate_topic_description(keyword)
                 ))
             
             return trending
@@ -369,28 +848,12 @@ class NewsCollectorService:
             return results[:limit]
         
         try:
-            # 获取所有新闻
-            all_news = await self._fetch_all_news()
-            
-            # 搜索匹配
-            results = []
-            query_lower = query.lower()
+            # 确保快照和索引已加载
+            await self._fetch_all_news()
             
-            for item in all_news:
-                score = calculate_relevance_score(
-                    query_lower,
-                    item.title,
-                    item.summary,
-                    item.tags,
-                    item.source
-                )
-                
-                if score > 0:
-                    results.append((score, item))
-            
-            # 按相关性排序并返回
-            sorted_results = sort_by_relevance(results)
-            return sorted_results[:limit]
+            # 倒排索引 + BM25 检索 top-k
+            results = self._search_index.search(query, limit)
+            return to_news_items(article for _, article in results)
         
         except Exception as e:
             logger.error(f"Failed to search news, falling back to mock data: {e}")
@@ -405,6 +868,45 @@ class NewsCollectorService:
                     results.append(item)
             return results[:limit]
 
+    async def find_related_news(self, topic: str, limit: int = 10) -> List[NewsItem]:
+        """
+        按 TF-IDF 余弦相似度查找与主题相关的新闻
+        
+        Args:
+            topic: 主题
+            limit: 返回数量
+        
+        Returns:
+            相关新闻列表（按相似度降序）
+        """
+        results = await self.find_related_news_batch([topic], limit=limit)
+        return results[0]
+    
+    async def find_related_news_batch(self, topics: List[str], limit: int = 10) -> List[List[NewsItem]]:
+        """
+        批量查找多个主题的相关新闻（一次矩阵乘法）
+        
+        Args:
+            topics: 主题列表
+            limit: 每个主题返回的数量
+        
+        Returns:
+            与 topics 对应的新闻列表
+        """
+        if not self.use_real_data:
+            return [await self.search_news(topic, limit) for topic in topics]
+        
+        try:
+            await self._fetch_all_news()
+            return [
+                to_news_items(article for _, article in hits)
+                for hits in self._similarity_index.query(topics, limit)
+            ]
+        
+        except Exception as e:
+            logger.error(f"Failed to find related news, falling back to search: {e}")
+            return [await self.search_news(topic, limit) for topic in topics]
+    
     async def get_news_by_source(self, source: str, limit: int = 10) -> List[NewsItem]:
         """
         按来源获取新闻
@@ -424,12 +926,10 @@ class NewsCollectorService:
             return news[:limit]
         
         try:
-            # 获取所有新闻
-            all_news = await self._fetch_all_news()
-            
-            # 按来源过滤
-            news = filter_by_source(all_news, source)
-            return news[:limit]
+            # 按来源索引查询
+            await self._fetch_all_news()
+            news = self._snapshot_index.by_source(source)
+            return to_news_items(news[:limit])
         
         except Exception as e:
             logger.error(f"Failed to get news by source, falling back to mock data: {e}")
@@ -438,8 +938,74 @@ class NewsCollectorService:
             ]
             return news[:limit]
     
+    async def get_news_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 10
+    ) -> List[NewsItem]:
+        """
+        获取指定发布时间范围内的新闻 [start, end)
+        
+        Args:
+            start: 开始时间（None 表示不限）
+            end: 结束时间（None 表示不限）
+            limit: 返回数量
+        
+        Returns:
+            新闻列表（按发布时间倒序）
+        """
+        if not self.use_real_data:
+            return self._mock_news_between(start, end)[:limit]
+        
+        try:
+            await self._fetch_all_news()
+            return to_news_items(self._snapshot_index.between(start, end)[:limit])
+        
+        except Exception as e:
+            logger.error(f"Failed to get news by time range, falling back to mock data: {e}")
+            return self._mock_news_between(start, end)[:limit]
+    
+    def _mock_news_between(self, start: Optional[datetime], end: Optional[datetime]) -> List[NewsItem]:
+        """按发布时间范围过滤 Mock 新闻"""
+        start_text = start.strftime("%Y-%m-%d %H:%M:%S") if start else ""
+        end_text = end.strftime("%Y-%m-%d %H:%M:%S") if end else None
+        return [
+            item for item in self.mock_news
+            if item.publish_time >= start_text and (end_text is None or item.publish_time < end_text)
+        ]
+    
+    async def get_categories(self) -> List[NewsCategory]:
+        """
+        获取新闻分类及文章数
+        
+        Returns:
+            NewsCategory 列表（按文章数降序）
+        """
+        if not self.use_real_data:
+            return self._mock_categories()
+        
+        try:
+            await self._fetch_all_news()
+            return self._snapshot_index.categories()
+        
+        except Exception as e:
+            logger.error(f"Failed to get categories, falling back to mock data: {e}")
+            return self._mock_categories()
+    
+    def _mock_categories(self) -> List[NewsCategory]:
+        """Mock 新闻的分类及文章数"""
+        counts = Counter(item.category for item in self.mock_news if item.category)
+        return [NewsCategory(name=name, count=count) for name, count in counts.most_common()]
+    
     def clear_cache(self):
-        """清除缓存"""
-        self._news_cache = []
-        self._cache_time = None
+        """
+        清除缓存：清空文章库、派生索引、各源抓取状态和磁盘快照
+        
+        下一次读取会重新抓取所有源（不发送条件请求）。
+        """
+        self._init_store()
+        self._snapshot_version += 1  # 清除前开始的刷新不会把旧快照当作新结果
+        if self._snapshot_file is not None:
+            self._snapshot_file.clear()
         logger.info("News cache cleared")
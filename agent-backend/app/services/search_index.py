@@ -0,0 +1,167 @@
+"""
+Search Index - 新闻倒排索引
+
+实现了：
+- 按字段（标题/摘要/标签/来源）分词的倒排索引，中文使用 bigram
+- BM25F 排序，字段权重沿用原有的相关性权重（10/5/3/2）
+- 增量添加/删除文章
+- 只遍历查询词的倒排表，并用堆选出 top-k
+"""
+
+import heapq
+import math
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from .article_store import Article
+from ..utils import tokenize
+
+
+# 字段权重（与 calculate_relevance_score 一致）
+FIELD_BOOSTS = {
+    "title": 10.0,
+    "summary": 5.0,
+    "tags": 3.0,
+    "source": 2.0,
+}
+FIELDS = tuple(FIELD_BOOSTS)
+
+
+class SearchIndex:
+    """
+    BM25F 倒排索引
+
+    所有操作都在事件循环中同步执行，不需要加锁。
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        初始化索引
+
+        Args:
+            k1: 词频饱和参数
+            b: 文档长度归一化参数
+        """
+        self.k1 = k1
+        self.b = b
+
+        # 词项 -> {文章主键: 各字段词频}
+        self._postings: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+        self._docs: Dict[str, Article] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._doc_lengths: Dict[str, Tuple[int, ...]] = {}
+        self._total_lengths = [0] * len(FIELDS)
+
+    @staticmethod
+    def _field_tokens(item: Article) -> Tuple[List[str], ...]:
+        """按字段分词"""
+        return (
+            tokenize(item.title),
+            tokenize(item.summary),
+            tokenize(" ".join(item.tags)),
+            tokenize(item.source),
+        )
+
+    def add(self, key: str, item: Article):
+        """
+        添加或替换文章
+
+        Args:
+            key: 文章主键
+            item: 文章记录
+        """
+        if key in self._docs:
+            self.remove(key)
+
+        field_tokens = self._field_tokens(item)
+        counters = [Counter(tokens) for tokens in field_tokens]
+        terms = set().union(*counters)
+
+        for term in terms:
+            self._postings.setdefault(term, {})[key] = tuple(counter[term] for counter in counters)
+
+        lengths = tuple(len(tokens) for tokens in field_tokens)
+        for i, length in enumerate(lengths):
+            self._total_lengths[i] += length
+
+        self._docs[key] = item
+        self._doc_terms[key] = tuple(terms)
+        self._doc_lengths[key] = lengths
+
+    def remove(self, key: str):
+        """
+        删除文章（不存在时忽略）
+
+        Args:
+            key: 文章主键
+        """
+        if key not in self._docs:
+            return
+
+        for term in self._doc_terms.pop(key):
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+
+        for i, length in enumerate(self._doc_lengths.pop(key)):
+            self._total_lengths[i] -= length
+        del self._docs[key]
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[float, Article]]:
+        """
+        BM25F 检索
+
+        Args:
+            query: 查询文本
+            limit: 返回数量
+
+        Returns:
+            [(分数, 文章记录)]，按分数降序（同分时较新的优先）
+        """
+        terms = set(tokenize(query))
+        if not terms or not self._docs or limit <= 0:
+            return []
+
+        doc_count = len(self._docs)
+        avg_lengths = [total / doc_count for total in self._total_lengths]
+        boosts = [FIELD_BOOSTS[name] for name in FIELDS]
+        scores: Dict[str, float] = {}
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+
+            df = len(postings)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+            for key, frequencies in postings.items():
+                lengths = self._doc_lengths[key]
+                weighted_tf = 0.0
+                for i, tf in enumerate(frequencies):
+                    if tf:
+                        norm = 1 - self.b + self.b * lengths[i] / avg_lengths[i] if avg_lengths[i] else 1.0
+                        weighted_tf += boosts[i] * tf / norm
+                scores[key] = scores.get(key, 0.0) + idf * weighted_tf / (self.k1 + weighted_tf)
+
+        top = heapq.nlargest(
+            limit, scores.items(),
+            key=lambda entry: (entry[1], self._docs[entry[0]].published)
+        )
+        return [(score, self._docs[key]) for key, score in top]
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def get_stats(self) -> Dict:
+        """
+        获取索引统计信息
+
+        Returns:
+            Dict: 文章数和词项数
+        """
+        return {
+            "documents": len(self._docs),
+            "terms": len(self._postings)
+        }
@@ -0,0 +1,240 @@
+"""
+Similarity Index - 基于 TF-IDF 的相关文章检索
+
+实现了：
+- 每篇文章的词频增量维护（只对新增/变化的文章分词）
+- 快照替换时在线程中用 NumPy 向量化重建 TF-IDF 矩阵（按列压缩存储，L2 归一化），
+  查询始终使用最近一次发布的只读矩阵，请求路径上不重建
+- 多个主题一次矩阵乘法算出余弦相似度，argpartition 选出 top-k
+
+不需要调用外部 embedding 服务，单次查询耗时在毫秒级。
+"""
+
+import asyncio
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .article_store import Article
+from ..utils import tokenize
+
+
+class TfidfMatrix:
+    """
+    某一时刻文章集合的 TF-IDF 矩阵（构建后只读）
+
+    构建只读取传入的词频和文章，不访问索引本身，可以在线程中执行。
+    """
+
+    __slots__ = ("articles", "vocabulary", "idf", "indptr", "indices", "data")
+
+    def __init__(self, doc_counts: Dict[str, Counter], docs: Dict[str, Article]):
+        """
+        构建矩阵
+
+        Args:
+            doc_counts: 文章主键 -> 词频
+            docs: 文章主键 -> 文章记录
+        """
+        keys = list(docs)
+        self.articles: List[Article] = [docs[key] for key in keys]
+        self.vocabulary: Dict[str, int] = {}
+
+        rows: List[int] = []
+        cols: List[int] = []
+        counts: List[int] = []
+        for row, key in enumerate(keys):
+            for term, count in doc_counts[key].items():
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                counts.append(count)
+
+        doc_count = len(keys)
+        rows_arr = np.asarray(rows, dtype=np.int32)
+        cols_arr = np.asarray(cols, dtype=np.int32)
+
+        # 平滑 idf，次线性 tf
+        df = np.bincount(cols_arr, minlength=len(self.vocabulary))
+        self.idf = np.log((1 + doc_count) / (1 + df)) + 1.0
+        data = (1.0 + np.log(np.asarray(counts, dtype=np.float32))) * self.idf[cols_arr]
+
+        # 按行 L2 归一化
+        norms = np.sqrt(np.bincount(rows_arr, weights=data * data, minlength=doc_count))
+        data = data / np.where(norms[rows_arr] > 0, norms[rows_arr], 1.0)
+
+        # 按列排序得到 CSC
+        order = np.argsort(cols_arr, kind="stable")
+        self.indices = rows_arr[order]
+        self.data = data[order].astype(np.float32)
+        self.indptr = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+
+
+class SimilarityIndex:
+    """
+    TF-IDF 余弦相似度索引
+
+    矩阵以 CSC 形式保存（indptr/indices/data），查询时只取出查询词对应的列，
+    拼成稠密的 [文章数 x 查询词数] 子矩阵后与查询矩阵相乘。
+    add/remove 只更新词频；矩阵由 publish() 在快照替换时重建，两次发布之间的查询
+    使用与当前快照一致的上一个矩阵。
+    """
+
+    TITLE_WEIGHT = 2  # 标题词频加倍
+
+    def __init__(self, min_score: float = 0.05):
+        """
+        初始化索引
+
+        Args:
+            min_score: 最低余弦相似度（低于该值的文章不返回）
+        """
+        self.min_score = min_score
+
+        self._doc_counts: Dict[str, Counter] = {}
+        self._docs: Dict[str, Article] = {}
+        # 词频每次变化递增；与已发布矩阵的代数不同时说明有未发布的变化
+        self._generation = 0
+        self._published_generation = -1
+
+        self._matrix: Optional[TfidfMatrix] = None
+        self.rebuilds = 0
+
+    def _term_counts(self, item: Article) -> Counter:
+        """文章的词频（标题加权）"""
+        counts = Counter(tokenize(" ".join([item.summary, " ".join(item.tags)])))
+        for term in tokenize(item.title):
+            counts[term] += self.TITLE_WEIGHT
+        return counts
+
+    def add(self, key: str, item: Article):
+        """
+        添加或替换文章（下一次 publish() 后对查询可见）
+
+        Args:
+            key: 文章主键
+            item: 文章记录
+        """
+        self._doc_counts[key] = self._term_counts(item)
+        self._docs[key] = item
+        self._generation += 1
+
+    def remove(self, key: str):
+        """
+        删除文章（不存在时忽略；下一次 publish() 后对查询可见）
+
+        Args:
+            key: 文章主键
+        """
+        if self._docs.pop(key, None) is not None:
+            del self._doc_counts[key]
+            self._generation += 1
+
+    @property
+    def dirty(self) -> bool:
+        """是否有尚未发布到矩阵的变化"""
+        return self._generation != self._published_generation
+
+    def rebuild(self):
+        """在当前线程中根据当前文章重建并发布 TF-IDF 矩阵"""
+        self._install(TfidfMatrix(self._doc_counts, self._docs), self._generation)
+
+    async def publish(self):
+        """
+        在线程中根据当前文章重建 TF-IDF 矩阵并发布（没有变化时跳过）
+
+        词频字典先在事件循环中复制一份，构建期间的 add/remove 不影响本次构建，
+        会留到下一次发布。
+        """
+        if not self.dirty:
+            return
+        generation = self._generation
+        matrix = await asyncio.to_thread(TfidfMatrix, dict(self._doc_counts), dict(self._docs))
+        self._install(matrix, generation)
+
+    def _install(self, matrix: TfidfMatrix, generation: int):
+        """替换查询使用的矩阵"""
+        self._matrix = matrix
+        self._published_generation = generation
+        self.rebuilds += 1
+
+    def query(self, topics: Sequence[str], limit: int = 10) -> List[List[Tuple[float, Article]]]:
+        """
+        批量检索每个主题最相关的文章（使用最近一次发布的矩阵）
+
+        Args:
+            topics: 主题列表
+            limit: 每个主题返回的数量
+
+        Returns:
+            与 topics 对应的 [(相似度, 文章记录)] 列表，按相似度降序
+        """
+        if self._matrix is None:
+            # 从未发布过（直接使用索引而没有经过快照替换）时同步构建一次
+            self.rebuild()
+        matrix = self._matrix
+
+        results: List[List[Tuple[float, Article]]] = [[] for _ in topics]
+        if not matrix.articles or limit <= 0:
+            return results
+
+        # 1. 构建查询矩阵（只包含索引中出现过的词）
+        columns: Dict[int, int] = {}
+        query_weights: List[Dict[int, float]] = []
+        for topic in topics:
+            weights: Dict[int, float] = {}
+            for term, count in Counter(tokenize(topic)).items():
+                column = matrix.vocabulary.get(term)
+                if column is not None:
+                    index = columns.setdefault(column, len(columns))
+                    weights[index] = (1.0 + math.log(count)) * float(matrix.idf[column])
+            query_weights.append(weights)
+
+        if not columns:
+            return results
+
+        queries = np.zeros((len(topics), len(columns)), dtype=np.float32)
+        for i, weights in enumerate(query_weights):
+            for index, weight in weights.items():
+                queries[i, index] = weight
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries /= np.where(norms > 0, norms, 1.0)
+
+        # 2. 取出查询词对应的文章列，一次矩阵乘法得到所有主题的相似度
+        documents = np.zeros((len(matrix.articles), len(columns)), dtype=np.float32)
+        for column, index in columns.items():
+            start, end = matrix.indptr[column], matrix.indptr[column + 1]
+            documents[matrix.indices[start:end], index] = matrix.data[start:end]
+        scores = documents @ queries.T  # [文章数, 主题数]
+
+        # 3. 每个主题选 top-k
+        k = min(limit, len(matrix.articles))
+        for i in range(len(topics)):
+            column_scores = scores[:, i]
+            top = np.argpartition(-column_scores, k - 1)[:k]
+            top = top[np.argsort(-column_scores[top], kind="stable")]
+            results[i] = [
+                (float(column_scores[row]), matrix.articles[row])
+                for row in top
+                if column_scores[row] >= self.min_score
+            ]
+        return results
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def get_stats(self) -> Dict:
+        """
+        获取索引统计信息
+
+        Returns:
+            Dict: 文章数、已发布矩阵的词表大小和非零元素数、重建次数
+        """
+        return {
+            "documents": len(self._docs),
+            "vocabulary": len(self._matrix.vocabulary) if self._matrix is not None else 0,
+            "nonzeros": int(self._matrix.data.size) if self._matrix is not None else 0,
+            "rebuilds": self.rebuilds,
+            "dirty": self.dirty
+        }
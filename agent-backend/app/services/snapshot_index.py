@@ -0,0 +1,173 @@
+"""
+Snapshot Index - 快照的二级索引
+
+每次替换新闻快照时构建一次，快照不可变，索引也不需要更新：
+- 来源 → 文章列表（按发布时间倒序）
+- 分类 → 文章列表及计数（生成 NewsCategory）
+- 按发布时间升序的时间数组，bisect 做时间范围查询
+- 按来源轮询交错的"最新"排序，按分类过滤条件记忆化
+"""
+
+import heapq
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from ..models.news import NewsCategory
+from .article_store import Article
+
+T = TypeVar("T")
+
+
+class SnapshotIndex:
+    """
+    单个快照版本的只读索引
+
+    所有查询在事件循环中同步执行，记忆化结果随快照一起丢弃。
+    过滤条件来自请求参数，每类记忆化结果只保留最近使用的 MEMO_SIZE 个。
+    """
+
+    MEMO_SIZE = 64
+
+    def __init__(self, articles: List[Article], version: int = 0):
+        """
+        构建索引
+
+        Args:
+            articles: 快照中的文章（按发布时间倒序）
+            version: 快照版本
+        """
+        self.version = version
+        self._articles = articles
+
+        self._by_source: Dict[str, List[Article]] = {}
+        self._by_category: Dict[str, List[Article]] = {}
+        self._category_names: Dict[str, str] = {}
+        for article in articles:
+            self._by_source.setdefault(article.source_lower, []).append(article)
+            if article.category:
+                self._by_category.setdefault(article.category_lower, []).append(article)
+                self._category_names.setdefault(article.category_lower, article.category)
+
+        # 按发布时间升序，用于 bisect
+        self._ascending = articles[::-1]
+        self._times = [article.published for article in self._ascending]
+
+        self._interleaved: "OrderedDict[Optional[str], List[Article]]" = OrderedDict()
+        self._source_matches: "OrderedDict[str, List[Article]]" = OrderedDict()
+        self._category_matches: "OrderedDict[str, List[Article]]" = OrderedDict()
+
+    def by_category(self, category: str) -> List[Article]:
+        """
+        按分类过滤（分类名包含 category，不区分大小写）
+
+        Args:
+            category: 分类名称
+
+        Returns:
+            文章列表（按发布时间倒序）
+        """
+        category_lower = category.lower()
+        return self._memoize(
+            self._category_matches, category_lower,
+            lambda: self._match(self._by_category, category_lower)
+        )
+
+    def by_source(self, source: str) -> List[Article]:
+        """
+        按来源过滤（来源名包含 source，不区分大小写）
+
+        Args:
+            source: 来源名称
+
+        Returns:
+            文章列表（按发布时间倒序）
+        """
+        source_lower = source.lower()
+        return self._memoize(
+            self._source_matches, source_lower,
+            lambda: self._match(self._by_source, source_lower)
+        )
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Article]:
+        """
+        时间范围查询 [start, end)
+
+        Args:
+            start: 开始时间（None 表示不限）
+            end: 结束时间（None 表示不限）
+
+        Returns:
+            文章列表（按发布时间倒序）
+        """
+        low = bisect_left(self._times, int(start.timestamp())) if start else 0
+        high = bisect_left(self._times, int(end.timestamp())) if end else len(self._times)
+        return self._ascending[low:high][::-1]
+
+    def interleaved(self, category: Optional[str] = None) -> List[Article]:
+        """
+        按来源轮询交错的最新文章（保证多个数据源均匀分布）
+
+        每个来源依次取一条，来源顺序按其最新文章的时间排列；结果按分类条件记忆化。
+
+        Args:
+            category: 分类过滤（可选）
+
+        Returns:
+            交错排序后的文章列表
+        """
+        key = category.lower() if category else None
+        return self._memoize(self._interleaved, key, lambda: self._interleave(key))
+
+    def _interleave(self, category: Optional[str]) -> List[Article]:
+        """每个来源依次取一条"""
+        articles = self.by_category(category) if category else self._articles
+
+        groups: Dict[str, List[Article]] = {}
+        for article in articles:
+            groups.setdefault(article.source, []).append(article)
+
+        result = []
+        depth = 0
+        remaining = list(groups.values())
+        while remaining:
+            result.extend(group[depth] for group in remaining)
+            depth += 1
+            remaining = [group for group in remaining if len(group) > depth]
+        return result
+
+    def categories(self) -> List[NewsCategory]:
+        """
+        分类及文章数
+
+        Returns:
+            NewsCategory 列表（按文章数降序）
+        """
+        return sorted(
+            (
+                NewsCategory(name=self._category_names[key], count=len(articles))
+                for key, articles in self._by_category.items()
+            ),
+            key=lambda category: (-category.count, category.name)
+        )
+
+    def _memoize(self, cache: "OrderedDict", key, compute: Callable[[], T]) -> T:
+        """LRU 记忆化（超过 MEMO_SIZE 时丢弃最久未使用的结果）"""
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        value = compute()
+        cache[key] = value
+        if len(cache) > self.MEMO_SIZE:
+            cache.popitem(last=False)
+        return value
+
+    @staticmethod
+    def _match(facet: Dict[str, List[Article]], value: str) -> List[Article]:
+        """合并所有名称包含 value 的分面（保持时间倒序）"""
+        lists = [articles for key, articles in facet.items() if value in key]
+        if len(lists) == 1:
+            return lists[0]
+        return list(heapq.merge(*lists, key=lambda article: -article.published))
@@ -0,0 +1,194 @@
+"""
+Snapshot Store - 文章库的磁盘快照
+
+把文章库和各 RSS 源的抓取状态保存到本地 SQLite 文件，进程重启（包括 Serverless 冷启动）
+后直接加载，先用旧数据响应，再在后台刷新。派生索引（搜索、相似度、热门、去重）在加载时
+由文章重新构建，不单独持久化。
+
+写入是增量的：每次刷新只写入新增/变化的文章并删除被淘汰的文章。
+SQLite 调用是同步的，由调用方放到线程中执行。
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from loguru import logger
+
+from .article_store import Article
+
+SCHEMA_VERSION = "1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    category TEXT,
+    tags TEXT NOT NULL,
+    published INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published);
+CREATE TABLE IF NOT EXISTS feeds (
+    source TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class SnapshotData:
+    """从磁盘加载的快照"""
+    articles: List[Article] = field(default_factory=list)
+    feed_states: Dict[str, Dict] = field(default_factory=dict)
+    cache_time: Optional[datetime] = None  # 快照最后一次刷新的时间（用于判断新鲜度）
+    saved_at: Optional[datetime] = None
+
+
+class NewsSnapshotFile:
+    """
+    SQLite 快照文件
+
+    每次操作打开独立连接，可以安全地在线程池中调用。
+    """
+
+    def __init__(self, path: str):
+        """
+        初始化快照文件
+
+        Args:
+            path: SQLite 文件路径（目录不存在时自动创建）
+        """
+        self.path = path
+
+    def load(self) -> Optional[SnapshotData]:
+        """
+        加载快照
+
+        Returns:
+            Optional[SnapshotData]: 快照数据，文件不存在、版本不匹配或损坏时返回 None
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with self._connect() as connection:
+                meta = dict(connection.execute("SELECT key, value FROM meta"))
+                if meta.get("schema_version") != SCHEMA_VERSION:
+                    logger.warning(f"Ignoring news snapshot with schema {meta.get('schema_version')}")
+                    return None
+
+                articles = [
+                    Article(
+                        key=key, title=title, summary=summary, url=url, source=source,
+                        published=published, category=category, tags=tuple(json.loads(tags)),
+                        fingerprint=fingerprint
+                    )
+                    for key, title, summary, url, source, category, tags, published, fingerprint
+                    in connection.execute(
+                        "SELECT key, title, summary, url, source, category, tags, published, fingerprint "
+                        "FROM articles ORDER BY published"
+                    )
+                ]
+                feed_states = {
+                    source: json.loads(state)
+                    for source, state in connection.execute("SELECT source, state FROM feeds")
+                }
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Failed to load news snapshot from {self.path}: {e}")
+            return None
+
+        return SnapshotData(
+            articles=articles,
+            feed_states=feed_states,
+            cache_time=self._parse_time(meta.get("cache_time")),
+            saved_at=self._parse_time(meta.get("saved_at"))
+        )
+
+    def save(
+        self,
+        upserted: Iterable[Article],
+        removed: Iterable[str],
+        feed_states: Dict[str, Dict],
+        cache_time: Optional[datetime],
+        cutoff: Optional[int] = None
+    ):
+        """
+        增量保存快照
+
+        Args:
+            upserted: 新增或变化的文章
+            removed: 被移除的文章主键
+            feed_states: {来源: 抓取状态}
+            cache_time: 快照最后一次刷新的时间
+            cutoff: 保留窗口起点（epoch 秒），更早的文章一并删除
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.executemany("DELETE FROM articles WHERE key = ?", ((key,) for key in removed))
+            if cutoff is not None:
+                connection.execute("DELETE FROM articles WHERE published < ?", (cutoff,))
+            connection.executemany(
+                "INSERT OR REPLACE INTO articles "
+                "(key, title, summary, url, source, category, tags, published, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        article.key, article.title, article.summary, article.url, article.source,
+                        article.category, json.dumps(list(article.tags), ensure_ascii=False),
+                        article.published, article.fingerprint
+                    )
+                    for article in upserted
+                )
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO feeds (source, state) VALUES (?, ?)",
+                ((source, json.dumps(state)) for source, state in feed_states.items())
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("schema_version", SCHEMA_VERSION),
+                    ("cache_time", cache_time.isoformat() if cache_time else ""),
+                    ("saved_at", datetime.now().isoformat())
+                ]
+            )
+
+    def clear(self):
+        """删除快照文件（不存在时忽略）"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove news snapshot {self.path}: {e}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开连接并确保表结构存在（正常结束时提交事务，最后关闭连接）"""
+        connection = sqlite3.connect(self.path, timeout=5)
+        try:
+            connection.executescript(_SCHEMA)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _parse_time(value: Optional[str]) -> Optional[datetime]:
+        """解析 ISO 时间"""
+        return datetime.fromisoformat(value) if value else None
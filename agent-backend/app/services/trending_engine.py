@@ -0,0 +1,149 @@
+"""
+Trending Engine - 热门话题统计
+
+实现了：
+- 按发布时间分桶（每小时）的标签计数，随文章库增量更新
+- 指数衰减的热度分数（半衰期可配置）
+- 当前窗口与上一窗口的真实变化百分比
+- 排名按（数据版本, 当前小时）缓存，top-k 查询只是切片
+"""
+
+import math
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .article_store import Article
+
+BUCKET_SECONDS = 3600
+
+
+class TrendingEngine:
+    """
+    时间衰减的热门标签统计
+
+    所有操作都在事件循环中同步执行，不需要加锁。
+    """
+
+    def __init__(self, half_life_hours: float = 24, window_hours: int = 24):
+        """
+        初始化热门话题统计
+
+        Args:
+            half_life_hours: 热度半衰期（小时）
+            window_hours: 变化百分比的比较窗口（小时）
+        """
+        self.decay = math.log(2) / half_life_hours  # 每小时的衰减系数
+        self.window_hours = window_hours
+
+        # 标签 -> {小时桶: 计数}
+        self._tag_buckets: Dict[str, Counter] = {}
+        # 文章主键 -> (小时桶, 标签)
+        self._doc_tags: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+
+        self._version = 0
+        self._ranking: List[Tuple[str, int, str]] = []
+        self._ranking_key: Optional[Tuple[int, int]] = None
+
+    def add(self, key: str, item: Article):
+        """
+        统计文章的标签（已存在时先移除旧版本）
+
+        Args:
+            key: 文章主键
+            item: 文章记录
+        """
+        if key in self._doc_tags:
+            self.remove(key)
+
+        bucket = item.published // BUCKET_SECONDS
+        tags = tuple(dict.fromkeys(tag for tag in item.tags if tag))  # 去重并忽略空标签
+        for tag in tags:
+            self._tag_buckets.setdefault(tag, Counter())[bucket] += 1
+
+        self._doc_tags[key] = (bucket, tags)
+        self._version += 1
+
+    def remove(self, key: str):
+        """
+        移除文章的标签计数（不存在时忽略）
+
+        Args:
+            key: 文章主键
+        """
+        entry = self._doc_tags.pop(key, None)
+        if entry is None:
+            return
+
+        bucket, tags = entry
+        for tag in tags:
+            buckets = self._tag_buckets[tag]
+            buckets[bucket] -= 1
+            if buckets[bucket] <= 0:
+                del buckets[bucket]
+            if not buckets:
+                del self._tag_buckets[tag]
+        self._version += 1
+
+    def top(self, limit: int = 10, now: Optional[datetime] = None) -> List[Tuple[str, int, str]]:
+        """
+        获取热门标签
+
+        Args:
+            limit: 返回数量
+            now: 当前时间（默认 datetime.now()）
+
+        Returns:
+            [(标签, 提及次数, 变化)]，按衰减热度降序，变化形如 "↑ 23%"
+        """
+        current = int((now or datetime.now()).timestamp() // BUCKET_SECONDS)
+        if self._ranking_key != (self._version, current):
+            self._ranking = self._rank(current)
+            self._ranking_key = (self._version, current)
+        return self._ranking[:limit]
+
+    def _rank(self, current: int) -> List[Tuple[str, int, str]]:
+        """按衰减热度对所有标签排序"""
+        window_start = current - self.window_hours + 1
+        previous_start = window_start - self.window_hours
+
+        scored = []
+        for tag, buckets in self._tag_buckets.items():
+            score = 0.0
+            mentions = recent = previous = 0
+            for bucket, count in buckets.items():
+                age = max(0, current - bucket)
+                score += count * math.exp(-self.decay * age)
+                mentions += count
+                if bucket >= window_start:
+                    recent += count
+                elif bucket >= previous_start:
+                    previous += count
+            scored.append((score, mentions, tag, self._format_change(recent, previous)))
+
+        scored.sort(key=lambda entry: (-entry[0], -entry[1], entry[2]))
+        return [(tag, mentions, change) for _, mentions, tag, change in scored]
+
+    @staticmethod
+    def _format_change(recent: int, previous: int) -> str:
+        """窗口环比变化"""
+        if previous == 0:
+            return "NEW" if recent else "→ 0%"
+        percent = round((recent - previous) / previous * 100)
+        if percent > 0:
+            return f"↑ {percent}%"
+        if percent < 0:
+            return f"↓ {-percent}%"
+        return "→ 0%"
+
+    def get_stats(self) -> Dict:
+        """
+        获取统计信息
+
+        Returns:
+            Dict: 文章数和标签数
+        """
+        return {
+            "documents": len(self._doc_tags),
+            "tags": len(self._tag_buckets)
+        }
@@ -4,15 +4,19 @@ from .text_utils import (
     truncate_text,
     extract_keywords,
     extract_ai_keywords,
+    extract_ai_keywords_batch,
+    KeywordMatcher,
     AI_KEYWORDS
 )
 from .rss_utils import (
     parse_publish_time,
     extract_category,
     extract_tags,
-    parse_rss_entry
+    parse_rss_entry,
+    canonicalize_url
 )
 from .search_utils import (
+    tokenize,
     calculate_relevance_score,
     sort_by_relevance,
     filter_by_category,
@@ -25,13 +29,17 @@ __all__ = [
     "truncate_text",
     "extract_keywords",
     "extract_ai_keywords",
+    "extract_ai_keywords_batch",
+    "KeywordMatcher",
     "AI_KEYWORDS",
     # rss_utils
     "parse_publish_time",
     "extract_category",
     "extract_tags",
     "parse_rss_entry",
+    "canonicalize_url",
     # search_utils
+    "tokenize",
     "calculate_relevance_score",
     "sort_by_relevance",
     "filter_by_category",
@@ -1,9 +1,14 @@
 """RSS 处理工具函数"""
 from datetime import datetime
 from typing import Optional, Dict, Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import feedparser
 
 
+# 规范化 URL 时去掉的追踪参数
+TRACKING_PARAMS = {"ref", "ref_src", "source", "fbclid", "gclid", "mc_cid", "mc_eid"}
+
+
 def parse_publish_time(entry: Any) -> str:
     """
     解析 RSS entry 的发布时间
@@ -67,8 +72,42 @@ def parse_rss_entry(entry: Any) -> Dict[str, Any]:
     return {
         'title': entry.get('title', 'No title'),
         'summary': entry.get('summary', entry.get('description', '')),
-        'url': entry.get('link', ''),
+        'url': entry.get('link') or entry.get('id', ''),  # 没有链接时使用 GUID
         'publish_time': parse_publish_time(entry),
         'category': extract_category(entry),
         'tags': extract_tags(entry)
     }
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    规范化文章 URL（用于去重）
+
+    - scheme 和域名小写，去掉默认端口和 www. 前缀
+    - 去掉 fragment、utm_* 等追踪参数，其余参数排序
+    - 去掉路径末尾的 /
+
+    Args:
+        url: 原始 URL 或 GUID
+
+    Returns:
+        规范化后的 URL（非 http(s) 的 GUID 原样返回）
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return url
+
+    host = parts.netloc.lower()
+    if host.endswith(":80") or host.endswith(":443"):
+        host = host.rsplit(":", 1)[0]
+    if host.startswith("www."):
+        host = host[4:]
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))
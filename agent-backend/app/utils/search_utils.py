@@ -1,7 +1,35 @@
 """搜索和排序工具函数"""
+import re
 from typing import List, Tuple, Any
 
 
+# 英文/数字单词，或连续的中日韩汉字
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    分词（用于倒排索引）
+
+    英文按单词切分并小写；中文没有空格分隔，按相邻两字切成 bigram
+    （单个汉字保留为单字词），无需额外的分词词典。
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        词项列表（保留重复，用于统计词频）
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group()
+        if token.isascii() or len(token) == 1:
+            tokens.append(token)
+        else:
+            tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return tokens
+
+
 def calculate_relevance_score(
     query: str,
     title: str,
@@ -59,6 +87,14 @@ def sort_by_relevance(items: List[Tuple[int, Any]]) -> List[Any]:
     return [item for _, item in items]
 
 
+def _lowered(item: Any, field: str) -> str:
+    """获取字段的小写值（文章记录上有预先计算的 <field>_lower 时直接使用）"""
+    value = getattr(item, f"{field}_lower", None)
+    if value is None:
+        value = (getattr(item, field, None) or "").lower()
+    return value
+
+
 def filter_by_category(items: List[Any], category: str) -> List[Any]:
     """
     按分类过滤项目
@@ -70,10 +106,13 @@ def filter_by_category(items: List[Any], category: str) -> List[Any]:
     Returns:
         过滤后的列表
     """
-    return [
-        item for item in items
-        if hasattr(item, 'category') and item.category and category.lower() in item.category.lower()
-    ]
+    category_lower = category.lower()
+    result = []
+    for item in items:
+        value = _lowered(item, "category")
+        if value and category_lower in value:
+            result.append(item)
+    return result
 
 
 def filter_by_source(items: List[Any], source: str) -> List[Any]:
@@ -87,7 +126,5 @@ def filter_by_source(items: List[Any], source: str) -> List[Any]:
     Returns:
         过滤后的列表
     """
-    return [
-        item for item in items
-        if hasattr(item, 'source') and source.lower() in item.source.lower()
-    ]
+    source_lower = source.lower()
+    return [item for item in items if source_lower in _lowered(item, "source")]
@@ -1,6 +1,7 @@
 """文本处理工具函数"""
 import re
-from typing import List
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Tuple
 
 
 def clean_html(text: str) -> str:
@@ -33,9 +34,90 @@ def truncate_text(text: str, max_length: int = 300, suffix: str = '...') -> str:
     return text[:max_length] + suffix
 
 
+class KeywordMatcher:
+    """
+    预编译的多关键词匹配器
+
+    所有关键词编译成一个带单词边界的正则（长关键词优先），每段文本只扫描一遍，
+    不会在其他单词内部误匹配（如 "AI" 不匹配 "said"，"Meta" 不匹配 "metadata"）。
+    关键词后可以紧跟复数 s 或版本号（如 "LLMs"、"GPT4o"、"Llama3.1"）；
+    被匹配到的长关键词包含的短关键词一并返回（"Stability AI" 同时标记 "AI"）。
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        """
+        初始化匹配器
+
+        Args:
+            keywords: 关键词列表（顺序即返回结果的优先级）
+        """
+        self.keywords = list(keywords)
+        self._canonical = {}
+        for keyword in self.keywords:
+            self._canonical.setdefault(self._normalize(keyword), keyword)
+        self._rank = {key: i for i, key in enumerate(self._canonical)}
+        # 长关键词匹配后不会再匹配其内部的短关键词，这里预先记下被包含的关键词
+        self._implied = {
+            key: [other for other in self._canonical if other != key and other in key]
+            for key in self._canonical
+        }
+
+        alternatives = sorted(self._canonical.values(), key=len, reverse=True)
+        pattern = "|".join(re.escape(keyword).replace(r"\ ", r"\s+") for keyword in alternatives)
+        # 允许复数形式（如 LLMs、Transformers）和紧跟的版本号（如 GPT4、Llama3.1）
+        self._pattern = re.compile(
+            rf"(?<![a-z0-9])({pattern})(?:s|\d+(?:\.\d+)*[a-z]?)?(?![a-z0-9])", re.IGNORECASE
+        ) if alternatives else None
+
+    @staticmethod
+    def _normalize(keyword: str) -> str:
+        """小写并合并空白"""
+        return " ".join(keyword.lower().split())
+
+    def extract(self, text: str, max_count: int = 5) -> List[str]:
+        """
+        从文本中提取关键词
+
+        Args:
+            text: 待提取的文本
+            max_count: 最多返回的关键词数量
+
+        Returns:
+            找到的关键词列表（按关键词列表顺序）
+        """
+        if self._pattern is None:
+            return []
+        found = set()
+        for match in self._pattern.finditer(text):
+            key = self._normalize(match.group(1))
+            found.add(key)
+            found.update(self._implied[key])
+        ordered = sorted(found, key=self._rank.__getitem__)
+        return [self._canonical[key] for key in ordered[:max_count]]
+
+    def extract_batch(self, texts: Iterable[str], max_count: int = 5) -> List[List[str]]:
+        """
+        批量提取关键词
+
+        Args:
+            texts: 文本列表
+            max_count: 每段文本最多返回的关键词数量
+
+        Returns:
+            与 texts 对应的关键词列表
+        """
+        return [self.extract(text, max_count) for text in texts]
+
+
+@lru_cache(maxsize=32)
+def _get_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """按关键词列表缓存编译好的匹配器"""
+    return KeywordMatcher(keywords)
+
+
 def extract_keywords(text: str, keyword_list: List[str], max_count: int = 5) -> List[str]:
     """
-    从文本中提取关键词
+    从文本中提取关键词（整词匹配，不区分大小写）
     
     Args:
         text: 待提取的文本
@@ -45,14 +127,7 @@ def extract_keywords(text: str, keyword_list: List[str], max_count: int = 5) ->
     Returns:
         找到的关键词列表
     """
-    found_keywords = []
-    text_lower = text.lower()
-    
-    for keyword in keyword_list:
-        if keyword.lower() in text_lower:
-            found_keywords.append(keyword)
-    
-    return found_keywords[:max_count]
+    return _get_matcher(tuple(keyword_list)).extract(text, max_count)
 
 
 # AI 相关关键词常量
@@ -65,6 +140,8 @@ AI_KEYWORDS = [
     "Tesla", "Autonomous", "NVIDIA", "Stability AI"
 ]
 
+AI_KEYWORD_MATCHER = KeywordMatcher(AI_KEYWORDS)
+
 
 def extract_ai_keywords(text: str, max_count: int = 5) -> List[str]:
     """
@@ -77,4 +154,18 @@ def extract_ai_keywords(text: str, max_count: int = 5) -> List[str]:
     Returns:
         找到的 AI 关键词列表
     """
-    return extract_keywords(text, AI_KEYWORDS, max_count)
+    return AI_KEYWORD_MATCHER.extract(text, max_count)
+
+
+def extract_ai_keywords_batch(texts: Iterable[str], max_count: int = 5) -> List[List[str]]:
+    """
+    批量提取 AI 相关关键词
+
+    Args:
+        texts: 文本列表
+        max_count: 每段文本最多返回的关键词数量
+
+    Returns:
+        与 texts 对应的关键词列表
+    """
+    return AI_KEYWORD_MATCHER.extract_batch(texts, max_count)
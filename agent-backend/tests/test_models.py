@@ -1,7 +1,7 @@
 """Tests for data models."""
 
 from datetime import datetime
-from app.models.base import AgentRequest, AgentResponse
+from app.models.base import AgentRequest, AgentResponse, StreamPacing
 from app.models.news import NewsItem, TrendingTopic
 
 
@@ -54,3 +54,27 @@ def test_trending_topic_creation():
     assert topic.keyword == "AI"
     assert topic.mentions == 100
     assert topic.change == "+15%"
+
+
+def test_stream_pacing_defaults_off():
+    """Pacing is disabled unless the request asks for it."""
+    pacing = StreamPacing.from_context({})
+    assert pacing.enabled is False
+    assert pacing.delay_for("response_chunk") == 0.0
+
+
+def test_stream_pacing_from_context():
+    """Pacing can be enabled per request with custom delays."""
+    assert StreamPacing.from_context({"pacing": True}).delay_for("thought_chunk") == 0.05
+
+    pacing = StreamPacing.from_context({"pacing": {"response_chunk_delay_ms": 10}})
+    assert pacing.enabled is True
+    assert pacing.delay_for("response_chunk") == 0.01
+    assert pacing.delay_for("plan") == 0.0
+
+    # Invalid config falls back to the default
+    assert StreamPacing.from_context({"pacing": {"iteration_delay_ms": "x"}}).enabled is False
+
+    # Delays are bounded so a client cannot hold the stream open indefinitely
+    assert StreamPacing.from_context({"pacing": {"response_chunk_delay_ms": 60_000}}).enabled is False
+    assert StreamPacing.from_context({"pacing": {"iteration_delay_ms": -1}}).enabled is False
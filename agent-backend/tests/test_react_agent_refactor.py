@@ -148,7 +148,7 @@ async def test_act_selects_tool(mock_llm_service, mock_tool_registry, simple_pla
         tool_registry=mock_tool_registry
     )
     
-    tool_call = await agent._act(
+    tool_calls = await agent._act(
         query="Test query",
         thought="I need to search",
         plan=simple_plan,
@@ -157,6 +157,8 @@ async def test_act_selects_tool(mock_llm_service, mock_tool_registry, simple_pla
         iteration=1
     )
     
+    assert len(tool_calls) == 1
+    tool_call = tool_calls[0]
     assert isinstance(tool_call, ToolCall)
     assert tool_call.tool_name == "search"
     assert tool_call.parameters == {"query": "test"}
@@ -214,8 +216,10 @@ async def test_observe_executes_tool(mock_tool_orchestrator):
         source="test"
     )
     
-    observation = await agent._observe(tool_call, iteration=1)
+    observations = await agent._observe([tool_call], iteration=1)
     
+    assert len(observations) == 1
+    observation = observations[0]
     assert isinstance(observation, ToolResult)
     assert observation.success is True
     assert observation.tool_name == "search"
@@ -242,8 +246,8 @@ async def test_observe_sends_observation_event(mock_tool_orchestrator):
         source="test"
     )
     
-    observation = await agent._observe(
-        tool_call,
+    observations = await agent._observe(
+        [tool_call],
         iteration=1,
         streaming_callback=mock_callback
     )
@@ -356,5 +360,522 @@ async def test_react_iteration_streaming_order(
     assert observation_idx > action_idx
 
 
+@pytest.mark.asyncio
+async def test_single_call_iteration_uses_one_llm_call(
+    mock_llm_service,
+    mock_tool_registry,
+    mock_tool_orchestrator,
+    simple_plan
+):
+    """测试 single_call 模式一次 LLM 调用同时得到思考和行动"""
+    mock_llm_service.generate_text = AsyncMock(return_value='''
+    {
+        "thought": "I need to search",
+        "tool_name": "search",
+        "parameters": {"query": "test"},
+        "reasoning": "Need to search"
+    }
+    ''')
+    
+    agent = ReactAgent(
+        llm_service=mock_llm_service,
+        tool_registry=mock_tool_registry,
+        tool_orchestrator=mock_tool_orchestrator,
+        iteration_mode="single_call"
+    )
+    
+    step = await agent._react_iteration(
+        query="Test query",
+        plan=simple_plan,
+        history=[],
+        context={},
+        iteration=1
+    )
+    
+    assert mock_llm_service.generate_text.call_count == 1
+    assert step.thought == "I need to search"
+    assert step.action.tool_name == "search"
+    assert step.action.parameters == {"query": "test"}
+    assert step.status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_single_call_iteration_streams_thought(
+    mock_llm_service,
+    mock_tool_registry,
+    mock_tool_orchestrator,
+    simple_plan
+):
+    """测试 single_call 模式流式推送 thought 字段，行动在思考之后发送"""
+    async def mock_stream(*args, **kwargs):
+        chunks = ['{"thought": "I ne', 'ed to ', 'search", "tool_', 'name": "search", "parameters": {}}']
+        for chunk in chunks:
+            yield chunk
+    
+    mock_llm_service.generate_text_stream = mock_stream
+    
+    agent = ReactAgent(
+        llm_service=mock_llm_service,
+        tool_registry=mock_tool_registry,
+        tool_orchestrator=mock_tool_orchestrator
+    )
+    
+    events = []
+    
+    async def capture_callback(event_type, data):
+        events.append((event_type, data))
+    
+    step = await agent._react_iteration(
+        query="Test query",
+        plan=simple_plan,
+        history=[],
+        context={"iteration_mode": "single_call"},
+        iteration=1,
+        streaming_callback=capture_callback
+    )
+    
+    event_types = [event_type for event_type, _ in events]
+    streamed = "".join(data["chunk"] for event_type, data in events if event_type == "thought_chunk")
+    
+    assert streamed == "I need to search"
+    assert event_types.index("action") > event_types.index("thought_chunk")
+    assert step.action.tool_name == "search"
+
+
+@pytest.mark.asyncio
+async def test_fast_path_skips_llm_reasoning(mock_llm_service, mock_tool_registry, simple_plan):
+    """测试完全确定的 simple 计划直接执行，不调用 LLM 推理"""
+    from app.models.react import QualityEvaluation
+    
+    mock_llm_service.is_available = Mock(return_value=False)
+    
+    orchestrator = Mock()
+    orchestrator.is_fully_specified = Mock(return_value=True)
+    orchestrator.execute_chain = AsyncMock(return_value=[ToolResult(
+        success=True,
+        data="Search results",
+        execution_time=0.1,
+        tool_name="search"
+    )])
+    
+    memory = Mock()
+    memory.get_history = AsyncMock(return_value=[])
+    memory.get_context_summary = AsyncMock(return_value=None)
+    memory.save_interaction = AsyncMock(return_value=True)
+    
+    planner = Mock()
+    planner.classify_complexity = AsyncMock(return_value="simple")
+    planner.create_plan = AsyncMock(return_value=simple_plan)
+    
+    reflection = Mock()
+    reflection.evaluate_output = AsyncMock(return_value=QualityEvaluation(
+        completeness_score=10,
+        quality_score=10,
+        needs_retry=False
+    ))
+    
+    agent = ReactAgent(
+        llm_service=mock_llm_service,
+        tool_registry=mock_tool_registry,
+        conversation_memory=memory,
+        task_planner=planner,
+        tool_orchestrator=orchestrator,
+        reflection_engine=reflection
+    )
+    
+    response = await agent.execute("Test query", session_id="s1")
+    
+    assert response.success is True
+    assert response.response == "Search results"
+    assert len(response.steps) == 1
+    assert response.steps[0].action.source == "plan"
+    assert orchestrator.execute_chain.called
+    assert not mock_llm_service.generate_text.called
+    assert {"history", "summary", "complexity", "plan", "execution"} <= set(response.stage_timings)
+
+
+
+
+def _staged_agent(mock_llm_service, mock_tool_registry, plan, complexity, delay):
+    """创建各规划前阶段都会 sleep 的 Agent，并记录已完成的阶段"""
+    import asyncio
+    from app.core.reflection_engine import ReflectionEngine
+    
+    finished = []
+    
+    def stage(name, result):
+        async def run(*args, **kwargs):
+            await asyncio.sleep(delay)
+            finished.append(name)
+            return result
+        return AsyncMock(side_effect=run)
+    
+    mock_llm_service.is_available = Mock(return_value=False)
+    
+    memory = Mock()
+    memory.get_history = stage("history", [])
+    memory.get_context_summary = stage("summary", None)
+    memory.save_interaction = AsyncMock(return_value=True)
+    
+    planner = Mock()
+    planner.classify_complexity = stage("complexity", complexity)
+    planner.create_plan = AsyncMock(return_value=plan)
+    
+    orchestrator = Mock()
+    orchestrator.is_fully_specified = Mock(return_value=True)
+    orchestrator.execute_chain = AsyncMock(return_value=[ToolResult(
+        success=True, data="Search results", tool_name="search"
+    )])
+    
+    agent = ReactAgent(
+        llm_service=mock_llm_service,
+        tool_registry=mock_tool_registry,
+        conversation_memory=memory,
+        task_planner=planner,
+        tool_orchestrator=orchestrator,
+        reflection_engine=ReflectionEngine(llm_service=mock_llm_service, sample_rate=0.0)
+    )
+    return agent, finished
+
+
+@pytest.mark.asyncio
+async def test_pre_plan_stages_run_concurrently(mock_llm_service, mock_tool_registry, simple_plan):
+    """测试历史、摘要和复杂度分类并发执行，总耗时小于各阶段耗时之和"""
+    import time
+    
+    agent, finished = _staged_agent(mock_llm_service, mock_tool_registry, simple_plan, "medium", delay=0.2)
+    
+    start = time.perf_counter()
+    response = await agent.execute("Compare these models", session_id="s1")
+    elapsed = time.perf_counter() - start
+    
+    assert response.success is True
+    assert sorted(finished) == ["complexity", "history", "summary"]
+    assert elapsed < 0.5
+    assert agent.task_planner.create_plan.await_args.kwargs["conversation_history"] == []
+
+
+@pytest.mark.asyncio
+async def test_simple_plan_does_not_wait_for_history(mock_llm_service, mock_tool_registry, simple_plan):
+    """测试 simple 计划不等待历史加载（历史任务被取消）"""
+    import asyncio
+    
+    agent, finished = _staged_agent(mock_llm_service, mock_tool_registry, simple_plan, "simple", delay=0.1)
+    
+    async def slow_history(*args, **kwargs):
+        await asyncio.sleep(1.0)
+        finished.append("history")
+        return []
+    
+    agent.conversation_memory.get_history = AsyncMock(side_effect=slow_history)
+    
+    response = await agent.execute("hello", session_id="s1")
+    
+    assert response.success is True
+    assert "history" not in finished
+    assert response.execution_time < 0.5
+    assert agent.task_planner.create_plan.await_args.kwargs["conversation_history"] is None
+
+@pytest.mark.asyncio
+async def test_fast_path_failure_streams_only_react_steps(mock_llm_service, mock_tool_registry, simple_plan):
+    """测试快速路径失败时不发送其步骤事件，回退后的 ReAct 循环从第 1 步开始"""
+    mock_llm_service.is_available = Mock(return_value=False)
+    
+    orchestrator = Mock()
+    orchestrator.is_fully_specified = Mock(return_value=True)
+    orchestrator.execute_chain = AsyncMock(return_value=[ToolResult(
+        success=False,
+        error="boom",
+        tool_name="search"
+    )])
+    
+    memory = Mock()
+    memory.get_history = AsyncMock(return_value=[])
+    memory.get_context_summary = AsyncMock(return_value=None)
+    memory.save_interaction = AsyncMock(return_value=True)
+    
+    planner = Mock()
+    planner.classify_complexity = AsyncMock(return_value="simple")
+    planner.create_plan = AsyncMock(return_value=simple_plan)
+    
+    agent = ReactAgent(
+        llm_service=mock_llm_service,
+        tool_registry=mock_tool_registry,
+        conversation_memory=memory,
+        task_planner=planner,
+        tool_orchestrator=orchestrator,
+        reflection_engine=Mock()
+    )
+    
+    events = []
+    
+    async def callback(event_type, data):
+        events.append((event_type, data.get("step_number")))
+    
+    async def react_loop(query, plan, context, streaming_callback):
+        await streaming_callback("action", {"step_number": 1})
+        await streaming_callback("observation", {"step_number": 1})
+        return []
+    
+    agent._react_loop = AsyncMock(side_effect=react_loop)
+    
+    await agent.execute("Test query", session_id="s1", streaming_callback=callback)
+    
+    agent._react_loop.assert_awaited_once()
+    assert [e for e in events if e[0] in ("action", "observation")] == [("action", 1), ("observation", 1)]
+
+
+def test_extract_parameters_keeps_query_fallback():
+    """测试没有提取到参数时仍传入 query，除非已注册工具没有 query 参数"""
+    from app.core.task_planner import TaskPlanner
+    from app.models.tool import ToolDefinition, ToolParameter
+    
+    def tool(name, *params):
+        return ToolDefinition(
+            name=name, description=name, plugin_id="p", command=f"/{name}",
+            parameters=[ToolParameter(name=p, type="string", description=p) for p in params]
+        )
+    
+    tools = {"search_news": tool("search_news", "query", "limit"), "get_latest_news": tool("get_latest_news", "count")}
+    registry = Mock()
+    registry.get_tool = Mock(side_effect=tools.get)
+    planner = TaskPlanner(tool_registry=registry, llm_service=Mock())
+    
+    assert planner._extract_parameters("OpenAI news", "search_news") == {"query": "OpenAI news"}
+    assert planner._extract_parameters("OpenAI news", "unregistered") == {"query": "OpenAI news"}
+    assert planner._extract_parameters("latest news", "get_latest_news") == {}
+    assert planner._extract_parameters("latest 5 news", "get_latest_news") == {"count": 5}
+
+
+
+@pytest.mark.asyncio
+async def test_async_evaluation_runs_in_background(mock_llm_service, mock_tool_registry, simple_plan):
+    """测试 async 评估模式先返回临时评估，后台评估完成后回写"""
+    import asyncio
+    from app.core.reflection_engine import ReflectionEngine
+    from app.models.react import QualityEvaluation
+    
+    mock_llm_service.is_available = Mock(return_value=False)
+    
+    orchestrator = Mock()
+    orchestrator.is_fully_specified = Mock(return_value=True)
+    orchestrator.execute_chain = AsyncMock(return_value=[ToolResult(
+        success=True,
+        data="Search results",
+        execution_time=0.1,
+        tool_name="search"
+    )])
+    
+    async def save_interaction(session_id, query, response, user_id=None):
+        response.conversation_id = 7
+        return True
+    
+    memory = Mock()
+    memory.get_history = AsyncMock(return_value=[])
+    memory.get_context_summary = AsyncMock(return_value=None)
+    memory.save_interaction = AsyncMock(side_effect=save_interaction)
+    memory.update_evaluation = AsyncMock(return_value=True)
+    
+    planner = Mock()
+    planner.classify_complexity = AsyncMock(return_value="simple")
+    planner.create_plan = AsyncMock(return_value=simple_plan)
+    
+    final_evaluation = QualityEvaluation(completeness_score=9, quality_score=8, needs_retry=False)
+    reflection = ReflectionEngine(llm_service=mock_llm_service, sample_rate=1.0)
+    reflection.evaluate_output = AsyncMock(return_value=final_evaluation)
+    
+    agent = ReactAgent(
+        llm_service=mock_llm_service,
+        tool_registry=mock_tool_registry,
+        conversation_memory=memory,
+        task_planner=planner,
+        tool_orchestrator=orchestrator,
+        reflection_engine=reflection,
+        evaluation_mode="async"
+    )
+    
+    response = await agent.execute("Test query", session_id="s1")
+    
+    assert response.success is True
+    assert response.evaluation.status == "pending"
+    assert "evaluation" not in response.stage_timings
+    
+    await asyncio.gather(*agent._background_tasks)
+    
+    reflection.evaluate_output.assert_awaited_once()
+    memory.update_evaluation.assert_awaited_once_with(7, final_evaluation)
+    assert response.evaluation.status == "final"
+
+
+@pytest.mark.asyncio
+async def test_async_mode_saves_in_background_and_validates_mode(mock_llm_service, mock_tool_registry, simple_plan):
+    """测试 async 模式不等待对话保存，同会话下一次请求等待保存完成；无效的评估模式回退到 sync"""
+    import asyncio
+    from app.core.reflection_engine import ReflectionEngine
+    
+    mock_llm_service.is_available = Mock(return_value=False)
+    
+    orchestrator = Mock()
+    orchestrator.is_fully_specified = Mock(return_value=True)
+    orchestrator.execute_chain = AsyncMock(return_value=[ToolResult(
+        success=True,
+        data="Search results",
+        execution_time=0.1,
+        tool_name="search"
+    )])
+    
+    release_save = asyncio.Event()
+    
+    async def save_interaction(session_id, query, response, user_id=None):
+        await release_save.wait()
+        return True
+    
+    memory = Mock()
+    memory.get_history = AsyncMock(return_value=[])
+    memory.get_context_summary = AsyncMock(return_value=None)
+    memory.save_interaction = AsyncMock(side_effect=save_interaction)
+    
+    planner = Mock()
+    planner.classify_complexity = AsyncMock(return_value="simple")
+    planner.create_plan = AsyncMock(return_value=simple_plan)
+    
+    agent = ReactAgent(
+        llm_service=mock_llm_service,
+        tool_registry=mock_tool_registry,
+        conversation_memory=memory,
+        task_planner=planner,
+        tool_orchestrator=orchestrator,
+        reflection_engine=ReflectionEngine(llm_service=mock_llm_service, sample_rate=0.0),
+        evaluation_mode="async"
+    )
+    
+    response = await asyncio.wait_for(agent.execute("Test query", session_id="s1"), timeout=1)
+    assert response.success is True
+    assert "s1" in agent._pending_saves
+    
+    # 同一会话的下一次请求在上一轮保存完成前不读取历史
+    follow_up = asyncio.create_task(agent.execute("Follow up", session_id="s1"))
+    await asyncio.sleep(0.01)
+    assert memory.get_history.await_count == 1
+    
+    release_save.set()
+    await asyncio.wait_for(follow_up, timeout=1)
+    assert memory.get_history.await_count == 2
+    await asyncio.gather(*agent._background_tasks)
+    assert agent._pending_saves == {}
+    
+    # 无效的评估模式回退到 sync：返回前完成保存
+    memory.save_interaction.reset_mock()
+    await agent.execute("Test query", session_id="s2", context={"evaluation_mode": "bogus"})
+    memory.save_interaction.assert_awaited_once()
+    assert "s2" not in agent._pending_saves
+
+
+def test_reflection_sampling_skips_llm_evaluation(mock_llm_service):
+    """测试抽样比例为 0 时只使用规则评估"""
+    from app.core.reflection_engine import ReflectionEngine
+    
+    reflection = ReflectionEngine(llm_service=mock_llm_service, sample_rate=0.0)
+    
+    assert reflection.should_evaluate() is False
+    evaluation = reflection.quick_evaluation("short", [])
+    assert evaluation.status == "skipped"
+    assert not mock_llm_service.generate_text.called
+
+
+
+@pytest.mark.asyncio
+async def test_react_iteration_runs_multiple_actions(mock_llm_service, mock_tool_registry, simple_plan):
+    """测试一次迭代返回多个工具调用时并发执行并记录在同一步骤中"""
+    mock_llm_service.generate_text = AsyncMock(return_value='''
+    {
+        "thought": "Need news and trends",
+        "actions": [
+            {"tool_name": "get_latest_news", "parameters": {"count": 5}},
+            {"tool_name": "get_trending_topics", "parameters": {}}
+        ]
+    }
+    ''')
+    
+    orchestrator = Mock()
+    orchestrator.execute_tools = AsyncMock(return_value=[
+        ToolResult(success=True, data="news", tool_name="get_latest_news"),
+        ToolResult(success=False, error="boom", tool_name="get_trending_topics")
+    ])
+    
+    agent = ReactAgent(
+        llm_service=mock_llm_service,
+        tool_registry=mock_tool_registry,
+        tool_orchestrator=orchestrator,
+        iteration_mode="single_call"
+    )
+    
+    step = await agent._react_iteration(
+        query="News and trends",
+        plan=simple_plan,
+        history=[],
+        context={},
+        iteration=1
+    )
+    
+    assert [a.tool_name for a in step.get_actions()] == ["get_latest_news", "get_trending_topics"]
+    assert len(step.get_observations()) == 2
+    assert step.status == "partial"
+    assert not step.is_successful()
+    assert [a.tool_name for a, _ in step.get_failed_calls()] == ["get_trending_topics"]
+    assert len(step.to_dict()["observations"]) == 2
+    orchestrator.execute_tools.assert_awaited_once()
+    assert mock_llm_service.generate_text.await_count == 1
+
+
+def test_partial_step_is_retried_with_failed_calls(mock_llm_service):
+    """测试部分失败的多行动步骤会继续迭代，并把失败的调用交给下一轮推理"""
+    from app.core.reflection_engine import ReflectionEngine
+    from app.prompts.react_prompts import ReActIterationPrompt
+    
+    plan = ExecutionPlan(
+        query="News and trends",
+        complexity="medium",
+        steps=[
+            PlanStep(step_number=1, description="News", tool_name="get_latest_news"),
+            PlanStep(step_number=2, description="Trends", tool_name="get_trending_topics")
+        ],
+        estimated_iterations=2
+    )
+    actions = [
+        ToolCall(tool_name="get_latest_news", parameters={"count": 5}),
+        ToolCall(tool_name="get_trending_topics", parameters={})
+    ]
+    observations = [
+        ToolResult(success=True, data="news", tool_name="get_latest_news"),
+        ToolResult(success=False, error="boom", tool_name="get_trending_topics")
+    ]
+    step = ReActStep(
+        step_number=1,
+        thought="Need news and trends",
+        action=actions[0],
+        observation=observations[0],
+        actions=actions,
+        observations=observations,
+        status="partial"
+    )
+    
+    reflection = ReflectionEngine(llm_service=mock_llm_service, sample_rate=0.0)
+    assert reflection.should_continue([step], plan) is True
+    
+    evaluation = reflection.quick_evaluation("news", [step])
+    assert evaluation.missing_info == ["Step 1 failed: get_trending_topics: boom"]
+    
+    prompt = ReActIterationPrompt.create_prompt(
+        query="News and trends",
+        plan=plan.to_dict(),
+        history=[step.to_dict()],
+        available_tools="",
+        iteration=2
+    )
+    assert "Observation: FAILED: boom" in prompt
+    assert "Status: partial" in prompt
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
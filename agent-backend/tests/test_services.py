@@ -64,3 +64,795 @@ async def test_news_collector_empty_results(news_collector):
     trending_topics = await news_collector.get_trending_topics(limit=0)
     assert isinstance(trending_topics, list)
     assert len(trending_topics) == 0
+
+
+class _FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+def _make_gemini_service(fake_model):
+    """Create a GeminiLLMService bypassing SDK initialization."""
+    from app.services.llm_service import GeminiLLMService
+
+    service = GeminiLLMService.__new__(GeminiLLMService)
+    service.api_key = "test"
+    service.model_name = "test-model"
+    service.model = fake_model
+    return service
+
+
+@pytest.mark.asyncio
+async def test_gemini_stream_does_not_block_event_loop():
+    """The blocking SDK iterator runs in a worker thread, not on the event loop."""
+    import asyncio
+    import time
+    from unittest.mock import Mock
+
+    def slow_stream(*args, **kwargs):
+        for text in ["a", "b", "c"]:
+            time.sleep(0.1)  # simulate blocking network reads
+            yield _FakeChunk(text)
+
+    service = _make_gemini_service(Mock(generate_content=Mock(side_effect=slow_stream)))
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    chunks = [chunk async for chunk in service._stream_in_thread(
+        lambda: slow_stream(), chunk_timeout=5.0, total_timeout=5.0
+    )]
+    ticker_task.cancel()
+
+    assert chunks == ["a", "b", "c"]
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_gemini_stream_chunk_timeout():
+    """A stalled stream raises instead of hanging forever."""
+    import time
+    from app.services.llm_service import LLMServiceError
+
+    def stalled_stream():
+        yield _FakeChunk("first")
+        time.sleep(1.0)
+        yield _FakeChunk("late")
+
+    service = _make_gemini_service(None)
+
+    received = []
+    with pytest.raises(LLMServiceError):
+        async for chunk in service._stream_in_thread(
+            stalled_stream, chunk_timeout=0.2, total_timeout=5.0
+        ):
+            received.append(chunk)
+
+    assert received == ["first"]
+
+
+RSS_SAMPLE = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>OpenAI releases new model</title><link>https://example.com/a</link>
+<description>A new GPT model.</description><pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+class _FakeStream:
+    def __init__(self, body, chunk_size=64):
+        self._body = body
+        self._chunk_size = chunk_size
+        self.bytes_read = 0
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self._body), self._chunk_size):
+            chunk = self._body[start:start + self._chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+
+class _FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self.content = _FakeStream(body)
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    """Returns queued responses and records request headers."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_fetch_rss_feed_uses_conditional_requests():
+    """Validators are sent back, and 304/unchanged bodies reuse parsed items."""
+    from unittest.mock import AsyncMock
+
+    service = NewsCollectorService()
+    session = _FakeSession([
+        _FakeResponse(200, RSS_SAMPLE, {"ETag": '"v1"', "Last-Modified": "Mon, 06 Jan 2025 10:00:00 GMT"}),
+        _FakeResponse(304),
+        _FakeResponse(200, RSS_SAMPLE, {"ETag": '"v2"'}),
+    ])
+    service._get_session = AsyncMock(return_value=session)
+
+    first = await service._fetch_rss_feed("Test", "https://example.com/rss")
+    assert len(first) == 1
+    assert service.get_feed_status()["Test"]["status"] == "fresh"
+
+    second = await service._fetch_rss_feed("Test", "https://example.com/rss")
+    assert second == first
+    assert session.requests[1]["If-None-Match"] == '"v1"'
+    assert "If-Modified-Since" in session.requests[1]
+    assert service.get_feed_status()["Test"]["status"] == "not_modified"
+
+    third = await service._fetch_rss_feed("Test", "https://example.com/rss")
+    assert third == first
+    assert service.get_feed_status()["Test"]["status"] == "hash_unchanged"
+
+
+
+@pytest.mark.asyncio
+async def test_failed_parse_does_not_keep_validators():
+    """If parsing fails, the new ETag is not kept, so the next poll refetches the full body."""
+    from unittest.mock import AsyncMock
+
+    service = NewsCollectorService()
+    session = _FakeSession([
+        _FakeResponse(200, RSS_SAMPLE, {"ETag": '"v1"', "Last-Modified": "Mon, 06 Jan 2025 10:00:00 GMT"}),
+        _FakeResponse(200, RSS_SAMPLE, {"ETag": '"v1"'}),
+    ])
+    service._get_session = AsyncMock(return_value=session)
+    real_parse = service._parse_pool.parse
+    service._parse_pool.parse = AsyncMock(side_effect=ValueError("bad feed"))
+
+    assert await service._fetch_rss_feed("Test", "https://example.com/rss") == []
+    assert service.get_feed_status()["Test"]["status"] == "error"
+
+    service._parse_pool.parse = real_parse
+    items = await service._fetch_rss_feed("Test", "https://example.com/rss")
+    assert session.requests[1] == {}
+    assert len(items) == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_refresh():
+    """Concurrent cold reads trigger a single fan-out; stale reads are served immediately."""
+    import asyncio
+    from datetime import datetime, timedelta
+
+    from app.models.news import NewsItem
+
+    service = NewsCollectorService()
+    service.rss_feeds = {"Test": "https://example.com/rss"}
+    fetches = 0
+
+    async def fake_fetch(source, url):
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(0.05)
+        return [NewsItem(
+            title=f"Item {fetches}", summary="s", url=f"https://example.com/{fetches}", source=source,
+            publish_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )]
+
+    service._fetch_rss_feed = fake_fetch
+
+    await asyncio.gather(*(service._fetch_all_news() for _ in range(5)))
+    assert fetches == 1
+
+    snapshot = service._news_cache
+    service._cache_time = datetime.now() - timedelta(hours=1)
+    assert await service._fetch_all_news() is snapshot
+    await service._refresh_task
+    assert fetches == 2
+    assert service._snapshot_version == 2
+
+
+
+@pytest.mark.asyncio
+async def test_refresh_publishes_similarity_matrix_with_snapshot():
+    """The TF-IDF matrix is rebuilt when the snapshot is swapped, not on the first related-news query."""
+    from datetime import datetime
+
+    from app.models.news import NewsItem
+
+    service = NewsCollectorService()
+    service.use_real_data = True
+    service.rss_feeds = {"Test": "https://example.com/rss"}
+    service._init_store()
+
+    async def fake_fetch(source, url):
+        service._feed_states[source].record("fresh", 0.0)
+        return [NewsItem(
+            title="Gemini multimodal model", summary="Understands images", url="https://example.com/1",
+            source=source, publish_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )]
+
+    service._fetch_rss_feed = fake_fetch
+    await service.refresh()
+    stats = service._similarity_index.get_stats()
+    assert stats["rebuilds"] == 1 and not stats["dirty"]
+
+    related = await service.find_related_news("multimodal", limit=3)
+    assert [item.title for item in related] == ["Gemini multimodal model"]
+    assert service._similarity_index.get_stats()["rebuilds"] == 1
+
+
+@pytest.mark.asyncio
+async def test_clear_cache_forces_a_full_refetch():
+    """Clearing drops the store, indexes and feed schedules, so every feed is fetched again."""
+    from datetime import datetime
+
+    from app.models.news import NewsItem
+
+    service = NewsCollectorService()
+    service.rss_feeds = {"Test": "https://example.com/rss"}
+    service._init_store()
+    fetches = 0
+
+    async def fake_fetch(source, url):
+        nonlocal fetches
+        fetches += 1
+        service._feed_states[source].record("fresh", 0.0)
+        return [NewsItem(
+            title="Item", summary="s", url="https://example.com/1", source=source,
+            publish_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )]
+
+    service._fetch_rss_feed = fake_fetch
+    await service._fetch_all_news()
+    assert fetches == 1 and len(service._article_store) == 1
+
+    service.clear_cache()
+    assert len(service._article_store) == 0
+    assert service.get_store_stats()["search_index"]["documents"] == 0
+    assert service._feed_states["Test"].is_due(datetime.now())
+
+    assert len(await service._fetch_all_news()) == 1
+    assert fetches == 2
+
+def test_feed_state_adapts_poll_interval_and_backs_off():
+    """Busy feeds are polled often, quiet feeds slow down, failing feeds back off."""
+    from datetime import datetime, timedelta
+    from app.models.news import NewsItem
+    from app.services.news_collector import FeedState
+
+    def item(hours_ago):
+        publish_time = (datetime(2025, 1, 6, 12) - timedelta(hours=hours_ago)).strftime("%Y-%m-%d %H:%M:%S")
+        return NewsItem(title="t", summary="s", url="https://example.com", source="x", publish_time=publish_time)
+
+    busy = FeedState(items=[item(h) for h in range(5)])
+    busy.record("fresh", 0.2)
+    assert busy.poll_interval == 1800  # hourly publishing -> poll every 30 min
+
+    quiet = FeedState(items=[item(h * 4) for h in range(3)])
+    quiet.record("fresh", 0.2)
+    first_interval = quiet.poll_interval
+    quiet.record("not_modified", 0.1)
+    assert quiet.poll_interval > first_interval
+
+    failing = FeedState()
+    for _ in range(FeedState.FAILURE_THRESHOLD):
+        failing.record("error", 10.0)
+    assert failing.is_circuit_open()
+    assert not failing.is_due(datetime.now())
+    stats = failing.to_dict()
+    assert stats["total_errors"] == FeedState.FAILURE_THRESHOLD
+    assert stats["last_latency_ms"] == 10000
+    assert stats["circuit_state"] == "open"
+
+
+def test_feed_circuit_skips_until_cooldown_then_probes_once():
+    """An open circuit skips the feed for the whole cooldown, then lets one probe decide."""
+    from datetime import datetime, timedelta
+    from app.services.news_collector import FeedState
+
+    state = FeedState()
+    for _ in range(FeedState.FAILURE_THRESHOLD):
+        state.record("error", 1.0)
+    opened_at = datetime.now()
+
+    # The exponential backoff has elapsed, but the circuit is still cooling down
+    assert not state.is_due(opened_at + timedelta(seconds=FeedState.MAX_BACKOFF / 2))
+    after_cooldown = opened_at + timedelta(seconds=FeedState.CIRCUIT_COOLDOWN + 1)
+    assert state.is_due(after_cooldown)
+    assert state.circuit_state(after_cooldown) == "half_open"
+
+    # A failed probe reopens the circuit for another cooldown
+    state.record("error", 1.0)
+    assert state.circuit_state(datetime.now()) == "open"
+    assert state.next_poll_at >= datetime.now() + timedelta(seconds=FeedState.CIRCUIT_COOLDOWN - 5)
+
+    # A successful probe closes the circuit
+    state.record("fresh", 0.2)
+    assert state.circuit_state(datetime.now()) == "closed"
+    assert state.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["thread", "process"])
+async def test_feed_parse_pool_parses_off_loop(mode):
+    """Parsing runs in the configured pool and is instrumented."""
+    import asyncio
+    from app.services.feed_parser import FeedParsePool
+
+    pool = FeedParsePool(mode=mode, max_workers=2)
+    try:
+        batches = await asyncio.gather(*(pool.parse(RSS_SAMPLE, f"Feed {i}") for i in range(4)))
+    finally:
+        pool.shutdown()
+
+    assert [batch[0].source for batch in batches] == [f"Feed {i}" for i in range(4)]
+    assert batches[0][0].title == "OpenAI releases new model"
+    assert "OpenAI" in batches[0][0].tags
+    stats = pool.get_stats()
+    assert stats["mode"] == mode
+    assert stats["completed"] == 4
+    assert stats["in_flight"] == 0
+
+
+def test_article_store_merges_incrementally_with_retention():
+    """Articles are de-duplicated by canonical URL, only changes are merged, old ones age out."""
+    from datetime import datetime, timedelta
+    from app.models.news import NewsItem
+    from app.services.article_store import ArticleStore
+
+    now = datetime(2025, 1, 6, 12)
+
+    def item(url, hours_ago, source="A", summary="s"):
+        publish_time = (now - timedelta(hours=hours_ago)).strftime("%Y-%m-%d %H:%M:%S")
+        return NewsItem(title="t", summary=summary, url=url, source=source, publish_time=publish_time)
+
+    store = ArticleStore(retention_hours=24)
+    changes = store.merge([item("https://example.com/a", 1), item("https://example.com/b", 30)], now=now)
+    assert (changes.added, changes.skipped) == (1, 1)
+
+    # Cross-posted copy with tracking parameters and an entry that rolled off the feed
+    changes = store.merge([
+        item("http://www.example.com/a/?utm_source=rss#top", 1, source="B"),
+        item("https://example.com/c", 2),
+    ], now=now)
+    assert (changes.added, changes.unchanged) == (1, 1)
+    assert [n.url for n in store.latest()] == ["https://example.com/a", "https://example.com/c"]
+
+    changes = store.merge([item("https://example.com/c", 2, summary="edited")], now=now)
+    assert changes.updated == 1
+    assert "https://example.com/c" in changes.removed
+    assert store.latest()[1].summary == "edited"
+
+    changes = store.evict_expired(now=now + timedelta(hours=22.5))
+    assert list(changes.removed) == ["https://example.com/c"]
+    assert len(store) == 1
+
+
+def test_article_store_keeps_undated_entries_unchanged():
+    """Entries without a date are stamped at parse time; re-parsing them is not an update."""
+    import time
+    from app.services.article_store import ArticleStore
+    from app.services.feed_parser import parse_feed_content
+
+    body = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>
+<item><title>Undated</title><link>https://example.com/u</link><description>d</description></item>
+</channel></rss>"""
+    store = ArticleStore()
+    assert store.merge(parse_feed_content(body, "A")).added == 1
+    published = store.latest()[0].published
+
+    time.sleep(1.1)
+    changes = store.merge(parse_feed_content(body, "A"))
+    assert changes.unchanged == 1 and not changes.changed
+    assert store.latest()[0].published == published
+
+
+def test_search_index_ranks_with_bm25_and_updates_incrementally():
+    """Multi-word and Chinese queries match per token; fields are boosted; removals apply."""
+    from app.models.news import NewsItem
+    from app.services.article_store import Article
+    from app.services.search_index import SearchIndex
+
+    def item(title, summary="", tags=(), source="Blog"):
+        return Article.from_news_item(NewsItem(title=title, summary=summary, url="u", source=source,
+                                               publish_time="2025-01-06 10:00:00", tags=list(tags)))
+
+    index = SearchIndex()
+    index.add("a", item("OpenAI releases reasoning model", "Benchmarks improve"))
+    index.add("b", item("Weekly roundup", "OpenAI and Google ship new reasoning features"))
+    index.add("c", item("谷歌发布多模态大模型", "支持图像理解", tags=["Gemini"]))
+    index.add("d", item("Robotics startup raises funds", source="OpenAI News"))
+
+    results = index.search("openai reasoning", limit=3)
+    assert [r.title for _, r in results][:2] == ["OpenAI releases reasoning model", "Weekly roundup"]
+    assert len(index.search("openai", limit=2)) == 2
+
+    assert [r.title for _, r in index.search("大模型")] == ["谷歌发布多模态大模型"]
+    assert index.search("gemini")[0][1].title == "谷歌发布多模态大模型"
+
+    index.remove("a")
+    index.add("b", item("Weekly roundup", "Nothing new"))
+    assert index.search("reasoning") == []
+    assert index.get_stats()["documents"] == 3
+
+
+@pytest.mark.asyncio
+async def test_similarity_index_batches_topic_queries():
+    """TF-IDF cosine ranking finds partial-term matches for several topics at once."""
+    from app.models.news import NewsItem
+    from app.services.article_store import Article
+    from app.services.similarity_index import SimilarityIndex
+
+    def item(title, summary):
+        return Article.from_news_item(
+            NewsItem(title=title, summary=summary, url="u", source="s", publish_time="2025-01-06 10:00:00")
+        )
+
+    index = SimilarityIndex()
+    index.add("a", item("Gemini is a multimodal model", "Understands images, audio and text"))
+    index.add("b", item("New GPU for AI training", "Faster training for large models"))
+    index.add("c", item("机器人公司融资", "人形机器人进入工厂"))
+    index.add("d", item("Quarterly earnings", "Revenue grew"))
+
+    multimodal, gpu, robots, unknown = index.query(
+        ["multimodal AI", "GPU training", "人形机器人", "zzz"], limit=2
+    )
+    assert multimodal[0][1].title == "Gemini is a multimodal model"
+    assert gpu[0][1].title == "New GPU for AI training"
+    assert robots[0][1].title == "机器人公司融资"
+    assert unknown == []
+    assert index.get_stats()["rebuilds"] == 1
+
+    # Changes only become visible once the matrix is republished off the request path
+    index.remove("a")
+    assert index.query(["multimodal"])[0][0][1].title == "Gemini is a multimodal model"
+    assert index.get_stats()["rebuilds"] == 1 and index.get_stats()["dirty"]
+
+    await index.publish()
+    assert index.query(["multimodal"])[0] == []
+    assert index.get_stats()["rebuilds"] == 2
+
+    await index.publish()
+    assert index.get_stats()["rebuilds"] == 2
+
+
+def test_trending_engine_decays_counts_and_reports_real_change():
+    """Recent tags outrank older ones and change compares window over window."""
+    from datetime import datetime, timedelta
+    from app.models.news import NewsItem
+    from app.services.article_store import Article
+    from app.services.trending_engine import TrendingEngine
+
+    now = datetime(2025, 1, 6, 12, 30)
+
+    def item(hours_ago, *tags):
+        publish_time = (now - timedelta(hours=hours_ago)).strftime("%Y-%m-%d %H:%M:%S")
+        return Article.from_news_item(
+            NewsItem(title="t", summary="s", url="u", source="s", publish_time=publish_time, tags=list(tags))
+        )
+
+    engine = TrendingEngine(half_life_hours=12, window_hours=24)
+    # "LLM": 3 mentions now vs 2 in the previous window; "Robotics": 4 old mentions
+    for i, (hours_ago, tags) in enumerate([
+        (1, ("LLM", "OpenAI")), (2, ("LLM",)), (3, ("LLM",)),
+        (30, ("LLM", "Robotics")), (31, ("LLM", "Robotics")), (40, ("Robotics",)), (41, ("Robotics",)),
+    ]):
+        engine.add(str(i), item(hours_ago, *tags))
+
+    top = engine.top(3, now=now)
+    assert top[0] == ("LLM", 5, "↑ 50%")
+    assert top[1] == ("OpenAI", 1, "NEW")
+    assert top[2][0] == "Robotics"
+    assert engine.top(1, now=now) == top[:1]
+
+    engine.remove("0")
+    assert engine.top(2, now=now)[0] == ("LLM", 4, "→ 0%")
+    assert "OpenAI" not in [tag for tag, _, _ in engine.top(10, now=now)]
+
+
+def test_keyword_matcher_uses_word_boundaries():
+    """Keywords match whole words only, case-insensitively, in list order."""
+    from app.utils import KeywordMatcher, extract_ai_keywords, extract_ai_keywords_batch
+
+    assert extract_ai_keywords("He said the metadata was fine") == []
+    assert extract_ai_keywords("ChatGPT and open-source LLMs beat GPT-4 on deep   learning") == [
+        "GPT", "ChatGPT", "Deep Learning", "LLM"
+    ]
+    assert extract_ai_keywords_batch(["Meta AI", "nothing here"]) == [["Meta", "AI"], []]
+    assert KeywordMatcher(["a", "b", "c"]).extract("c b a", max_count=2) == ["a", "b"]
+
+
+def test_keyword_matcher_keeps_substring_tags_on_real_titles():
+    """Whole-word matching emits the same tags as the old substring scan, minus in-word false hits."""
+    from app.utils import extract_ai_keywords
+    from app.utils.text_utils import AI_KEYWORDS
+
+    def substring_tags(text):
+        return [keyword for keyword in AI_KEYWORDS if keyword.lower() in text.lower()][:5]
+
+    same = [
+        "Stability AI releases Stable Diffusion 3",
+        "Meta releases Llama3 and Llama 3.1 405B",
+        "OpenAI's GPT4o beats GPT-4 Turbo on coding",
+        "Anthropic ships Claude3.5 Sonnet",
+        "ChatGPT now remembers past conversations",
+        "Google DeepMind unveils Gemini 2.0",
+        "NVIDIA's Blackwell chips power new AI models",
+    ]
+    for title in same:
+        assert extract_ai_keywords(title) == substring_tags(title), title
+
+    assert extract_ai_keywords("Stability AI releases Stable Diffusion 3") == ["AI", "Stability AI"]
+    assert extract_ai_keywords("Meta releases Llama3") == ["Meta", "Llama"]
+    # Hits inside other words no longer produce tags
+    assert substring_tags("Retail sales metadata") == ["Meta", "AI"]
+    assert extract_ai_keywords("Retail sales metadata") == []
+
+
+
+def test_article_record_is_compact_and_round_trips():
+    """Records intern shared strings, keep epoch timestamps and convert back losslessly."""
+    from app.models.news import NewsItem
+    from app.services.article_store import Article
+    from app.utils import filter_by_category, filter_by_source
+
+    news = NewsItem(title="T", summary="S", url="https://example.com/a", source="OpenAI Blog",
+                    publish_time="2025-01-06 10:00:00", category="Research", tags=["LLM"])
+    first = Article.from_news_item(news)
+    second = Article.from_news_item(news.model_copy(update={"url": "https://example.com/b"}))
+
+    assert not hasattr(first, "__dict__")
+    assert first.source is second.source and first.tags[0] is second.tags[0]
+    assert first.published < Article.from_news_item(news.model_copy(update={"publish_time": "2025-01-06 10:00:01"})).published
+    assert first.to_news_item() == news
+    assert filter_by_source([first, second], "openai") == [first, second]
+    assert filter_by_category([first], "research") == [first]
+
+
+def test_snapshot_index_facets_time_ranges_and_interleaving():
+    """Per-snapshot indexes answer source/category/time queries and memoize interleaving."""
+    from datetime import datetime
+    from app.models.news import NewsItem
+    from app.services.article_store import Article
+    from app.services.snapshot_index import SnapshotIndex
+
+    def item(i, source, category):
+        return Article.from_news_item(NewsItem(
+            title=f"t{i}", summary="s", url=f"https://example.com/{i}", source=source,
+            publish_time=f"2025-01-06 {10 - i:02d}:00:00", category=category
+        ))
+
+    # Newest first, like the snapshot
+    articles = [
+        item(0, "A", "AI Research"), item(1, "A", "Industry"), item(2, "B", "Research"),
+        item(3, "A", "AI Research"), item(4, "C", "Industry"),
+    ]
+    index = SnapshotIndex(articles, version=1)
+
+    assert [a.title for a in index.interleaved()] == ["t0", "t2", "t4", "t1", "t3"]
+    assert index.interleaved() is index.interleaved()
+    assert [a.title for a in index.interleaved("research")] == ["t0", "t2", "t3"]
+    assert [a.title for a in index.by_source("a")] == ["t0", "t1", "t3"]
+    assert [(c.name, c.count) for c in index.categories()] == [
+        ("AI Research", 2), ("Industry", 2), ("Research", 1)
+    ]
+    between = index.between(datetime(2025, 1, 6, 7), datetime(2025, 1, 6, 9))
+    assert [a.title for a in between] == ["t2", "t3"]
+
+    for i in range(SnapshotIndex.MEMO_SIZE + 10):
+        index.by_source(f"unknown-{i}")
+        index.interleaved(f"unknown-{i}")
+    assert len(index._source_matches) == SnapshotIndex.MEMO_SIZE
+    assert len(index._interleaved) == SnapshotIndex.MEMO_SIZE
+
+
+@pytest.mark.asyncio
+async def test_time_range_and_categories_fall_back_to_mock_data():
+    """A failed first refresh falls back to mock data like the other getters."""
+    from unittest.mock import AsyncMock
+
+    service = NewsCollectorService()
+    service.refresh = AsyncMock(side_effect=RuntimeError("feeds down"))
+
+    assert await service.get_categories() == service._mock_categories()
+    assert await service.get_news_between(limit=3) == service.mock_news[:3]
+
+
+def test_near_duplicates_collapse_to_one_representative():
+    """Cross-posted copies cluster together; the earliest copy represents them with all sources."""
+    from app.models.news import NewsItem
+    from app.services.article_store import Article
+    from app.services.dedup_index import NearDuplicateIndex
+
+    def item(i, source, title, summary, hour):
+        return Article.from_news_item(NewsItem(
+            title=title, summary=summary, url=f"https://example.com/{i}", source=source,
+            publish_time=f"2025-01-06 {hour:02d}:00:00"
+        ))
+
+    launch = "OpenAI releases GPT-5 with improved reasoning"
+    text = "OpenAI today released GPT-5, its newest model, with stronger reasoning and coding skills."
+    articles = {
+        "blog": item(1, "OpenAI Blog", launch, text, 9),
+        "tc": item(2, "TechCrunch", launch, text + " It is available in ChatGPT.", 10),
+        "vb": item(3, "VentureBeat", launch, text, 11),
+        "other": item(4, "The Verge", "Robot vacuum review", "A new robot vacuum cleans floors quietly.", 8),
+    }
+    index = NearDuplicateIndex(threshold=0.5)
+    for key in ("tc", "other", "vb", "blog"):
+        index.add(key, articles[key])
+
+    assert index.is_representative("blog")
+    assert not index.is_representative("tc") and not index.is_representative("vb")
+    assert index.is_representative("other")
+    assert set(index.sources("blog")) == {"OpenAI Blog", "TechCrunch", "VentureBeat"}
+    assert index.sources("other") == ()
+    assert index.get_stats()["duplicates"] == 2
+
+    affected = index.remove("blog")
+    assert "tc" in affected and index.is_representative("tc")
+    assert set(index.sources("tc")) == {"TechCrunch", "VentureBeat"}
+
+
+def test_reworded_reports_cluster_despite_different_summaries():
+    """Two outlets covering the same story with their own wording still collapse into one cluster."""
+    from app.models.news import NewsItem
+    from app.services.article_store import Article
+    from app.services.dedup_index import NearDuplicateIndex
+
+    def item(i, source, title, summary, hour):
+        return Article.from_news_item(NewsItem(
+            title=title, summary=summary, url=f"https://example.com/{i}", source=source,
+            publish_time=f"2025-01-06 {hour:02d}:00:00"
+        ))
+
+    index = NearDuplicateIndex(threshold=0.5)
+    index.add("tc", item(
+        1, "TechCrunch", "OpenAI releases GPT-5 with improved reasoning",
+        "The company says the model beats its predecessors on math benchmarks "
+        "and will roll out to paying subscribers first.", 9
+    ))
+    index.add("vb", item(
+        2, "VentureBeat", "OpenAI releases GPT-5 model with improved reasoning and coding",
+        "Enterprise customers get API access next week, with pricing unchanged "
+        "from the previous flagship, according to a blog post.", 10
+    ))
+    index.add("verge", item(
+        3, "The Verge", "Robot vacuum review: quiet and cheap",
+        "The company says the model beats its predecessors on carpets.", 8
+    ))
+
+    assert index.is_representative("tc") and not index.is_representative("vb")
+    assert set(index.sources("tc")) == {"TechCrunch", "VentureBeat"}
+    assert index.is_representative("verge")
+
+
+def test_minhash_signature_matches_exact_arithmetic():
+    """The vectorized permutations equal (a * h + b) mod p computed on Python ints."""
+    import zlib
+    from app.models.news import NewsItem
+    from app.services.article_store import Article
+    from app.services.dedup_index import NearDuplicateIndex, _MERSENNE_PRIME
+
+    index = NearDuplicateIndex()
+    article = Article.from_news_item(NewsItem(
+        title="OpenAI releases a new reasoning model", summary="It codes better.",
+        url="https://example.com/1", source="A", publish_time="2025-01-06 09:00:00"
+    ))
+    hashes = [zlib.crc32(s.encode("utf-8")) % _MERSENNE_PRIME for s in index._shingles(article)]
+    expected = [
+        min((int(a) * h + int(b)) % _MERSENNE_PRIME for h in hashes)
+        for a, b in zip(index._a, index._b)
+    ]
+    assert index.signature(article).tolist() == expected
+
+
+
+@pytest.mark.asyncio
+async def test_read_feed_body_stops_at_entry_budget_and_byte_cap():
+    """Streaming reads stop once enough entries arrived, or at the byte cap."""
+    import feedparser
+    from app.services.feed_parser import read_feed_body
+
+    items = "".join(
+        f"<item><title>T{i}</title><link>https://example.com/{i}</link></item>" for i in range(200)
+    )
+    body = f'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>{items}</channel></rss>'.encode()
+
+    stream = _FakeStream(body)
+    content, truncated = await read_feed_body(stream.iter_chunked(64), max_entries=5, max_bytes=len(body))
+    assert truncated
+    assert stream.bytes_read < len(body) // 10
+    assert content.endswith(b"</item>")
+    assert [e.title for e in feedparser.parse(content).entries[:5]] == ["T0", "T1", "T2", "T3", "T4"]
+
+    content, truncated = await read_feed_body(_FakeStream(body).iter_chunked(64), max_entries=1000, max_bytes=2000)
+    assert truncated and len(content) <= 2000
+
+    content, truncated = await read_feed_body(_FakeStream(RSS_SAMPLE).iter_chunked(64), max_entries=50, max_bytes=10**6)
+    assert not truncated and content == RSS_SAMPLE
+
+    content, truncated = await read_feed_body(
+        _FakeStream(RSS_SAMPLE).iter_chunked(64), max_entries=50, max_bytes=len(RSS_SAMPLE)
+    )
+    assert not truncated and content == RSS_SAMPLE
+
+
+@pytest.mark.asyncio
+async def test_fetch_rss_feed_decodes_with_header_charset():
+    """A charset declared only in the Content-Type header is used to decode the feed."""
+    from unittest.mock import AsyncMock
+
+    body = (
+        "<rss version=\"2.0\"><channel><title>x</title><item><title>人工智能新闻</title>"
+        "<link>https://example.com/cafe</link></item></channel></rss>"
+    ).encode("gbk")
+    service = NewsCollectorService()
+    service._get_session = AsyncMock(return_value=_FakeSession([
+        _FakeResponse(200, body, {"Content-Type": "application/rss+xml; charset=gbk"})
+    ]))
+
+    items = await service._fetch_rss_feed("Test", "https://example.com/rss")
+    assert [item.title for item in items] == ["人工智能新闻"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_file_warm_starts_a_new_service(tmp_path):
+    """A restarted service serves the persisted snapshot and feed validators without fetching."""
+    from datetime import datetime, timedelta
+
+    from app.models.news import NewsItem
+
+    path = str(tmp_path / "news.sqlite3")
+    now = datetime.now()
+
+    first = NewsCollectorService(snapshot_path=path)
+    first.rss_feeds = {"Test": "https://example.com/rss"}
+
+    async def fake_fetch(source, url):
+        first._feed_states[source].etag = '"v1"'
+        return [
+            NewsItem(
+                title=f"Item {i}", summary="s", url=f"https://example.com/{i}", source=source,
+                publish_time=(now - timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"), tags=["GPT"]
+            )
+            for i in range(3)
+        ]
+
+    first._fetch_rss_feed = fake_fetch
+    await first.refresh()
+
+    second = NewsCollectorService(snapshot_path=path)
+    second.rss_feeds = {"Test": "https://example.com/rss"}
+    fetches = 0
+
+    async def no_fetch(source, url):
+        nonlocal fetches
+        fetches += 1
+        return []
+
+    second._fetch_rss_feed = no_fetch
+
+    articles = await second._fetch_all_news()
+    assert fetches == 0
+    assert [a.title for a in articles] == ["Item 0", "Item 1", "Item 2"]
+    assert second._feed_states["Test"].etag == '"v1"'
+    assert second._cache_time == first._cache_time
+    assert [item.title for item in await second.search_news("Item 1", limit=1)] == ["Item 1"]
+    assert second._trending_engine.top(1)[0][:2] == ("GPT", 3)
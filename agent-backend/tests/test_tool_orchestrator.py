@@ -0,0 +1,305 @@
+"""
+测试 ToolOrchestrator 工具链调度
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import Mock
+
+from app.core.tool_cache import ToolResultCache
+from app.core.tool_orchestrator import ToolOrchestrator
+from app.models.react import PlanStep
+from app.models.tool import ToolCall, ToolResult
+
+
+class _SleepPlugin:
+    """按参数 delay 休眠后返回结果的插件"""
+
+    enabled = True
+
+    def __init__(self, fail_tools=()):
+        self.fail_tools = set(fail_tools)
+        self.calls = []
+
+    async def execute_tool(self, tool_call: ToolCall) -> ToolResult:
+        self.calls.append(tool_call)
+        await asyncio.sleep(tool_call.parameters.get("delay", 0))
+        if tool_call.tool_name in self.fail_tools:
+            return ToolResult(success=False, error="boom", tool_name=tool_call.tool_name)
+        return ToolResult(
+            success=True,
+            data=f"{tool_call.tool_name}:{tool_call.parameters.get('input', '')}",
+            tool_name=tool_call.tool_name
+        )
+
+
+def _make_orchestrator(plugin, max_concurrency=4):
+    registry = Mock()
+    registry.get_tool = Mock(side_effect=lambda name: Mock(plugin_id="test"))
+    plugin_manager = Mock()
+    plugin_manager.get_plugin = Mock(return_value=plugin)
+    return ToolOrchestrator(registry, plugin_manager, max_concurrency=max_concurrency)
+
+
+def _step(number, tool, required=True, depends_on=None, **parameters):
+    return PlanStep(
+        step_number=number,
+        description=f"step {number}",
+        tool_name=tool,
+        parameters=parameters,
+        required=required,
+        depends_on=depends_on
+    )
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently():
+    """测试无依赖步骤并发执行"""
+    orchestrator = _make_orchestrator(_SleepPlugin())
+    steps = [_step(i, f"tool_{i}", delay=0.2) for i in range(1, 4)]
+
+    start = time.time()
+    results = await orchestrator.execute_chain(steps)
+    elapsed = time.time() - start
+
+    assert [r.tool_name for r in results] == ["tool_1", "tool_2", "tool_3"]
+    assert all(r.success for r in results)
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_is_respected():
+    """测试并发上限"""
+    orchestrator = _make_orchestrator(_SleepPlugin(), max_concurrency=1)
+    steps = [_step(i, f"tool_{i}", delay=0.1) for i in range(1, 4)]
+
+    start = time.time()
+    await orchestrator.execute_chain(steps)
+
+    assert time.time() - start >= 0.3
+
+
+@pytest.mark.asyncio
+async def test_referenced_step_runs_after_dependency():
+    """测试 ${stepN.result} 引用的步骤在依赖完成后执行并获得结果"""
+    plugin = _SleepPlugin()
+    orchestrator = _make_orchestrator(plugin)
+    steps = [
+        _step(1, "first", delay=0.1, input="a"),
+        _step(2, "second", input="${step1.result}"),
+        _step(3, "third", depends_on=2)
+    ]
+
+    results = await orchestrator.execute_chain(steps)
+
+    assert [call.tool_name for call in plugin.calls] == ["first", "second", "third"]
+    assert results[1].data == "second:first:a"
+
+
+@pytest.mark.asyncio
+async def test_required_failure_halts_dependents():
+    """测试必需步骤失败后不再启动后续步骤"""
+    plugin = _SleepPlugin(fail_tools={"first"})
+    orchestrator = _make_orchestrator(plugin)
+    steps = [
+        _step(1, "first"),
+        _step(2, "second", input="${step1.result}"),
+    ]
+
+    results = await orchestrator.execute_chain(steps)
+
+    assert len(results) == 1
+    assert not results[0].success
+    assert [call.tool_name for call in plugin.calls] == ["first"]
+
+
+
+@pytest.mark.asyncio
+async def test_required_failure_skips_steps_waiting_for_a_slot():
+    """测试并发名额不足时，排队中的步骤在必需步骤失败后不会执行"""
+    plugin = _SleepPlugin(fail_tools={"first"})
+    orchestrator = _make_orchestrator(plugin, max_concurrency=1)
+    steps = [_step(1, "first"), _step(2, "second"), _step(3, "third")]
+
+    results = await orchestrator.execute_chain(steps)
+
+    assert [call.tool_name for call in plugin.calls] == ["first"]
+    assert len(results) == 1 and not results[0].success
+
+
+@pytest.mark.asyncio
+async def test_chain_returns_every_executed_result_in_plan_order():
+    """测试中间步骤未执行时，之后已执行步骤的结果仍按计划顺序返回"""
+    plugin = _SleepPlugin(fail_tools={"first"})
+    orchestrator = _make_orchestrator(plugin)
+    steps = [
+        _step(1, "first"),
+        _step(2, "second", input="${step1.result}"),
+        _step(3, "third", delay=0.05),
+    ]
+
+    results = await orchestrator.execute_chain(steps)
+
+    assert [result.tool_name for result in results] == ["first", "third"]
+    assert results[1].success
+
+@pytest.mark.asyncio
+async def test_optional_failure_continues():
+    """测试可选步骤失败后继续执行"""
+    plugin = _SleepPlugin(fail_tools={"first"})
+    orchestrator = _make_orchestrator(plugin)
+    steps = [
+        _step(1, "first", required=False),
+        _step(2, "second", depends_on=1),
+    ]
+
+    results = await orchestrator.execute_chain(steps)
+
+    assert len(results) == 2
+    assert results[1].success
+
+
+def test_cache_evicts_least_recently_used():
+    """测试 LRU 淘汰最久未使用的条目"""
+    cache = ToolResultCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_cache_respects_byte_limit_and_ttl():
+    """测试字节上限和 TTL 过期"""
+    cache = ToolResultCache(max_entries=10, max_bytes=10)
+    cache.set("a", "x", size=6)
+    cache.set("b", "y", size=6)
+    assert "a" not in cache
+    assert cache.get_stats()["bytes"] == 6
+
+    cache.set("c", "z", ttl=0.01, size=1)
+    time.sleep(0.02)
+    assert cache.get("c") is None
+    stats = cache.get_stats()
+    assert stats["expirations"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_counts_evictions_and_expirations_per_tool():
+    """测试淘汰和过期计数按工具分组"""
+    cache = ToolResultCache(max_entries=2)
+    cache.set("a", 1, namespace="news")
+    cache.set("b", 2, namespace="trends", ttl=0.01)
+    cache.set("c", 3, namespace="news")
+    time.sleep(0.02)
+    assert cache.purge_expired() == 1
+
+    by_tool = cache.get_stats()["by_tool"]
+    assert (by_tool["news"]["evictions"], by_tool["news"]["expirations"]) == (1, 0)
+    assert (by_tool["trends"]["evictions"], by_tool["trends"]["expirations"]) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_tool_ttl_and_hit_stats():
+    """测试工具声明的 TTL 和命中统计"""
+    plugin = _SleepPlugin()
+    orchestrator = _make_orchestrator(plugin)
+    orchestrator.tool_registry.get_tool = Mock(
+        side_effect=lambda name: Mock(plugin_id="test", cache_ttl_seconds=0 if name == "live" else 60)
+    )
+
+    call = ToolCall(tool_name="news", parameters={"count": 5})
+    await orchestrator.execute_tool(call)
+    await orchestrator.execute_tool(call)
+    live = ToolCall(tool_name="live", parameters={})
+    await orchestrator.execute_tool(live)
+    await orchestrator.execute_tool(live)
+
+    assert len(plugin.calls) == 3
+    stats = orchestrator.get_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["by_tool"]["news"]["entries"] == 1
+    assert stats["by_tool"]["live"]["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_are_coalesced():
+    """测试并发的相同调用只执行一次"""
+    plugin = _SleepPlugin()
+    orchestrator = _make_orchestrator(plugin)
+    call = ToolCall(tool_name="news", parameters={"delay": 0.05})
+
+    results = await asyncio.gather(*(orchestrator.execute_tool(call) for _ in range(10)))
+
+    assert len(plugin.calls) == 1
+    assert all(r.success for r in results)
+    assert orchestrator.get_cache_stats()["coalesced_calls"] == 9
+
+
+@pytest.mark.asyncio
+async def test_coalesced_errors_propagate_to_all_callers():
+    """测试共享执行的异常传递给所有等待者"""
+    plugin = _SleepPlugin()
+
+    async def failing(tool_call):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    plugin.execute_tool = failing
+    orchestrator = _make_orchestrator(plugin)
+    call = ToolCall(tool_name="news", parameters={})
+
+    results = await asyncio.gather(*(orchestrator.execute_tool(call) for _ in range(3)))
+
+    assert all(not r.success and "upstream down" in r.error for r in results)
+    assert orchestrator.get_cache_stats()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    """测试发起者取消后，其他等待者仍能拿到结果；全部取消时才取消执行"""
+    plugin = _SleepPlugin()
+    orchestrator = _make_orchestrator(plugin)
+    call = ToolCall(tool_name="news", parameters={"delay": 0.1})
+
+    leader = asyncio.create_task(orchestrator.execute_tool(call))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(orchestrator.execute_tool(call))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    result = await follower
+    assert result.success
+    assert len(plugin.calls) == 1
+
+    orchestrator.clear_cache()
+    only = asyncio.create_task(orchestrator.execute_tool(call))
+    await asyncio.sleep(0.01)
+    only.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await only
+    await asyncio.sleep(0.01)
+    assert orchestrator.get_cache_stats()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_new_call_does_not_join_cancelled_flight():
+    """测试唯一等待者取消后立即发起的相同调用会重新执行，而不是收到取消"""
+    plugin = _SleepPlugin()
+    orchestrator = _make_orchestrator(plugin)
+    call = ToolCall(tool_name="news", parameters={"delay": 0.05})
+
+    only = asyncio.create_task(orchestrator.execute_tool(call))
+    await asyncio.sleep(0.01)
+    only.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await only
+
+    result = await orchestrator.execute_tool(call)
+    assert result.success
+    assert len(plugin.calls) == 2